@@ -0,0 +1,30 @@
+"""outbox retry scheduling (attempts + next_attempt_at + dead letter)
+
+Revision ID: 0004_outbox_retry
+Revises: 0003_outbox_contract_v1
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0004_outbox_retry"
+down_revision = "0003_outbox_contract_v1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("outbox_messages", sa.Column("attempt_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("outbox_messages", sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("outbox_messages", sa.Column("last_error", sa.Text(), nullable=True))
+    op.create_index("ix_outbox_messages_status_next_attempt", "outbox_messages", ["status", "next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_messages_status_next_attempt", table_name="outbox_messages")
+    op.drop_column("outbox_messages", "last_error")
+    op.drop_column("outbox_messages", "next_attempt_at")
+    op.drop_column("outbox_messages", "attempt_count")
@@ -0,0 +1,30 @@
+"""worker leases on outbox messages and pending actions
+
+Revision ID: 0005_worker_leases
+Revises: 0004_outbox_retry
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0005_worker_leases"
+down_revision = "0004_outbox_retry"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("outbox_messages", "pending_actions"):
+        op.add_column(table, sa.Column("claimed_by", sa.String(length=100), nullable=True))
+        op.add_column(table, sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+        op.create_index(f"ix_{table}_status_lease", table, ["status", "lease_expires_at"])
+
+
+def downgrade() -> None:
+    for table in ("pending_actions", "outbox_messages"):
+        op.drop_index(f"ix_{table}_status_lease", table_name=table)
+        op.drop_column(table, "lease_expires_at")
+        op.drop_column(table, "claimed_by")
@@ -0,0 +1,53 @@
+"""indexes matched to hot claim/list query shapes
+
+Revision ID: 0006_hot_query_indexes
+Revises: 0005_worker_leases
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_hot_query_indexes"
+down_revision = "0005_worker_leases"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, Postgres partial-index predicate)
+INDEXES = [
+    # Claims: WHERE status = ... AND <lease/next_attempt filters> ORDER BY created_at LIMIT n.
+    # Partial indexes stay small: only the (few) claimable rows are indexed.
+    ("ix_outbox_messages_queued_created", "outbox_messages", ["created_at"], "status = 'QUEUED'"),
+    ("ix_pending_actions_approved_created", "pending_actions", ["created_at"], "status = 'APPROVED'"),
+    # Tenant listings: GET /actions/pending (ASC) and GET /outbox (DESC, any status).
+    ("ix_pending_actions_tenant_pending_created", "pending_actions", ["tenant_id", "created_at"], "status = 'PENDING'"),
+    ("ix_outbox_messages_tenant_created", "outbox_messages", ["tenant_id", "created_at"], None),
+    # Latest document per (tenant, domain, doc_type): bootstrap, allowlist, mindmap, memory/next.
+    ("ix_documents_tenant_doctype_created", "documents", ["tenant_id", "domain", "doc_type", "created_at"], None),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY: don't block writers on large tables (must run outside a transaction).
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+            )
+        # Superseded by ix_documents_tenant_doctype_created (same leading columns).
+        op.drop_index("ix_documents_tenant_doctype", table_name="documents", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_documents_tenant_doctype", "documents", ["tenant_id", "domain", "doc_type"], postgresql_concurrently=True
+        )
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,104 @@
+"""audit_log: monthly range partitions on created_at (Postgres)
+
+Revision ID: 0007_audit_log_partitions
+Revises: 0006_hot_query_indexes
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0007_audit_log_partitions"
+down_revision = "0006_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+# Partitions from the oldest existing row's month through this many months ahead; later months are
+# created by the audit maintenance task (app.audit.partitions.ensure_partitions). Rows outside every
+# partition land in audit_log_default, so inserts never fail for lack of a partition.
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, tenant_id, user_id, event_type, severity, message, context, created_at"
+
+
+def _month(dt: datetime) -> datetime:
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(dt: datetime, n: int) -> datetime:
+    y, m = divmod(dt.month - 1 + n, 12)
+    return dt.replace(year=dt.year + y, month=m + 1)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_legacy")
+    op.execute("ALTER TABLE audit_log_legacy RENAME CONSTRAINT audit_log_pkey TO audit_log_legacy_pkey")
+    op.execute("ALTER INDEX ix_audit_tenant_id RENAME TO ix_audit_legacy_tenant_id")
+
+    # The partition key must be part of the primary key.
+    op.execute(
+        """
+        CREATE TABLE audit_log (
+            id varchar(36) NOT NULL,
+            tenant_id varchar(36) REFERENCES tenants (id),
+            user_id varchar(64),
+            event_type varchar(100) NOT NULL,
+            severity varchar(20) NOT NULL,
+            message varchar(1000) NOT NULL,
+            context jsonb NOT NULL,
+            created_at timestamptz NOT NULL,
+            CONSTRAINT audit_log_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+    # Tenant + time-window reads; partition pruning on created_at narrows them to the months asked for.
+    op.create_index("ix_audit_log_tenant_created", "audit_log", ["tenant_id", "created_at"])
+
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM audit_log_legacy")).scalar()
+    current = _month(datetime.now(timezone.utc))
+    start = min(_month(oldest), current) if oldest else current
+    end = _add_months(current, MONTHS_AHEAD + 1)
+    while start < end:
+        nxt = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE audit_log_p{start:%Y_%m} PARTITION OF audit_log "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{nxt.isoformat()}')"
+        )
+        start = nxt
+
+    op.execute(f"INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_legacy")
+    op.execute("DROP TABLE audit_log_legacy")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_partitioned")
+    op.execute("ALTER TABLE audit_log_partitioned RENAME CONSTRAINT audit_log_pkey TO audit_log_partitioned_pkey")
+    op.execute(
+        """
+        CREATE TABLE audit_log (
+            id varchar(36) PRIMARY KEY,
+            tenant_id varchar(36) REFERENCES tenants (id),
+            user_id varchar(64),
+            event_type varchar(100) NOT NULL,
+            severity varchar(20) NOT NULL,
+            message varchar(1000) NOT NULL,
+            context jsonb NOT NULL,
+            created_at timestamptz NOT NULL
+        )
+        """
+    )
+    op.execute(f"INSERT INTO audit_log ({COLUMNS}) SELECT {COLUMNS} FROM audit_log_partitioned")
+    op.execute("DROP TABLE audit_log_partitioned")  # drops every partition with it
+    op.create_index("ix_audit_tenant_id", "audit_log", ["tenant_id"])
@@ -0,0 +1,68 @@
+"""audit_log indexes for the /audit query API
+
+Revision ID: 0008_audit_query_indexes
+Revises: 0007_audit_log_partitions
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0008_audit_query_indexes"
+down_revision = "0007_audit_log_partitions"
+branch_labels = None
+depends_on = None
+
+# (name, partition index suffix, USING + columns, Postgres partial-index predicate)
+INDEXES = [
+    # GET /audit?event_type=...: newest first per (tenant, type).
+    ("ix_audit_log_tenant_type_created", "tenant_type_created", "btree (tenant_id, event_type, created_at, id)", None),
+    # GET /audit?severity=WARN,ERROR: non-INFO events are a small fraction, so the partial index stays small.
+    ("ix_audit_log_tenant_problems_created", "tenant_problems_created", "btree (tenant_id, created_at, id)", "severity <> 'INFO'"),
+    # GET /audit?outbox_id=... / ?context=key:value: JSONB containment (@>) on any context key.
+    ("ix_audit_log_context", "context", "gin (context jsonb_path_ops)", None),
+]
+
+
+def _partitions() -> list[str]:
+    return list(
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = 'audit_log' ORDER BY c.relname"
+            )
+        )
+        .scalars()
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.create_index("ix_audit_log_tenant_type_created", "audit_log", ["tenant_id", "event_type", "created_at", "id"])
+        return
+
+    # CREATE INDEX CONCURRENTLY does not work on a partitioned table: create each index invalid on the
+    # parent only, build it concurrently on every partition, then attach (the parent index becomes valid
+    # once all partitions are attached). Partitions created later inherit the indexes automatically.
+    partitions = _partitions()
+    for name, _, spec, where in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY audit_log USING {spec}" + (f" WHERE {where}" if where else ""))
+    with op.get_context().autocommit_block():
+        for name, suffix, spec, where in INDEXES:
+            for part in partitions:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {part}_{suffix} ON {part} USING {spec}"
+                    + (f" WHERE {where}" if where else "")
+                )
+                op.execute(f"ALTER INDEX {name} ATTACH PARTITION {part}_{suffix}")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        op.drop_index("ix_audit_log_tenant_type_created", table_name="audit_log")
+        return
+    for name, _, _, _ in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name}")  # drops the attached partition indexes too
@@ -0,0 +1,38 @@
+"""content-addressed blob table for document bodies
+
+Revision ID: 0009_blobs
+Revises: 0008_audit_query_indexes
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0009_blobs"
+down_revision = "0008_audit_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("sha256", sa.String(length=64), primary_key=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("content_type", sa.String(length=200), nullable=False),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("released_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # GC scan: unreferenced blobs by release time (only the few unreferenced rows are indexed).
+    op.create_index(
+        "ix_blobs_released_unreferenced", "blobs", ["released_at"], postgresql_where=sa.text("refcount <= 0")
+    )
+    # Existing document bodies stay inline; scripts/migrate_document_blobs.py moves large ones out in batches.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_blobs_released_unreferenced", table_name="blobs")
+    op.drop_table("blobs")
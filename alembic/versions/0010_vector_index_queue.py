@@ -0,0 +1,38 @@
+"""durable write-behind queue for memory vector upserts
+
+Revision ID: 0010_vector_index_queue
+Revises: 0009_blobs
+Create Date: 2026-10-17
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0010_vector_index_queue"
+down_revision = "0009_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vector_index_queue",
+        sa.Column("doc_id", sa.String(length=36), primary_key=True),
+        sa.Column("tenant_id", sa.String(length=36), nullable=False),
+        sa.Column("domain", sa.String(length=50), nullable=False),
+        sa.Column("source_type", sa.String(length=100), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("claimed_by", sa.String(length=200), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("enqueued_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    # Indexer claim: due rows, oldest first.
+    op.create_index("ix_vector_index_queue_due", "vector_index_queue", ["next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vector_index_queue_due", table_name="vector_index_queue")
+    op.drop_table("vector_index_queue")
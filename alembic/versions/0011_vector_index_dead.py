@@ -0,0 +1,32 @@
+"""vector index queue: DEAD status after VECTOR_INDEX_MAX_ATTEMPTS
+
+Revision ID: 0011_vector_index_dead
+Revises: 0010_vector_index_queue
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0011_vector_index_dead"
+down_revision = "0010_vector_index_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "vector_index_queue",
+        sa.Column("status", sa.String(length=10), nullable=False, server_default="QUEUED"),
+    )
+    # Indexer claim: due QUEUED rows, oldest first (DEAD rows are never scanned).
+    op.drop_index("ix_vector_index_queue_due", table_name="vector_index_queue")
+    op.create_index("ix_vector_index_queue_due", "vector_index_queue", ["status", "next_attempt_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vector_index_queue_due", table_name="vector_index_queue")
+    op.create_index("ix_vector_index_queue_due", "vector_index_queue", ["next_attempt_at"])
+    op.drop_column("vector_index_queue", "status")
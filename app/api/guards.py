@@ -7,6 +7,7 @@ from app.memory.bootstrap import check_bootstrap_fresh
 
 
 def require_bootstrap(db: Session, *, tenant_id: str) -> str:
+    # check_bootstrap_fresh serves from the per-tenant snapshot cache shared with the worker loops.
     ok, context_version, reason = check_bootstrap_fresh(db, tenant_id=tenant_id)
     if not ok:
         raise HTTPException(
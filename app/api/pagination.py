@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import base64
+import json
+from collections.abc import Callable, Iterator, Mapping
+from datetime import datetime
+from typing import Any
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+
+# Keyset (seek) pagination on (created_at, id): each page is an index range scan starting where the
+# previous page ended, so page N costs the same as page 1 (no OFFSET) and concurrent inserts never
+# shift or duplicate rows across pages. Cursors are opaque to clients.
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_after(created_at_col, id_col, cursor: str | None, *, descending: bool):
+    """WHERE clause selecting rows strictly after `cursor` in (created_at, id) order (None: no bound)."""
+
+    if not cursor:
+        return None
+    created_at, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(created_at_col < created_at, and_(created_at_col == created_at, id_col < row_id))
+    return or_(created_at_col > created_at, and_(created_at_col == created_at, id_col > row_id))
+
+
+def keyset_order(created_at_col, id_col, *, descending: bool) -> tuple:
+    if descending:
+        return created_at_col.desc(), id_col.desc()
+    return created_at_col.asc(), id_col.asc()
+
+
+def parse_csv(values: list[str] | None) -> list[str]:
+    """Accept both repeated (?status=A&status=B) and comma-separated (?status=A,B) query params."""
+
+    out: list[str] = []
+    for v in values or []:
+        out.extend(x.strip() for x in v.split(",") if x.strip())
+    return out
+
+
+def ndjson_lines(rows: Iterator[dict[str, Any]]) -> Iterator[bytes]:
+    for row in rows:
+        yield (json.dumps(jsonable_encoder(row), ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def select_fields(fields: list[str] | None, *, allowed: Mapping[str, Any], default: list[str]) -> list[str]:
+    """Column names requested by `fields=` (default when absent), de-duplicated; 400 on unknown names."""
+
+    names = parse_csv(fields) or default
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {','.join(unknown)}")
+    return list(dict.fromkeys(names))
+
+
+def iter_pages(
+    page: Callable[..., tuple[list[dict], str | None]], *, cursor: str | None, chunk: int, **filters: Any
+) -> Iterator[dict]:
+    """Every item from `cursor` on, fetched `chunk` rows at a time via page(db, cursor=, limit=, **filters)."""
+
+    # Own session: the request-scoped one is closed before the response body is streamed.
+    db: Session = SessionLocal()
+    try:
+        while True:
+            items, cursor = page(db, cursor=cursor, limit=chunk, **filters)
+            yield from items
+            if cursor is None:
+                return
+    finally:
+        db.close()
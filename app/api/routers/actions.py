@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import hashlib
+import hmac
+from collections import Counter
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_ctx
+from app.api.pagination import encode_cursor, keyset_after, keyset_order
 from app.core.db import SessionLocal
 from app.models.tables import PendingAction
 from app.util.time import now_utc
 
 router = APIRouter()
 
+BULK_STATUS = {"approve": "APPROVED", "reject": "REJECTED"}
+BULK_MAX_ITEMS = 500
+
 
 def get_db():
     db = SessionLocal()
@@ -26,15 +33,23 @@ def _hash_token(token: str) -> str:
 
 
 @router.get("/pending")
-def list_pending_actions(ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
+def list_pending_actions(
+    ctx=Depends(get_ctx),
+    db: Session = Depends(get_db),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+) -> dict:
+    """PENDING actions, oldest first, one keyset page at a time (pass `next_cursor` back as `cursor`)."""
+
     tenant_id, _ = ctx
 
-    items = (
-        db.query(PendingAction)
-        .filter(PendingAction.tenant_id == tenant_id, PendingAction.status == "PENDING")
-        .order_by(PendingAction.created_at.asc())
-        .all()
-    )
+    q = db.query(PendingAction).filter(PendingAction.tenant_id == tenant_id, PendingAction.status == "PENDING")
+    after = keyset_after(PendingAction.created_at, PendingAction.id, cursor, descending=False)
+    if after is not None:
+        q = q.filter(after)
+    items = q.order_by(*keyset_order(PendingAction.created_at, PendingAction.id, descending=False)).limit(limit + 1).all()
+    more = len(items) > limit
+    items = items[:limit]
 
     return {
         "items": [
@@ -47,10 +62,87 @@ def list_pending_actions(ctx=Depends(get_ctx), db: Session = Depends(get_db)) ->
                 "created_at": a.created_at,
             }
             for a in items
-        ]
+        ],
+        "next_cursor": encode_cursor(items[-1].created_at, items[-1].id) if more and items else None,
     }
 
 
+@router.post("/bulk")
+def bulk_decide(payload: dict, ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
+    """Approve or reject many PENDING actions at once.
+
+    Body: {"decision": "approve"|"reject", "items": [{"id": ..., "confirmation_token": ...}, ...]}
+    (tokens are required for approve only, as in the single-item endpoints). All rows are loaded in
+    one query, tokens verified in one pass, and every valid item is updated in a single UPDATE.
+    Returns one result per item, in request order; invalid items never block valid ones. An id given more
+    than once is ambiguous (its copies may carry different tokens), so every copy fails with duplicate_id.
+    """
+
+    tenant_id, user_id = ctx
+    decision = (payload or {}).get("decision")
+    if decision not in BULK_STATUS:
+        raise HTTPException(status_code=400, detail="decision must be 'approve' or 'reject'")
+    raw_items = (payload or {}).get("items")
+    if not isinstance(raw_items, list) or not raw_items:
+        raise HTTPException(status_code=400, detail="Missing items")
+    if len(raw_items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {BULK_MAX_ITEMS})")
+
+    requested = [(str((x or {}).get("id") or ""), (x or {}).get("confirmation_token")) for x in raw_items]
+    seen = Counter(action_id for action_id, _ in requested)
+    ids = {action_id for action_id, _ in requested if action_id and seen[action_id] == 1}
+    rows = {
+        r.id: r
+        for r in db.query(PendingAction.id, PendingAction.status, PendingAction.confirmation_token_hash).filter(
+            PendingAction.tenant_id == tenant_id, PendingAction.id.in_(ids)
+        )
+    }
+
+    errors: dict[str, str] = {}
+    valid: list[str] = []
+    for action_id, token in requested:
+        r = rows.get(action_id)
+        if action_id and seen[action_id] > 1:
+            errors[action_id] = "duplicate_id"
+        elif r is None:
+            errors[action_id] = "not_found"
+        elif r.status != "PENDING":
+            errors[action_id] = f"not_pending:{r.status}"
+        elif decision == "approve" and not token:
+            errors[action_id] = "missing_confirmation_token"
+        elif decision == "approve" and not (
+            r.confirmation_token_hash and hmac.compare_digest(_hash_token(str(token)), r.confirmation_token_hash)
+        ):
+            errors[action_id] = "invalid_confirmation_token"
+        else:
+            valid.append(action_id)
+
+    status = BULK_STATUS[decision]
+    updated: set[str] = set()
+    if valid:
+        stmt = (
+            update(PendingAction)
+            .where(PendingAction.tenant_id == tenant_id, PendingAction.id.in_(valid), PendingAction.status == "PENDING")
+            .values(status=status, user_id=func.coalesce(PendingAction.user_id, user_id), decided_at=now_utc())
+            .execution_options(synchronize_session=False)
+        )
+        if db.get_bind().dialect.update_returning:
+            updated = {row[0] for row in db.execute(stmt.returning(PendingAction.id))}
+        else:
+            db.execute(stmt)
+            updated = set(valid)
+        db.commit()
+
+    results = []
+    for action_id, _ in requested:
+        if action_id in updated:
+            results.append({"id": action_id, "ok": True, "status": status})
+        else:
+            # Valid but not updated: decided concurrently between our read and the UPDATE.
+            results.append({"id": action_id, "ok": False, "error": errors.get(action_id, "not_pending")})
+    return {"decision": decision, "updated": len(updated), "results": results}
+
+
 @router.post("/{action_id}/approve")
 def approve_action(action_id: str, payload: dict, ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
     tenant_id, user_id = ctx
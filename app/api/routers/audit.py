@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, exists, func, literal, or_, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_ctx
+from app.api.pagination import (
+    encode_cursor,
+    iter_pages,
+    keyset_after,
+    keyset_order,
+    ndjson_lines,
+    parse_csv,
+    select_fields,
+)
+from app.core.db import SessionLocal
+from app.models.tables import AuditLog
+
+router = APIRouter()
+
+FIELDS = {
+    "id": AuditLog.id,
+    "event_type": AuditLog.event_type,
+    "severity": AuditLog.severity,
+    "message": AuditLog.message,
+    "user_id": AuditLog.user_id,
+    "context": AuditLog.context,
+    "created_at": AuditLog.created_at,
+}
+DEFAULT_FIELDS = list(FIELDS)
+EXPORT_CHUNK = 1000
+MAX_CONTEXT_FILTERS = 5
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _context_filters(context: list[str] | None, *, outbox_id: str | None, action_id: str | None) -> list[tuple[str, Any]]:
+    """`key:value` pairs; values that parse as JSON numbers/booleans also match their typed form."""
+
+    pairs: list[tuple[str, Any]] = []
+    for raw in context or []:
+        key, sep, value = raw.partition(":")
+        if not sep or not key.strip():
+            raise HTTPException(status_code=400, detail=f"Invalid context filter (expected key:value): {raw}")
+        pairs.append((key.strip(), value))
+    if action_id:
+        pairs.append(("action_id", action_id))
+    if len(pairs) > MAX_CONTEXT_FILTERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_CONTEXT_FILTERS} context filters")
+    # outbox_id is handled separately: it also matches batch events listing it in `outbox_ids`.
+    if outbox_id:
+        pairs.append(("outbox_id", outbox_id))
+    return pairs
+
+
+def _candidates(value: str) -> list[Any]:
+    out: list[Any] = [value]
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return out
+    if isinstance(parsed, (int, float, bool)) and parsed != value:
+        out.append(parsed)
+    return out
+
+
+def _context_match(db: Session, key: str, value: str):
+    """WHERE clause for context[key] == value.
+
+    Postgres: JSONB containment (`context @> '{"key": value}'`), served by the GIN index from migration
+    0008 for any key. Elsewhere: json_extract (unindexed; fine for SQLite dev/test databases).
+    """
+
+    values = _candidates(value)
+    pg = db.get_bind().dialect.name == "postgresql"
+    if pg:
+        ctx = type_coerce(AuditLog.context, JSONB)
+        clauses = [ctx.contains({key: v}) for v in values]
+        if key == "outbox_id":
+            clauses += [ctx.contains({"outbox_ids": [v]}) for v in values]
+        return or_(*clauses)
+
+    clauses = [func.json_extract(AuditLog.context, f"$.{key}") == v for v in values]
+    if key == "outbox_id":
+        ids = func.json_each(AuditLog.context, "$.outbox_ids").table_valued("value")
+        clauses.append(exists(select(literal(1)).select_from(ids).where(ids.c.value.in_(values))))
+    return or_(*clauses)
+
+
+def _page(
+    db: Session,
+    *,
+    tenant_id: str,
+    names: list[str],
+    event_types: list[str],
+    severities: list[str],
+    contexts: list[tuple[str, str]],
+    created_from: datetime | None,
+    created_to: datetime | None,
+    cursor: str | None,
+    descending: bool,
+    limit: int,
+) -> tuple[list[dict], str | None]:
+    selected = list(dict.fromkeys(["id", "created_at", *names]))
+    q = db.query(*[FIELDS[n].label(n) for n in selected]).filter(AuditLog.tenant_id == tenant_id)
+    if event_types:
+        q = q.filter(AuditLog.event_type.in_(event_types))
+    if severities:
+        q = q.filter(AuditLog.severity.in_(severities))
+        if "INFO" not in severities:
+            # Lets Postgres pick the partial `severity <> 'INFO'` index.
+            q = q.filter(AuditLog.severity != "INFO")
+    if contexts:
+        q = q.filter(and_(*[_context_match(db, k, v) for k, v in contexts]))
+    # Time bounds also prune partitions on Postgres.
+    if created_from is not None:
+        q = q.filter(AuditLog.created_at >= created_from)
+    if created_to is not None:
+        q = q.filter(AuditLog.created_at < created_to)
+    after = keyset_after(AuditLog.created_at, AuditLog.id, cursor, descending=descending)
+    if after is not None:
+        q = q.filter(after)
+
+    rows = q.order_by(*keyset_order(AuditLog.created_at, AuditLog.id, descending=descending)).limit(limit + 1).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if more and rows else None
+    return [{n: getattr(r, n) for n in names} for r in rows], next_cursor
+
+
+@router.get("")
+def list_audit(
+    ctx=Depends(get_ctx),
+    db: Session = Depends(get_db),
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = None,
+    event_type: list[str] | None = Query(default=None),
+    severity: list[str] | None = Query(default=None),
+    outbox_id: str | None = None,
+    action_id: str | None = None,
+    context: list[str] | None = Query(default=None),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    fields: list[str] | None = Query(default=None),
+    order: Literal["desc", "asc"] = "desc",
+    format: Literal["json", "ndjson"] = "json",
+):
+    """List the tenant's audit events (newest first by default), one keyset page at a time.
+
+    Filters: `event_type`, `severity` (repeated or comma-separated), `created_from` (inclusive) /
+    `created_to` (exclusive), `outbox_id` (also matches batch events listing it), `action_id`, and
+    `context=key:value` (repeatable). Pass the returned `next_cursor` as `cursor` for the next page.
+    `format=ndjson` streams every matching row (from `cursor` on, ignoring `limit`).
+    """
+
+    tenant_id, _ = ctx
+    filters = {
+        "tenant_id": tenant_id,
+        "names": select_fields(fields, allowed=FIELDS, default=DEFAULT_FIELDS),
+        "event_types": parse_csv(event_type),
+        "severities": [s.upper() for s in parse_csv(severity)],
+        "contexts": _context_filters(context, outbox_id=outbox_id, action_id=action_id),
+        "created_from": created_from,
+        "created_to": created_to,
+        "descending": order == "desc",
+    }
+
+    if format == "ndjson":
+        rows = iter_pages(_page, cursor=cursor, chunk=EXPORT_CHUNK, **filters)
+        return StreamingResponse(ndjson_lines(rows), media_type="application/x-ndjson")
+
+    items, next_cursor = _page(db, cursor=cursor, limit=limit, **filters)
+    return {"items": items, "next_cursor": next_cursor}
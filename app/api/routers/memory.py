@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_ctx
 from app.core.db import SessionLocal
+from app.memory.blob_store import document_text
 from app.memory.bootstrap import bootstrap_status, refresh_bootstrap
 
 router = APIRouter()
@@ -46,4 +47,4 @@ def get_next(ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
     if not doc:
         raise HTTPException(status_code=404, detail="NEXT not found (run /memory/bootstrap)")
 
-    return {"tenant_id": tenant_id, "document_id": doc.id, "content_text": doc.content_text, "meta": doc.meta}
+    return {"tenant_id": tenant_id, "document_id": doc.id, "content_text": document_text(doc), "meta": doc.meta}
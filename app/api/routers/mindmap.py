@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_ctx
 from app.core.db import SessionLocal
+from app.memory.blob_store import document_text
 from app.models.tables import Document
 from app.util.ids import new_uuid
 from app.util.time import now_utc
@@ -85,4 +86,4 @@ def get_custom_mindmap_latest(ctx=Depends(get_ctx), db: Session = Depends(get_db
     if not doc:
         return {"id": None, "title": None, "mermaid": None}
 
-    return {"id": doc.id, "title": doc.title, "mermaid": doc.content_text, "created_at": doc.created_at}
+    return {"id": doc.id, "title": doc.title, "mermaid": document_text(doc), "created_at": doc.created_at}
@@ -1,14 +1,51 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_ctx
+from app.api.pagination import (
+    encode_cursor,
+    iter_pages,
+    keyset_after,
+    keyset_order,
+    ndjson_lines,
+    parse_csv,
+    select_fields,
+)
 from app.core.db import SessionLocal
+from app.memory.blob_store import document_text
 from app.models.tables import OutboxMessage
+from app.outbox.preview_store import ensure_preview
+from app.outbox.service import create_outbox_messages_bulk
 
 router = APIRouter()
 
+# Selectable columns for `fields=`. Listing views typically skip body/payload/meta, which dominate row size.
+FIELDS = {
+    "id": OutboxMessage.id,
+    "channel": OutboxMessage.channel,
+    "to": OutboxMessage.to,
+    "subject": OutboxMessage.subject,
+    "body": OutboxMessage.body,
+    "status": OutboxMessage.status,
+    "created_at": OutboxMessage.created_at,
+    "sent_at": OutboxMessage.sent_at,
+    "idempotency_key": OutboxMessage.idempotency_key,
+    "payload": OutboxMessage.payload,
+    "meta": OutboxMessage.meta,
+    "attempt_count": OutboxMessage.attempt_count,
+    "next_attempt_at": OutboxMessage.next_attempt_at,
+    "last_error": OutboxMessage.last_error,
+}
+DEFAULT_FIELDS = ["id", "channel", "to", "subject", "body", "status", "created_at", "sent_at", "idempotency_key", "payload", "meta"]
+EXPORT_CHUNK = 1000
+BULK_MAX_ITEMS = 10000
+
 
 def get_db():
     db = SessionLocal()
@@ -18,33 +55,146 @@ def get_db():
         db.close()
 
 
+def _page(
+    db: Session,
+    *,
+    tenant_id: str,
+    names: list[str],
+    statuses: list[str],
+    channels: list[str],
+    created_from: datetime | None,
+    created_to: datetime | None,
+    cursor: str | None,
+    descending: bool,
+    limit: int,
+) -> tuple[list[dict], str | None]:
+    """One keyset page (projected columns only) and the cursor of the next page, if any."""
+
+    # id/created_at are always selected: the cursor needs them.
+    selected = list(dict.fromkeys(["id", "created_at", *names]))
+    q = db.query(*[FIELDS[n].label(n) for n in selected]).filter(OutboxMessage.tenant_id == tenant_id)
+    if statuses:
+        q = q.filter(OutboxMessage.status.in_(statuses))
+    if channels:
+        q = q.filter(OutboxMessage.channel.in_(channels))
+    if created_from is not None:
+        q = q.filter(OutboxMessage.created_at >= created_from)
+    if created_to is not None:
+        q = q.filter(OutboxMessage.created_at < created_to)
+    after = keyset_after(OutboxMessage.created_at, OutboxMessage.id, cursor, descending=descending)
+    if after is not None:
+        q = q.filter(after)
+
+    rows = q.order_by(*keyset_order(OutboxMessage.created_at, OutboxMessage.id, descending=descending)).limit(limit + 1).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id) if more and rows else None
+    return [{n: getattr(r, n) for n in names} for r in rows], next_cursor
+
+
 @router.get("")
-def list_outbox(ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
+def list_outbox(
+    ctx=Depends(get_ctx),
+    db: Session = Depends(get_db),
+    limit: int = Query(default=200, ge=1, le=1000),
+    cursor: str | None = None,
+    status: list[str] | None = Query(default=None),
+    channel: list[str] | None = Query(default=None),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    fields: list[str] | None = Query(default=None),
+    order: Literal["desc", "asc"] = "desc",
+    format: Literal["json", "ndjson"] = "json",
+):
+    """List outbox messages (newest first by default), one keyset page at a time.
+
+    Filters: `status`, `channel` (repeated or comma-separated), `created_from` (inclusive) /
+    `created_to` (exclusive). `fields=` projects columns at the SQL level. Pass the returned
+    `next_cursor` as `cursor` for the next page. `format=ndjson` streams every matching row
+    (from `cursor` on, ignoring `limit`) as newline-delimited JSON.
+    """
+
     tenant_id, _ = ctx
+    names = select_fields(fields, allowed=FIELDS, default=DEFAULT_FIELDS)
+    filters = {
+        "tenant_id": tenant_id,
+        "names": names,
+        "statuses": parse_csv(status),
+        "channels": parse_csv(channel),
+        "created_from": created_from,
+        "created_to": created_to,
+        "descending": order == "desc",
+    }
+
+    if format == "ndjson":
+        rows = iter_pages(_page, cursor=cursor, chunk=EXPORT_CHUNK, **filters)
+        return StreamingResponse(ndjson_lines(rows), media_type="application/x-ndjson")
+
+    items, next_cursor = _page(db, cursor=cursor, limit=limit, **filters)
+    return {"items": items, "next_cursor": next_cursor}
 
-    items = (
-        db.query(OutboxMessage)
-        .filter(OutboxMessage.tenant_id == tenant_id)
-        .order_by(OutboxMessage.created_at.desc())
-        .limit(200)
-        .all()
-    )
 
+@router.post("/bulk")
+def create_outbox_bulk(payload: dict, ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
+    """Queue many outbox messages at once.
+
+    Body: {"messages": [<clowbot.outbox.v1 payload>, ...]}. Each payload is validated and policy-checked
+    as in single creation; existing idempotency keys return the existing row. Returns one result per
+    message, in request order, with the row id and policy outcome; invalid messages never block valid ones.
+    """
+
+    tenant_id, user_id = ctx
+    messages = (payload or {}).get("messages")
+    if not isinstance(messages, list) or not messages:
+        raise HTTPException(status_code=400, detail="Missing messages")
+    if len(messages) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many messages (max {BULK_MAX_ITEMS})")
+
+    results = create_outbox_messages_bulk(db=db, tenant_id=tenant_id, user_id=user_id, payload_dicts=messages)
+    items = []
+    for r in results:
+        if r.error:
+            items.append({"ok": False, "idempotency_key": r.idempotency_key, "error": r.error})
+        else:
+            items.append(
+                {
+                    "ok": True,
+                    "id": r.id,
+                    "idempotency_key": r.idempotency_key,
+                    "created": r.created,
+                    "risk": r.risk,
+                    "requires_approval": r.requires_approval,
+                    "upgraded_to_red": r.upgraded_to_red,
+                }
+            )
+    return {
+        "created": sum(1 for r in results if r.created),
+        "failed": sum(1 for r in results if r.error),
+        "results": items,
+    }
+
+
+@router.get("/{outbox_id}/preview")
+def get_outbox_preview(outbox_id: str, ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
+    """The message's preview pack: markdown preview and channel artifact object keys.
+
+    Previews deferred by OUTBOX_PREVIEW_MODE=lazy/async (or not rendered yet) are rendered on first view and
+    stored once the message has reached a final status.
+    """
+
+    tenant_id, _ = ctx
+    m = db.query(OutboxMessage).filter(OutboxMessage.tenant_id == tenant_id, OutboxMessage.id == outbox_id).one_or_none()
+    if m is None:
+        raise HTTPException(status_code=404, detail="Outbox message not found")
+
+    found = ensure_preview(db, m)
+    if found is None:
+        raise HTTPException(status_code=404, detail="No preview for this message")
+    doc, preview = found
     return {
-        "items": [
-            {
-                "id": m.id,
-                "channel": m.channel,
-                "to": m.to,
-                "subject": m.subject,
-                "body": m.body,
-                "status": m.status,
-                "created_at": m.created_at,
-                "sent_at": m.sent_at,
-                "idempotency_key": m.idempotency_key,
-                "payload": m.payload,
-                "meta": m.meta,
-            }
-            for m in items
-        ]
+        "outbox_id": m.id,
+        "document_id": doc.id,
+        "preview_md": document_text(doc),
+        "object_keys": preview.get("object_keys") or {},
+        "content_sha256": preview.get("content_sha256"),
     }
@@ -45,5 +45,7 @@ def put_allowlist(tenant_id: str, payload: dict, db: Session = Depends(get_db))
         created_at=now_utc(),
     )
     db.add(doc)
+    # Committing a policy_allowlist document invalidates the compiled allowlist in every process
+    # (see app.policy.allowlist).
     db.commit()
     return {"tenant_id": tenant_id, "document_id": doc.id, "allowlist": allow.model_dump()}
@@ -5,11 +5,9 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_ctx
 from app.api.guards import require_bootstrap
+from app.audit import audit
 from app.core.db import SessionLocal
-from app.models.tables import AuditLog
 from app.skills.runner import run_skill
-from app.util.ids import new_uuid
-from app.util.time import now_utc
 
 router = APIRouter()
 
@@ -31,17 +29,13 @@ def skills_run(payload: dict, ctx=Depends(get_ctx), db: Session = Depends(get_db
     skill_name = (payload or {}).get("skill_name")
     inputs = (payload or {}).get("inputs") or {}
 
-    db.add(
-        AuditLog(
-            id=new_uuid(),
-            tenant_id=tenant_id,
-            user_id=user_id,
-            event_type="SKILL_RUN_STARTED",
-            severity="INFO",
-            message=f"skill={skill_name}",
-            context={"context_version": context_version, "skill_name": skill_name},
-            created_at=now_utc(),
-        )
+    audit(
+        db,
+        "SKILL_RUN_STARTED",
+        tenant_id=tenant_id,
+        user_id=user_id,
+        message=f"skill={skill_name}",
+        context={"context_version": context_version, "skill_name": skill_name},
     )
     db.commit()
 
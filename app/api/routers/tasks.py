@@ -5,12 +5,11 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import get_ctx
 from app.api.guards import require_bootstrap
+from app.audit import audit
 from app.core.db import SessionLocal
-from app.models.tables import AuditLog, Task
+from app.models.tables import Task
 from app.skills.registry import TASKTYPE_TO_SKILL
 from app.skills.runner import run_skill
-from app.util.ids import new_uuid
-from app.util.time import now_utc
 
 router = APIRouter()
 
@@ -23,21 +22,6 @@ def get_db():
         db.close()
 
 
-def _audit(db: Session, *, tenant_id: str | None, user_id: str | None, event_type: str, severity: str, message: str, context: dict) -> None:
-    db.add(
-        AuditLog(
-            id=new_uuid(),
-            tenant_id=tenant_id,
-            user_id=user_id,
-            event_type=event_type,
-            severity=severity,
-            message=message,
-            context=context or {},
-            created_at=now_utc(),
-        )
-    )
-
-
 @router.post("/{task_id}/run_skill")
 def task_run_skill(task_id: str, payload: dict | None = None, ctx=Depends(get_ctx), db: Session = Depends(get_db)) -> dict:
     """Run a skill bound to the task's TaskType.
@@ -68,12 +52,11 @@ def task_run_skill(task_id: str, payload: dict | None = None, ctx=Depends(get_ct
 
     inputs = ((payload or {}).get("inputs") or meta.get("inputs") or {})
 
-    _audit(
+    audit(
         db,
+        "TASK_RUN_SKILL",
         tenant_id=tenant_id,
         user_id=user_id,
-        event_type="TASK_RUN_SKILL",
-        severity="INFO",
         message=f"task={task_id} task_type={task_type} skill={skill_name}",
         context={"task_id": task_id, "task_type": task_type, "skill_name": skill_name, "context_version": context_version},
     )
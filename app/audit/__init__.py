@@ -0,0 +1,5 @@
+# Audit log subsystem: event schema (events) and the buffered batch writer (writer).
+from app.audit.events import EVENT_TYPES, AuditEvent, new_event
+from app.audit.writer import audit, flush_audit, record
+
+__all__ = ["EVENT_TYPES", "AuditEvent", "audit", "flush_audit", "new_event", "record"]
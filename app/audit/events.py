@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from app.util.ids import new_uuid
+from app.util.time import now_utc
+
+# Every audit event type written by the app, with its default severity and the context keys it must
+# carry. Unknown types and missing keys are programming errors and raise ValueError at the call site,
+# so malformed events never reach the writer (where a failure would cost the whole batch).
+
+SEVERITIES = ("INFO", "WARN", "ERROR")
+MESSAGE_MAX_LEN = 1000  # audit_log.message is String(1000)
+
+
+@dataclass(frozen=True)
+class EventSpec:
+    severity: str = "INFO"
+    required: frozenset[str] = frozenset()
+
+
+def _spec(severity: str = "INFO", *required: str) -> EventSpec:
+    return EventSpec(severity=severity, required=frozenset(required))
+
+
+EVENT_TYPES: dict[str, EventSpec] = {
+    # Bootstrap / seeding
+    "BOOTSTRAP_REFRESHED": _spec("INFO", "context_version"),
+    "SEED_DONE": _spec("INFO"),
+    # Skills, tasks, workflows
+    "SKILL_RUN_STARTED": _spec("INFO", "context_version", "skill_name"),
+    "TASK_RUN_SKILL": _spec("INFO", "context_version", "task_id", "skill_name"),
+    "WORKFLOW_STARTED": _spec("INFO", "workflow_id"),
+    # Tool registry / executor
+    "TOOL_CALL": _spec("INFO", "action_id"),
+    "TOOL_RESULT": _spec("INFO", "action_id"),
+    "CONFIRMATION_REQUIRED": _spec("WARN", "action_id"),
+    "EXECUTOR_TICK": _spec("INFO", "context_version", "pending_action_id"),
+    # Outbox: one DISPATCH_ATTEMPT per tenant per batch, then one outcome event per row.
+    "OUTBOX_APPROVED": _spec("INFO", "outbox_id"),
+    "OUTBOX_DISPATCH_ATTEMPT": _spec("INFO", "context_version", "outbox_ids"),
+    "OUTBOX_BLOCKED": _spec("INFO", "outbox_id"),
+    "OUTBOX_DEFERRED": _spec("INFO", "outbox_id", "retry_after_s"),
+    "OUTBOX_SENT": _spec("INFO", "outbox_id"),
+    "OUTBOX_STUB_SENT": _spec("INFO", "outbox_id"),
+    "OUTBOX_DRY_RUN": _spec("INFO", "outbox_id"),
+    "OUTBOX_SEND_SUCCESS": _spec("INFO", "outbox_id"),
+    "OUTBOX_SEND_FAILED": _spec("ERROR", "outbox_id", "retryable"),
+    "OUTBOX_RETRY_SCHEDULED": _spec("WARN", "outbox_id", "attempt", "next_attempt_at"),
+    "OUTBOX_DEAD_LETTER": _spec("ERROR", "outbox_id", "attempt"),
+    "OUTBOX_FAILED": _spec("ERROR", "outbox_id"),
+    "OUTBOX_LEASE_EXPIRED": _spec("WARN", "outbox_id"),
+}
+
+
+@dataclass(frozen=True)
+class AuditEvent:
+    """One validated audit_log row, buffered until its transaction commits (see app.audit.writer)."""
+
+    event_type: str
+    tenant_id: str | None
+    user_id: str | None
+    severity: str
+    message: str
+    context: dict[str, Any] = field(default_factory=dict)
+    id: str = field(default_factory=new_uuid)
+    created_at: datetime = field(default_factory=now_utc)
+
+    def as_row(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "tenant_id": self.tenant_id,
+            "user_id": self.user_id,
+            "event_type": self.event_type,
+            "severity": self.severity,
+            "message": self.message,
+            "context": self.context,
+            "created_at": self.created_at,
+        }
+
+
+def new_event(
+    event_type: str,
+    *,
+    tenant_id: str | None,
+    user_id: str | None,
+    message: str,
+    context: dict[str, Any] | None = None,
+    severity: str | None = None,
+) -> AuditEvent:
+    """Validate against EVENT_TYPES and build an event (severity defaults to the type's)."""
+
+    spec = EVENT_TYPES.get(event_type)
+    if spec is None:
+        raise ValueError(f"Unknown audit event type: {event_type}")
+    context = dict(context or {})
+    missing = sorted(spec.required - context.keys())
+    if missing:
+        raise ValueError(f"Audit event {event_type} is missing context keys: {','.join(missing)}")
+    severity = severity or spec.severity
+    if severity not in SEVERITIES:
+        raise ValueError(f"Invalid audit severity: {severity}")
+    return AuditEvent(
+        event_type=event_type,
+        tenant_id=tenant_id,
+        user_id=user_id,
+        severity=severity,
+        message=str(message)[:MESSAGE_MAX_LEN],
+        context=context,
+    )
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+from collections.abc import Iterator
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.memory.object_store import put_bytes
+from app.models.tables import AuditLog
+from app.util.time import now_utc
+
+log = logging.getLogger("audit.partitions")
+
+# audit_log storage lifecycle.
+#
+# Postgres (migration 0007): audit_log is range-partitioned by month on created_at (audit_log_pYYYY_MM,
+# plus audit_log_default for rows outside every partition). ensure_partitions() keeps
+# AUDIT_PARTITION_MONTHS_AHEAD months pre-created. Other dialects keep one plain table.
+#
+# archive_expired() exports every month older than AUDIT_RETENTION_MONTHS as gzipped NDJSON to the
+# object store, one object per AUDIT_ARCHIVE_PART_ROWS rows so memory stays bounded however large the month
+# (strict puts: nothing is removed unless every part uploaded), then drops that month's partition (or
+# deletes its rows where there is none).
+
+_PARENT = "audit_log"
+_DEFAULT = "audit_log_default"
+_EXPORT_CHUNK = 5000
+_COLUMNS = tuple(c.name for c in AuditLog.__table__.columns)
+
+
+def month_start(dt: datetime) -> datetime:
+    dt = dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, n: int) -> datetime:
+    y, m = divmod(dt.month - 1 + n, 12)
+    return dt.replace(year=dt.year + y, month=m + 1)
+
+
+def partition_name(start: datetime) -> str:
+    return f"{_PARENT}_p{start:%Y_%m}"
+
+
+def is_partitioned(db: Session) -> bool:
+    bind = db.get_bind()
+    if bind is None or bind.dialect.name != "postgresql":
+        return False
+    return bool(
+        db.execute(
+            text("SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :t"),
+            {"t": _PARENT},
+        ).scalar()
+    )
+
+
+def list_partitions(db: Session) -> list[str]:
+    """Monthly partition names (the default partition excluded), oldest first. Empty when not partitioned."""
+
+    if not is_partitioned(db):
+        return []
+    rows = db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = :t"
+        ),
+        {"t": _PARENT},
+    ).scalars()
+    return sorted(name for name in rows if name != _DEFAULT)
+
+
+def ensure_partitions(db: Session, *, months_ahead: int | None = None, now: datetime | None = None) -> list[str]:
+    """Create missing monthly partitions from the current month through `months_ahead`. Returns created names."""
+
+    if not is_partitioned(db):
+        return []
+    ahead = int(settings.AUDIT_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead)
+    existing = set(list_partitions(db))
+    current = month_start(now or now_utc())
+    created: list[str] = []
+    for i in range(ahead + 1):
+        start = add_months(current, i)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        _create_partition(db, name=name, start=start, end=add_months(start, 1))
+        db.commit()
+        created.append(name)
+    if created:
+        log.info("Created audit_log partitions: %s", ",".join(created))
+    return created
+
+
+def _create_partition(db: Session, *, name: str, start: datetime, end: datetime) -> None:
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    window = {"s": start, "e": end}
+    stray = db.execute(
+        text(f"SELECT count(*) FROM {_DEFAULT} WHERE created_at >= :s AND created_at < :e"), window
+    ).scalar()
+    if not stray:
+        db.execute(text(f"CREATE TABLE {name} PARTITION OF {_PARENT} {bounds}"))
+        return
+    # Rows already in the default partition for this month (maintenance fell behind): move them into a
+    # standalone table first, since Postgres refuses to create a partition overlapping default rows.
+    db.execute(text(f"CREATE TABLE {name} (LIKE {_PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {_DEFAULT} WHERE created_at >= :s AND created_at < :e RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        window,
+    )
+    db.execute(text(f"ALTER TABLE {_PARENT} ATTACH PARTITION {name} {bounds}"))
+
+
+def _export_parts(db: Session, *, start: datetime, end: datetime) -> Iterator[tuple[bytes, int]]:
+    """Rows with start <= created_at < end as gzipped NDJSON parts of about AUDIT_ARCHIVE_PART_ROWS rows each,
+    read in keyset chunks; yields (data, rows) per part."""
+
+    part_rows = max(1, int(settings.AUDIT_ARCHIVE_PART_ROWS))
+    chunk_size = min(_EXPORT_CHUNK, part_rows)
+    cols = [getattr(AuditLog, c) for c in _COLUMNS]
+    after: tuple | None = None
+    done = False
+    while not done:
+        buf = io.BytesIO()
+        rows = 0
+        with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
+            while rows < part_rows:
+                q = db.query(*cols).filter(AuditLog.created_at >= start, AuditLog.created_at < end)
+                if after is not None:
+                    q = q.filter(or_(AuditLog.created_at > after[0], and_(AuditLog.created_at == after[0], AuditLog.id > after[1])))
+                chunk = q.order_by(AuditLog.created_at.asc(), AuditLog.id.asc()).limit(chunk_size).all()
+                for r in chunk:
+                    gz.write((json.dumps(dict(zip(_COLUMNS, r)), ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+                rows += len(chunk)
+                if len(chunk) < chunk_size:
+                    done = True
+                    break
+                after = (chunk[-1].created_at, chunk[-1].id)
+        if rows:
+            yield buf.getvalue(), rows
+
+
+def archive_expired(db: Session, *, retention_months: int | None = None, now: datetime | None = None) -> dict:
+    """Export and remove every month older than the retention window (0 keeps everything)."""
+
+    retention = int(settings.AUDIT_RETENTION_MONTHS if retention_months is None else retention_months)
+    if retention <= 0:
+        return {"ok": True, "archived": []}
+    cutoff = add_months(month_start(now or now_utc()), -retention)
+
+    partitions = set(list_partitions(db))
+    archived: list[dict] = []
+
+    def _next_month(since: datetime | None) -> datetime | None:
+        q = db.query(func.min(AuditLog.created_at)).filter(AuditLog.created_at < cutoff)
+        if since is not None:
+            q = q.filter(AuditLog.created_at >= since)
+        oldest = q.scalar()
+        return month_start(oldest) if oldest is not None else None
+
+    # Months holding expired rows (skipping empty gaps), then expired partitions that are already empty.
+    months: list[datetime] = []
+    start = _next_month(None)
+    while start is not None:
+        months.append(start)
+        start = _next_month(add_months(start, 1))
+    months += sorted(m for m in _partition_months(partitions) if m < cutoff and m not in months)
+
+    for start in months:
+        name = partition_name(start)
+        try:
+            archived.append(_archive_month(db, start=start, partition=name if name in partitions else None))
+        except Exception as e:
+            db.rollback()
+            log.exception("Archiving audit_log month %s failed: %s", f"{start:%Y-%m}", str(e))
+            return {"ok": False, "archived": archived, "error": str(e)}
+    return {"ok": True, "archived": archived}
+
+
+def _partition_months(partitions: set[str]) -> list[datetime]:
+    out = []
+    for name in partitions:
+        try:
+            out.append(datetime.strptime(name[len(_PARENT) + 2 :], "%Y_%m").replace(tzinfo=timezone.utc))
+        except ValueError:
+            continue
+    return out
+
+
+def _archive_month(db: Session, *, start: datetime, partition: str | None) -> dict:
+    end = add_months(start, 1)
+    if partition:
+        # Old months are never written to, but make sure nothing sneaks in between export and drop.
+        db.execute(text(f"LOCK TABLE {partition} IN SHARE MODE"))
+
+    # Each part is uploaded before the next is read, so at most one part is held in memory. Content-addressed
+    # keys: re-archiving a month (late rows, or a retry after a failed part) never overwrites an earlier export.
+    rows = 0
+    object_keys: list[str] = []
+    prefix = f"{settings.AUDIT_ARCHIVE_PREFIX.rstrip('/')}/{start:%Y-%m}"
+    for n, (data, part_rows) in enumerate(_export_parts(db, start=start, end=end), start=1):
+        sha = hashlib.sha256(data).hexdigest()
+        object_key = f"{prefix}/part-{n:04d}-{sha[:16]}.ndjson.gz"
+        put_bytes(object_key=object_key, data=data, content_type="application/gzip", best_effort=False)
+        object_keys.append(object_key)
+        rows += part_rows
+
+    if partition:
+        db.execute(text(f"DROP TABLE {partition}"))
+    else:
+        deleted = (
+            db.query(AuditLog)
+            .filter(AuditLog.created_at >= start, AuditLog.created_at < end)
+            .delete(synchronize_session=False)
+        )
+        if deleted != rows:
+            raise RuntimeError(f"audit_log {start:%Y-%m}: exported {rows} rows but would delete {deleted}")
+    db.commit()
+
+    log.info("Archived audit_log %s: %s rows in %s parts under %s", f"{start:%Y-%m}", rows, len(object_keys), prefix)
+    return {"month": f"{start:%Y-%m}", "rows": rows, "object_keys": object_keys, "dropped_partition": partition}
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.audit.events import AuditEvent, new_event
+from app.core.config import settings
+from app.models.tables import AuditLog
+
+log = logging.getLogger("audit")
+
+# Audit events are buffered on the Session (db.info) and written in one batch per transaction instead
+# of one ORM object per event:
+#
+# - AUDIT_WRITE_MODE=sync (default): the batch is inserted inside the committing transaction, right
+#   before COMMIT (one executemany; COPY on Postgres for large batches). Events commit atomically with
+#   the state change they describe, so a successful commit can never lose its audit trail.
+# - AUDIT_WRITE_MODE=async: the batch is handed to a background writer after COMMIT and written
+#   together with other transactions' events (fewer, larger inserts off the request/worker path).
+#   Events survive DB hiccups (retries) and shutdown (flushed on exit), but not a hard process kill.
+#
+# Either way, events of a transaction that rolls back (or is closed without committing) are dropped
+# with it.
+
+_BUFFER_KEY = "audit_events"
+_COLUMNS = ("id", "tenant_id", "user_id", "event_type", "severity", "message", "context", "created_at")
+_WRITE_ATTEMPTS = 3
+
+
+def audit(
+    db: Session,
+    event_type: str,
+    *,
+    tenant_id: str | None,
+    user_id: str | None,
+    message: str,
+    context: dict[str, Any] | None = None,
+    severity: str | None = None,
+) -> AuditEvent:
+    """Validate an event (see app.audit.events) and buffer it until `db` commits."""
+
+    ev = new_event(event_type, tenant_id=tenant_id, user_id=user_id, message=message, context=context, severity=severity)
+    db.info.setdefault(_BUFFER_KEY, []).append(ev)
+    return ev
+
+
+def record(db: Session, events: Iterable[AuditEvent]) -> None:
+    """Buffer already-built events (e.g. computed off-session by the dispatcher's send stage)."""
+
+    db.info.setdefault(_BUFFER_KEY, []).extend(events)
+
+
+def pending_events(db: Session) -> list[AuditEvent]:
+    return list(db.info.get(_BUFFER_KEY) or [])
+
+
+def write_events(conn: Connection, events: list[AuditEvent]) -> None:
+    """Insert `events` on `conn` in the caller's transaction: COPY on Postgres for large batches, else executemany."""
+
+    if not events:
+        return
+    if conn.dialect.name == "postgresql" and len(events) >= int(settings.AUDIT_COPY_MIN_ROWS):
+        try:
+            with conn.begin_nested():
+                _copy(conn, events)
+            return
+        except Exception as e:
+            log.warning("Audit COPY of %s rows failed; falling back to INSERT: %s", len(events), str(e))
+    conn.execute(insert(AuditLog.__table__), [ev.as_row() for ev in events])
+
+
+def _copy(conn: Connection, events: list[AuditEvent]) -> None:
+    # psycopg 3 COPY protocol; `context` goes in as JSON text (parsed by the jsonb input function).
+    raw = conn.connection.driver_connection
+    with raw.cursor() as cur:
+        with cur.copy(f"COPY {AuditLog.__tablename__} ({', '.join(_COLUMNS)}) FROM STDIN") as copy:
+            for ev in events:
+                row = ev.as_row()
+                row["context"] = json.dumps(row["context"], ensure_ascii=False, default=str)
+                copy.write_row([row[c] for c in _COLUMNS])
+
+
+def flush_audit(db: Session) -> int:
+    """Write `db`'s buffered events now, in its current transaction. Returns the number written."""
+
+    events = db.info.pop(_BUFFER_KEY, None)
+    if not events:
+        return 0
+    # Rows the events point at (tenants created in this transaction) must be inserted first.
+    db.flush()
+    write_events(db.connection(), events)
+    return len(events)
+
+
+def _async_mode() -> bool:
+    return str(settings.AUDIT_WRITE_MODE).strip().lower() == "async"
+
+
+@event.listens_for(Session, "before_commit")
+def _write_before_commit(session: Session) -> None:
+    if session.in_nested_transaction() or _async_mode():
+        return
+    flush_audit(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _submit_after_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    events = session.info.pop(_BUFFER_KEY, None)
+    if events:
+        get_writer().submit(session.get_bind(), events)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted(session: Session, transaction: SessionTransaction) -> None:
+    # Outermost transaction ended without writing its events: rollback or close().
+    if transaction.parent is None:
+        session.info.pop(_BUFFER_KEY, None)
+
+
+class AuditWriter:
+    """Background batch writer used in async mode.
+
+    Committed events queue up (bounded by AUDIT_QUEUE_MAX) and are written by one daemon thread in
+    batches of up to AUDIT_BATCH_SIZE, at least every AUDIT_FLUSH_INTERVAL_SECONDS. When the queue is
+    full the committing thread writes its own events synchronously (backpressure, never dropped).
+    Failed batches are retried; only a batch failing every attempt is logged in full and given up.
+    """
+
+    def __init__(self, *, batch_size: int | None = None, interval_s: float | None = None, max_queue: int | None = None):
+        self._batch_size = max(1, int(batch_size or settings.AUDIT_BATCH_SIZE))
+        self._interval_s = float(interval_s if interval_s is not None else settings.AUDIT_FLUSH_INTERVAL_SECONDS)
+        self._queue: queue.Queue[tuple[Engine, AuditEvent] | None] = queue.Queue(maxsize=int(max_queue or settings.AUDIT_QUEUE_MAX))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, bind: Engine | Connection, events: list[AuditEvent]) -> None:
+        engine = bind.engine
+        overflow: list[AuditEvent] = []
+        with self._lock:
+            if self._closed:
+                overflow = list(events)
+            else:
+                self._ensure_thread()
+                for i, ev in enumerate(events):
+                    try:
+                        self._queue.put_nowait((engine, ev))
+                    except queue.Full:
+                        log.warning("Audit queue full; writing %s events synchronously", len(events) - i)
+                        overflow = events[i:]
+                        break
+        if overflow:
+            self._write(engine, overflow)
+
+    def _ensure_thread(self) -> None:
+        # Called with self._lock held.
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self._interval_s
+            stop = False
+            while len(batch) < self._batch_size:
+                try:
+                    nxt = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            by_engine: dict[Engine, list[AuditEvent]] = defaultdict(list)
+            for engine, ev in batch:
+                by_engine[engine].append(ev)
+            for engine, events in by_engine.items():
+                self._write(engine, events)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, engine: Engine, events: list[AuditEvent]) -> None:
+        for attempt in range(1, _WRITE_ATTEMPTS + 1):
+            try:
+                with engine.begin() as conn:
+                    write_events(conn, events)
+                return
+            except Exception as e:
+                if attempt == _WRITE_ATTEMPTS:
+                    log.error(
+                        "Audit write of %s events failed after %s attempts: %s; events: %s",
+                        len(events),
+                        attempt,
+                        str(e),
+                        json.dumps([ev.as_row() for ev in events], default=str),
+                    )
+                    return
+                log.warning("Audit write of %s events failed (attempt %s/%s): %s", len(events), attempt, _WRITE_ATTEMPTS, str(e))
+                time.sleep(0.5 * 2 ** (attempt - 1))
+
+    def flush(self) -> None:
+        """Block until every event submitted so far is written."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write everything still queued and stop the thread; later submits are written synchronously."""
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+
+_lock = threading.Lock()
+_writer: AuditWriter | None = None
+
+
+def get_writer() -> AuditWriter:
+    global _writer
+    with _lock:
+        if _writer is None:
+            _writer = AuditWriter()
+        return _writer
+
+
+def set_writer(writer: AuditWriter | None) -> None:
+    """Replace the process-wide async writer (tests, or custom batching)."""
+
+    global _writer
+    with _lock:
+        _writer = writer
+
+
+@atexit.register
+def close_writer() -> None:
+    """Flush the async writer (process shutdown: FastAPI shutdown, Celery worker shutdown, atexit)."""
+
+    with _lock:
+        writer = _writer
+    if writer is not None:
+        writer.close()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
+from kombu import Queue
 
 from app.core.config import settings
 
@@ -8,11 +10,109 @@ celery = Celery(
     "clowbot",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
-    include=["app.tasks.grant_tasks", "app.tasks.jarvis_tasks"],
+    include=[
+        "app.tasks.grant_tasks",
+        "app.tasks.jarvis_tasks",
+        "app.tasks.bootstrap_tasks",
+        "app.tasks.audit_tasks",
+        "app.tasks.blob_tasks",
+        "app.tasks.vector_tasks",
+    ],
 )
 
+# Queue topology: each kind of work gets its own queue (and its own worker in docker-compose.yml),
+# so a long grants workflow can never sit in front of outbox sends.
+QUEUES = ("default", "executor", "dispatch", "workflow", "bootstrap")
+
+TASK_ROUTES = {
+    "app.tasks.jarvis_tasks.process_pending_actions": {"queue": "executor"},
+    "app.tasks.jarvis_tasks.dispatch_outbox": {"queue": "dispatch"},
+    "app.tasks.jarvis_tasks.reap_expired_leases": {"queue": "dispatch"},
+    "app.tasks.jarvis_tasks.render_outbox_previews": {"queue": "dispatch"},
+    "app.tasks.grant_tasks.run_grants_workflow_task": {"queue": "workflow"},
+    "app.tasks.bootstrap_tasks.refresh_bootstrap_all": {"queue": "bootstrap"},
+    # Low-frequency housekeeping shares the bootstrap worker, away from executor/dispatch ticks.
+    "app.tasks.audit_tasks.maintain_audit_log": {"queue": "bootstrap"},
+    "app.tasks.blob_tasks.gc_blobs": {"queue": "bootstrap"},
+    "app.tasks.blob_tasks.offload_document_blobs": {"queue": "bootstrap"},
+    # Write-behind embedding is CPU-bound; keep it off the executor/dispatch workers as well.
+    "app.tasks.vector_tasks.index_vectors": {"queue": "bootstrap"},
+}
+
+
+def _every(seconds: float, task: str, **kwargs: object) -> dict:
+    # Ticks expire after one interval: if workers are down, beat must not leave a backlog of
+    # identical ticks behind that would all run at once on recovery.
+    return {"task": task, "schedule": float(seconds), "kwargs": kwargs, "options": {"expires": float(seconds)}}
+
+
+# Task options for executor and dispatch tasks: ack after the task finishes so a killed worker's task is
+# redelivered. Safe for them only: their claims are leased (app.core.leases) and outbox sends are idempotent
+# per row. Workflow and housekeeping tasks (e.g. run_grants_workflow_task) keep ack-on-receipt, so a crash or a
+# run longer than the visibility timeout never starts them twice.
+LATE_ACK = {"acks_late": True, "reject_on_worker_lost": True}
+
+
+def build_beat_schedule() -> dict:
+    """Periodic ticks; an interval of 0 disables the entry."""
+
+    entries = {
+        "executor-tick": (
+            settings.BEAT_EXECUTOR_INTERVAL_SECONDS,
+            "app.tasks.jarvis_tasks.process_pending_actions",
+            {"limit": settings.BEAT_EXECUTOR_BATCH},
+        ),
+        "dispatch-tick": (
+            settings.BEAT_DISPATCH_INTERVAL_SECONDS,
+            "app.tasks.jarvis_tasks.dispatch_outbox",
+            {"limit": settings.BEAT_DISPATCH_BATCH},
+        ),
+        "lease-reaper": (settings.BEAT_LEASE_REAPER_INTERVAL_SECONDS, "app.tasks.jarvis_tasks.reap_expired_leases", {}),
+        "bootstrap-refresh": (
+            settings.BEAT_BOOTSTRAP_REFRESH_INTERVAL_SECONDS,
+            "app.tasks.bootstrap_tasks.refresh_bootstrap_all",
+            {},
+        ),
+        "audit-maintenance": (settings.BEAT_AUDIT_MAINTENANCE_INTERVAL_SECONDS, "app.tasks.audit_tasks.maintain_audit_log", {}),
+        "blob-gc": (settings.BEAT_BLOB_GC_INTERVAL_SECONDS, "app.tasks.blob_tasks.gc_blobs", {}),
+        "blob-offload": (
+            settings.BEAT_BLOB_OFFLOAD_INTERVAL_SECONDS,
+            "app.tasks.blob_tasks.offload_document_blobs",
+            {},
+        ),
+        "vector-index": (settings.BEAT_VECTOR_INDEX_INTERVAL_SECONDS, "app.tasks.vector_tasks.index_vectors", {}),
+    }
+    return {name: _every(interval, task, **kwargs) for name, (interval, task, kwargs) in entries.items() if interval > 0}
+
+
 celery.conf.update(
     task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
     task_eager_propagates=True,
     task_default_queue="default",
+    task_queues=[Queue(name) for name in QUEUES],
+    task_routes=TASK_ROUTES,
+    # Tasks are acked on receipt by default; only executor/dispatch tasks opt into late acks (LATE_ACK below).
+    broker_transport_options={"visibility_timeout": settings.CELERY_VISIBILITY_TIMEOUT_SECONDS},
+    # Default for short ticks; per-queue prefetch/concurrency is set on each worker's command line.
+    worker_prefetch_multiplier=settings.CELERY_WORKER_PREFETCH_MULTIPLIER,
+    beat_schedule=build_beat_schedule(),
 )
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _close_http_clients(**_: object) -> None:
+    from app.integrations.http_clients import close_all
+    from app.memory import object_store, vector_store
+
+    close_all()
+    object_store.close_client()
+    vector_store.close_client()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _flush_audit_writer(**_: object) -> None:
+    from app.audit.writer import close_writer
+
+    close_writer()
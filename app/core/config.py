@@ -20,15 +20,66 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
     CELERY_TASK_ALWAYS_EAGER: bool = False
+    CELERY_WORKER_PREFETCH_MULTIPLIER: int = 1
+    # Redis broker: an unacked message is redelivered after this long. Must exceed the longest late-acked
+    # task run (executor/dispatch ticks), or a still-running task is started a second time.
+    CELERY_VISIBILITY_TIMEOUT_SECONDS: int = 3600
+
+    # Celery beat cadence (seconds; 0 disables the entry). See app.core.celery_app.build_beat_schedule.
+    BEAT_EXECUTOR_INTERVAL_SECONDS: float = 5.0
+    BEAT_EXECUTOR_BATCH: int = 25
+    BEAT_DISPATCH_INTERVAL_SECONDS: float = 5.0
+    BEAT_DISPATCH_BATCH: int = 100
+    BEAT_LEASE_REAPER_INTERVAL_SECONDS: float = 60.0
+    BEAT_BOOTSTRAP_REFRESH_INTERVAL_SECONDS: float = 3600.0
+    BEAT_AUDIT_MAINTENANCE_INTERVAL_SECONDS: float = 86400.0
+    BEAT_BLOB_GC_INTERVAL_SECONDS: float = 3600.0
+    BEAT_BLOB_OFFLOAD_INTERVAL_SECONDS: float = 60.0
+    BEAT_VECTOR_INDEX_INTERVAL_SECONDS: float = 10.0
 
     QDRANT_URL: str = "http://localhost:6333"
+    # Base name; vectors live in <QDRANT_COLLECTION>_<embedder>_<dim> (app.memory.embeddings.collection_name).
     QDRANT_COLLECTION: str = "memory"
+    # Embedder for memory vectors: "hashing" (offline hashing-trick, EMBEDDING_DIM buckets) or "module:attr"
+    # (Embedder instance/class, or a batch callable list[str] -> (n, EMBEDDING_DIM) array). Texts are encoded
+    # EMBEDDING_BATCH_SIZE at a time.
+    EMBEDDING_BACKEND: str = "hashing"
+    EMBEDDING_DIM: int = 384
+    EMBEDDING_BATCH_SIZE: int = 64
+    # Write-behind indexing (app.memory.vector_indexer): writers queue documents in vector_index_queue and the
+    # index_vectors task embeds/upserts them VECTOR_INDEX_BATCH at a time on its beat tick; "celery" also queues
+    # the task right after the writer commits. Failed rows retry with backoff base * 2^n, capped at the max;
+    # after VECTOR_INDEX_MAX_ATTEMPTS the row goes DEAD (re-enqueueing the document revives it).
+    VECTOR_INDEX_MODE: str = "beat"
+    VECTOR_INDEX_BATCH: int = 256
+    VECTOR_INDEX_RETRY_BASE_SECONDS: float = 5.0
+    VECTOR_INDEX_RETRY_MAX_SECONDS: float = 3600.0
+    VECTOR_INDEX_MAX_ATTEMPTS: int = 12
 
     MINIO_ENDPOINT: str = "localhost:9000"
     MINIO_ACCESS_KEY: str = "minioadmin"
     MINIO_SECRET_KEY: str = "minioadmin"
     MINIO_BUCKET: str = "clowbot"
     MINIO_SECURE: bool = False
+    # One client per process (app.memory.object_store): urllib3 pool size and timeouts (including how long a
+    # request waits for a free pooled connection), how long a successful bucket-existence check is trusted, and
+    # how many uploads put_many runs concurrently (one shared thread pool per process).
+    MINIO_POOL_MAXSIZE: int = 16
+    MINIO_POOL_TIMEOUT_SECONDS: float = 10.0
+    MINIO_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    MINIO_TIMEOUT_SECONDS: float = 60.0
+    MINIO_BUCKET_CHECK_TTL_SECONDS: float = 300.0
+    MINIO_PUT_WORKERS: int = 4
+    # Streaming API (put_stream / get_stream): multipart part size (min 5 MiB) and read chunk size.
+    MINIO_PART_SIZE_BYTES: int = 16 * 1024 * 1024
+    MINIO_STREAM_CHUNK_BYTES: int = 1024 * 1024
+    # Content-addressed document bodies (app.memory.blob_store): content_text above this many UTF-8 bytes is
+    # moved (by the offload_document_blobs beat task) to the object store, once per SHA-256 (0 keeps everything
+    # inline). Unreferenced blobs are deleted after the grace period; reads are cached per process up to
+    # BLOB_READ_CACHE_BYTES.
+    DOCUMENT_INLINE_MAX_BYTES: int = 4096
+    BLOB_GC_GRACE_SECONDS: float = 86400.0
+    BLOB_READ_CACHE_BYTES: int = 32 * 1024 * 1024
 
     # Optional integrations (STUB by default)
     TELEGRAM_BOT_TOKEN: str | None = None
@@ -36,13 +87,78 @@ class Settings(BaseSettings):
     TELEGRAM_ALLOWLIST_CHATS: str = ""
     # Default chat id/username used when ToolRegistry is asked to send Telegram without explicit target.
     TELEGRAM_DEFAULT_CHAT: str = "95576236"
+    TELEGRAM_API_BASE: str = "https://api.telegram.org"
 
     # Bootstrap / Source-of-Truth
     SOT_ROOT_DIR: str = "."  # repo root inside container
     BOOTSTRAP_MAX_AGE_HOURS: int = 24
+    # Per-tenant freshness snapshot TTL used by executor/dispatcher loops and API guards (0 disables caching).
+    # A refresh bumps a Redis version stamp; other processes check it once per STAMP_CHECK window and reload
+    # when it moved, so the TTL only bounds staleness when Redis is unavailable.
+    BOOTSTRAP_CACHE_TTL_SECONDS: float = 30.0
+    BOOTSTRAP_CACHE_STAMP_CHECK_SECONDS: float = 1.0
+    BOOTSTRAP_CACHE_STAMP_PREFIX: str = "clowbot:bootstrap:version"
+
+    # Compiled tenant allowlists (app.policy.allowlist) are cached per process. Within this window a cached
+    # allowlist is used without any I/O; after it, a Redis version stamp (bumped when an allowlist document
+    # is committed) decides whether to reload. 0 disables caching.
+    POLICY_ALLOWLIST_CACHE_SECONDS: float = 1.0
+    POLICY_ALLOWLIST_STAMP_PREFIX: str = "clowbot:policy_allowlist:version"
+
+    # Shared HTTP client pools (one keep-alive pool per base URL; see app.integrations.http_clients)
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_POOL_TIMEOUT_SECONDS: float = 5.0
 
     # Outbox real sends
     OUTBOX_REAL_SEND_ENABLED: bool = False
+    # Dispatcher send stage: thread pool size and max in-flight sends per channel.
+    # Sends to the same target (chat/repo) are always sequential.
+    OUTBOX_SEND_WORKERS: int = 8
+    OUTBOX_SEND_PER_CHANNEL: int = 4
+    # Distributed token buckets (Redis) per (channel, tenant, target) for real sends.
+    # Comma-separated `channel=rate:burst`, rate in sends/second; channels not listed are unlimited.
+    # Over-budget rows are deferred (stay QUEUED), never failed.
+    OUTBOX_RATE_LIMIT_ENABLED: bool = True
+    OUTBOX_RATE_LIMITS: str = "telegram=1:3,github_issue=0.5:5"
+    # Retryable send failures (5xx, 429, timeouts) are re-queued with jittered exponential backoff.
+    # Comma-separated `channel=base_seconds:max_seconds`; after OUTBOX_MAX_ATTEMPTS the row goes DEAD.
+    OUTBOX_RETRY_BACKOFF: str = "telegram=5:300,github_issue=30:3600,email=60:3600"
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    # Preview packs (app.outbox.preview_store): eager = rendered by the dispatcher before each send;
+    # lazy = rendered on first GET /outbox/{id}/preview; async = queued to render_outbox_previews after the
+    # batch commits (rows it never reaches still render on first view).
+    OUTBOX_PREVIEW_MODE: str = "eager"
+
+    # Event-driven dispatch: writers PUBLISH on this Redis channel after commit; the wake loop
+    # (python -m app.outbox.wakeup) drains immediately and otherwise sweeps every interval.
+    OUTBOX_WAKE_ENABLED: bool = True
+    OUTBOX_WAKE_CHANNEL: str = "clowbot:outbox:wake"
+    OUTBOX_WAKE_BATCH: int = 100
+    OUTBOX_SWEEP_INTERVAL_SECONDS: float = 5.0
+
+    # Worker leases on claimed outbox rows / pending actions (renewed by a heartbeat during sends).
+    # A crashed worker's rows are recovered once the lease expires (reap_expired_leases task).
+    WORKER_LEASE_SECONDS: int = 300
+
+    # Audit log writes (app.audit): buffered per transaction and inserted as one batch.
+    # sync = inside the committing transaction (atomic with the change); async = background writer after commit.
+    AUDIT_WRITE_MODE: str = "sync"
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_QUEUE_MAX: int = 10000
+    # Postgres: batches at least this large are written with COPY instead of a multi-row INSERT.
+    AUDIT_COPY_MIN_ROWS: int = 200
+    # Storage lifecycle (app.audit.partitions): monthly partitions on Postgres are created this many months
+    # ahead; months older than AUDIT_RETENTION_MONTHS (0 = keep forever) are exported as gzipped NDJSON under
+    # AUDIT_ARCHIVE_PREFIX in the object store (one part object per AUDIT_ARCHIVE_PART_ROWS rows), then dropped.
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3
+    AUDIT_RETENTION_MONTHS: int = 12
+    AUDIT_ARCHIVE_PREFIX: str = "_archive/audit_log"
+    AUDIT_ARCHIVE_PART_ROWS: int = 100_000
 
     # GitHub
     GITHUB_TOKEN: str | None = None
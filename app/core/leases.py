@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.audit import audit
+from app.core.config import settings
+from app.models.tables import OutboxMessage, PendingAction
+from app.util.ids import new_uuid
+from app.util.time import now_utc
+
+log = logging.getLogger("leases")
+
+# Rows a worker is processing carry `claimed_by` + `lease_expires_at`. A row with a live lease is
+# invisible to other workers' claims; a crashed worker's rows become claimable again once the lease
+# expires (QUEUED / APPROVED rows) or once the reaper returns them to QUEUED (SENDING outbox rows).
+_WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{new_uuid()[:8]}"
+
+
+def worker_id() -> str:
+    """Identity written to `claimed_by` by this process."""
+
+    return _WORKER_ID
+
+
+def lease_seconds() -> int:
+    return max(1, int(settings.WORKER_LEASE_SECONDS))
+
+
+def _lease_free(model: type[OutboxMessage] | type[PendingAction], now):
+    return or_(model.lease_expires_at.is_(None), model.lease_expires_at < now)
+
+
+def candidates_select(
+    model: type[OutboxMessage] | type[PendingAction], *, status: str, limit: int, where: tuple = (), now=None
+):
+    """Claim query: the oldest `limit` rows in `status` without a live lease.
+
+    Served by the partial `WHERE status = ...` created_at indexes (migration 0006).
+    """
+
+    return (
+        select(model.id)
+        .where(model.status == status, _lease_free(model, now or now_utc()), *where)
+        .order_by(model.created_at.asc())
+        .limit(limit)
+    )
+
+
+def claim_ids(
+    db: Session,
+    model: type[OutboxMessage] | type[PendingAction],
+    *,
+    status: str,
+    limit: int,
+    where: tuple = (),
+    owner: str | None = None,
+) -> list[str]:
+    """Atomically lease up to `limit` rows in `status` (oldest first) and return their ids.
+
+    Postgres: a single `UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED) RETURNING id`,
+    so concurrent workers never lease the same row and never block on each other.
+    Other dialects (SQLite): candidate select + conditional UPDATE guarded by the same "no live lease"
+    predicate, then read back the rows carrying our exact lease; SQLite serializes writers, so a row
+    is still leased to at most one worker.
+
+    The lease is written in the caller's transaction; it becomes visible to others on commit.
+    """
+
+    owner = owner or worker_id()
+    now = now_utc()
+    until = now + timedelta(seconds=lease_seconds())
+    free = _lease_free(model, now)
+    candidates = candidates_select(model, status=status, limit=limit, where=where, now=now)
+
+    bind = db.get_bind()
+    if bind is not None and bind.dialect.name == "postgresql":
+        stmt = (
+            update(model)
+            .where(model.id.in_(candidates.with_for_update(skip_locked=True).scalar_subquery()))
+            .values(claimed_by=owner, lease_expires_at=until)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        return [row[0] for row in db.execute(stmt)]
+
+    ids = list(db.execute(candidates).scalars())
+    if not ids:
+        return []
+    db.execute(
+        update(model)
+        .where(model.id.in_(ids), model.status == status, free)
+        .values(claimed_by=owner, lease_expires_at=until)
+        .execution_options(synchronize_session=False)
+    )
+    return list(
+        db.execute(
+            select(model.id).where(model.id.in_(ids), model.claimed_by == owner, model.lease_expires_at == until)
+        ).scalars()
+    )
+
+
+def release(row: OutboxMessage | PendingAction) -> None:
+    row.claimed_by = None
+    row.lease_expires_at = None
+
+
+def extend_leases(
+    db: Session, model: type[OutboxMessage] | type[PendingAction], ids: list[str], *, owner: str | None = None
+) -> int:
+    """Push the lease of rows still owned by `owner` forward by one lease period. Returns rows extended."""
+
+    if not ids:
+        return 0
+    res = db.execute(
+        update(model)
+        .where(model.id.in_(ids), model.claimed_by == (owner or worker_id()))
+        .values(lease_expires_at=now_utc() + timedelta(seconds=lease_seconds()))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return int(res.rowcount or 0)
+
+
+class LeaseHeartbeat:
+    """Context manager that keeps leases alive while a long stage (network sends) runs.
+
+    Extends the leases every third of the lease period from a background thread with its own session
+    on the caller's engine. Failures are logged and ignored: the worst case is that a lease expires and
+    the reaper re-queues the row.
+    """
+
+    def __init__(self, db: Session, model: type[OutboxMessage] | type[PendingAction], ids: list[str]):
+        self._bind = db.get_bind()
+        self._model = model
+        self._ids = list(ids)
+        self._owner = worker_id()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run(self) -> None:
+        interval = lease_seconds() / 3
+        while not self._stop.wait(interval):
+            try:
+                with Session(bind=self._bind) as hb:
+                    extend_leases(hb, self._model, self._ids, owner=self._owner)
+            except Exception as e:
+                log.warning("Lease heartbeat failed for %s %s rows: %s", len(self._ids), self._model.__tablename__, str(e))
+
+    def __enter__(self) -> LeaseHeartbeat:
+        if self._ids:
+            self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def reap_expired_leases(db: Session, *, limit: int = 500) -> dict:
+    """Recover rows whose worker died mid-flight.
+
+    - SENDING outbox rows with an expired (or missing) lease go back to QUEUED, keeping
+      attempt_count, so the retry budget still applies (OUTBOX_LEASE_EXPIRED audit).
+    - Expired leases on APPROVED pending actions are cleared (they are already claimable again;
+      this just keeps `claimed_by` honest for operators).
+    """
+
+    now = now_utc()
+    stuck = (
+        db.query(OutboxMessage)
+        .filter(
+            OutboxMessage.status == "SENDING",
+            or_(OutboxMessage.lease_expires_at.is_(None), OutboxMessage.lease_expires_at < now),
+        )
+        .order_by(OutboxMessage.created_at.asc())
+        .limit(limit)
+    )
+    bind = db.get_bind()
+    if bind is not None and bind.dialect.name == "postgresql":
+        stuck = stuck.with_for_update(skip_locked=True)
+
+    requeued = 0
+    for m in stuck.all():
+        audit(
+            db,
+            "OUTBOX_LEASE_EXPIRED",
+            tenant_id=m.tenant_id,
+            user_id=m.user_id,
+            message="lease_expired",
+            context={"outbox_id": m.id, "claimed_by": m.claimed_by, "attempt": int(m.attempt_count or 0)},
+        )
+        m.status = "QUEUED"
+        m.next_attempt_at = None
+        release(m)
+        requeued += 1
+
+    actions = db.execute(
+        update(PendingAction)
+        .where(PendingAction.status == "APPROVED", PendingAction.lease_expires_at < now)
+        .values(claimed_by=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if requeued:
+        log.warning("Re-queued %s outbox rows with expired leases", requeued)
+    return {"ok": True, "outbox_requeued": requeued, "actions_released": int(actions.rowcount or 0)}
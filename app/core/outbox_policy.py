@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from app.policy.allowlist import CompiledAllowlist
 from app.schemas.outbox_v1 import Allowlist, OutboxPayloadV1
 
 
@@ -11,60 +12,48 @@ class PolicyDecision:
     upgraded_to_red: bool
 
 
-def _email_allowed(payload: OutboxPayloadV1) -> bool:
+def _email_allowed(payload: OutboxPayloadV1, allowlists: list[CompiledAllowlist]) -> bool:
     if payload.kind != "email":
         return True
-    allow = payload.policy.allowlist
-    allowed_domains = {d.lower().lstrip("@") for d in allow.email_domains}
-    allowed_emails = {e.lower() for e in allow.emails}
-
-    def ok_addr(addr: str) -> bool:
-        a = addr.lower()
-        if a in allowed_emails:
-            return True
-        if "@" in a:
-            dom = a.split("@", 1)[1]
-            return dom in allowed_domains
-        return False
-
     all_addrs = [x.email for x in payload.message.to + payload.message.cc + payload.message.bcc]
-    return all(ok_addr(a) for a in all_addrs)
+    return all(any(a.allows_email(addr) for a in allowlists) for addr in all_addrs)
 
 
-def _telegram_allowed(payload: OutboxPayloadV1) -> bool:
+def _telegram_allowed(payload: OutboxPayloadV1, allowlists: list[CompiledAllowlist]) -> bool:
     if payload.kind != "telegram":
         return True
-    allow = set(payload.policy.allowlist.telegram_chats)
     chat = payload.message.chat
     target = chat.chat_id or chat.username
     if not target:
         return False
-    return target in allow
+    return any(a.allows_telegram(target) for a in allowlists)
 
 
-def _github_allowed(payload: OutboxPayloadV1) -> bool:
+def _github_allowed(payload: OutboxPayloadV1, allowlists: list[CompiledAllowlist]) -> bool:
     if payload.kind != "github_issue":
         return True
-    allow = set(payload.policy.allowlist.github_repos)
-    return payload.message.repo in allow
+    return any(a.allows_github(payload.message.repo) for a in allowlists)
 
 
-def enforce_allowlist(payload: OutboxPayloadV1, *, tenant_allowlist: Allowlist | None = None) -> PolicyDecision:
+def enforce_allowlist(
+    payload: OutboxPayloadV1, *, tenant_allowlist: CompiledAllowlist | Allowlist | None = None
+) -> PolicyDecision:
     """If targets are not allowlisted, auto-upgrade to RED + requires_approval.
 
-    tenant_allowlist, if provided, is merged into payload.policy.allowlist (union).
+    A target is allowlisted if payload.policy.allowlist or tenant_allowlist (pass the cached
+    CompiledAllowlist from app.policy.allowlist.get_compiled_allowlist) lists it. The payload's own
+    allowlist is left as submitted.
     """
 
+    allowlists = [CompiledAllowlist.from_allowlist(payload.policy.allowlist)]
+    if isinstance(tenant_allowlist, Allowlist):
+        tenant_allowlist = CompiledAllowlist.from_allowlist(tenant_allowlist)
     if tenant_allowlist is not None:
-        allow = payload.policy.allowlist
-        payload.policy.allowlist = Allowlist(
-            email_domains=list(dict.fromkeys((allow.email_domains or []) + (tenant_allowlist.email_domains or []))),
-            emails=list(dict.fromkeys((allow.emails or []) + (tenant_allowlist.emails or []))),
-            telegram_chats=list(dict.fromkeys((allow.telegram_chats or []) + (tenant_allowlist.telegram_chats or []))),
-            github_repos=list(dict.fromkeys((allow.github_repos or []) + (tenant_allowlist.github_repos or []))),
-        )
-
-    allowed = _email_allowed(payload) and _telegram_allowed(payload) and _github_allowed(payload)
+        allowlists.append(tenant_allowlist)
+
+    allowed = (
+        _email_allowed(payload, allowlists) and _telegram_allowed(payload, allowlists) and _github_allowed(payload, allowlists)
+    )
 
     upgraded = False
     if not allowed:
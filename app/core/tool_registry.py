@@ -4,7 +4,9 @@ from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
 
-from app.models.tables import AuditLog, OutboxMessage, PendingAction
+from app.audit import audit
+from app.models.tables import OutboxMessage, PendingAction
+from app.outbox.wakeup import request_wake
 from app.util.ids import new_uuid
 from app.util.time import now_utc
 
@@ -21,30 +23,6 @@ class ToolResult:
     outbox_id: str | None = None
 
 
-def _audit(
-    db: Session,
-    *,
-    tenant_id: str | None,
-    user_id: str | None,
-    event_type: str,
-    severity: str,
-    message: str,
-    context: dict,
-) -> None:
-    db.add(
-        AuditLog(
-            id=new_uuid(),
-            tenant_id=tenant_id,
-            user_id=user_id,
-            event_type=event_type,
-            severity=severity,
-            message=message,
-            context=context or {},
-            created_at=now_utc(),
-        )
-    )
-
-
 def execute_pending_action(db: Session, *, action: PendingAction) -> ToolResult:
     """Execute a pending action through ToolRegistry.
 
@@ -54,23 +32,21 @@ def execute_pending_action(db: Session, *, action: PendingAction) -> ToolResult:
     - RED: requires action.status == APPROVED, otherwise raises ConfirmationRequired
     """
 
-    _audit(
+    audit(
         db,
+        "TOOL_CALL",
         tenant_id=action.tenant_id,
         user_id=action.user_id,
-        event_type="TOOL_CALL",
-        severity="INFO",
         message=f"tool={action.action_type} risk={action.risk_level}",
         context={"action_id": action.id, "payload": action.payload},
     )
 
     if action.risk_level == "RED" and action.status != "APPROVED":
-        _audit(
+        audit(
             db,
+            "CONFIRMATION_REQUIRED",
             tenant_id=action.tenant_id,
             user_id=action.user_id,
-            event_type="CONFIRMATION_REQUIRED",
-            severity="WARN",
             message="RED action blocked: not approved",
             context={"action_id": action.id, "tool": action.action_type},
         )
@@ -78,12 +54,11 @@ def execute_pending_action(db: Session, *, action: PendingAction) -> ToolResult:
 
     # GREEN noop
     if action.action_type in {"noop", "internal.noop"}:
-        _audit(
+        audit(
             db,
+            "TOOL_RESULT",
             tenant_id=action.tenant_id,
             user_id=action.user_id,
-            event_type="TOOL_RESULT",
-            severity="INFO",
             message="noop",
             context={"action_id": action.id, "ok": True},
         )
@@ -101,14 +76,14 @@ def execute_pending_action(db: Session, *, action: PendingAction) -> ToolResult:
 
         m.meta = dict(m.meta or {})
         m.meta["approved"] = True
+        request_wake(db)
         db.commit()
 
-        _audit(
+        audit(
             db,
+            "OUTBOX_APPROVED",
             tenant_id=action.tenant_id,
             user_id=action.user_id,
-            event_type="OUTBOX_APPROVED",
-            severity="INFO",
             message="outbox_send_approved",
             context={"outbox_id": outbox_id},
         )
@@ -147,13 +122,14 @@ def execute_pending_action(db: Session, *, action: PendingAction) -> ToolResult:
         sent_at=None,
     )
     db.add(outbox)
+    # The caller commits the action status together with the outbox row; the dispatcher is woken then.
+    request_wake(db)
 
-    _audit(
+    audit(
         db,
+        "TOOL_RESULT",
         tenant_id=action.tenant_id,
         user_id=action.user_id,
-        event_type="TOOL_RESULT",
-        severity="INFO",
         message="queued_to_outbox",
         context={"action_id": action.id, "outbox_id": outbox.id, "ok": True},
     )
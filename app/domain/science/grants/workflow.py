@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session
 
-from app.models.tables import AuditLog, Document, Task, Workflow
+from app.audit import audit
+from app.models.tables import Document, Task, Workflow
 from app.tasks.grant_tasks import run_grants_workflow_task
 from app.util.ids import new_uuid
 from app.util.time import now_utc
@@ -23,17 +24,13 @@ def start_grants_workflow(*, db: Session, tenant_id: str, user_id: str) -> str:
         updated_at=now_utc(),
     )
     db.add(wf)
-    db.add(
-        AuditLog(
-            id=new_uuid(),
-            tenant_id=tenant_id,
-            user_id=user_id,
-            event_type="WORKFLOW_STARTED",
-            severity="INFO",
-            message="Science grants workflow created",
-            context={"workflow_id": wf_id},
-            created_at=now_utc(),
-        )
+    audit(
+        db,
+        "WORKFLOW_STARTED",
+        tenant_id=tenant_id,
+        user_id=user_id,
+        message="Science grants workflow created",
+        context={"workflow_id": wf_id},
     )
     db.commit()
 
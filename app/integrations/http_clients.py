@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+import httpx
+
+from app.core.config import settings
+
+log = logging.getLogger("http_clients")
+
+
+@dataclass
+class PoolStats:
+    requests: int = 0
+    # Requests that raised (timeouts, connection errors); they count in neither opened nor reused.
+    failed: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    # Time spent acquiring a pooled connection (waiting for a free one when the pool is full), summed over all
+    # requests; `waited` counts the requests whose acquisition took longer than _WAIT_THRESHOLD_S.
+    waited: int = 0
+    wait_seconds: float = 0.0
+
+
+# Acquiring an idle connection takes microseconds; above this (clear of scheduling noise) a request queued
+# behind busy connections.
+_WAIT_THRESHOLD_S = 0.01
+
+
+def _acquired(event_name: str) -> bool:
+    # First httpcore trace event after the pool handed the request a connection: a new connection starts
+    # connecting, or a reused one starts sending.
+    return event_name.startswith("connection.connect_") or event_name.endswith(".send_request_headers.started")
+
+
+def _pool_connections(transport: httpx.BaseTransport) -> list | None:
+    """The connections in a transport's httpcore pool, or None if they cannot be read.
+
+    Private API: HTTPTransport._pool is an httpcore.ConnectionPool with a `connections` list in httpx 0.27 /
+    httpcore 1.0 (httpx is pinned in pyproject.toml); re-check this helper when upgrading either.
+    """
+
+    try:
+        return list(transport._pool.connections)  # type: ignore[attr-defined]
+    except Exception:
+        return None
+
+
+class _MeteredTransport(httpx.HTTPTransport):
+    """HTTPTransport that records, per request, the pool wait and whether it opened or reused a connection.
+
+    Both come from httpcore trace events, so the wait covers connection acquisition only, not the request.
+    """
+
+    def __init__(self, *, stats: PoolStats, lock: threading.Lock, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+        self._lock = lock
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        seen = {"opened": False, "acquired_at": None}
+        outer_trace = request.extensions.get("trace")
+
+        def trace(event_name: str, info: dict) -> None:
+            if seen["acquired_at"] is None and _acquired(event_name):
+                seen["acquired_at"] = time.perf_counter()
+            if event_name == "connection.connect_tcp.started":
+                seen["opened"] = True
+            if outer_trace is not None:
+                outer_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+
+        started = time.perf_counter()
+        failed = False
+        try:
+            return super().handle_request(request)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            # A request that failed before getting a connection (pool timeout) waited all along.
+            wait = (seen["acquired_at"] or time.perf_counter()) - started
+            with self._lock:
+                s = self._stats
+                s.requests += 1
+                if failed:
+                    s.failed += 1
+                elif seen["opened"]:
+                    s.connections_opened += 1
+                else:
+                    s.connections_reused += 1
+                s.wait_seconds += wait
+                if wait > _WAIT_THRESHOLD_S:
+                    s.waited += 1
+
+
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+_stats: dict[str, PoolStats] = {}
+
+
+def _normalize(base_url: str) -> str:
+    return base_url.rstrip("/")
+
+
+def get_client(base_url: str) -> httpx.Client:
+    """Shared keep-alive client for one base URL (one connection pool per base URL).
+
+    Clients are thread-safe and live for the whole process; close_all() is wired into the
+    FastAPI and Celery worker shutdown hooks.
+    """
+
+    key = _normalize(base_url)
+    with _lock:
+        c = _clients.get(key)
+        if c is not None:
+            return c
+
+        stats = _stats.setdefault(key, PoolStats())
+        limits = httpx.Limits(
+            max_connections=int(settings.HTTP_POOL_MAX_CONNECTIONS),
+            max_keepalive_connections=int(settings.HTTP_POOL_MAX_KEEPALIVE),
+            keepalive_expiry=float(settings.HTTP_KEEPALIVE_EXPIRY_SECONDS),
+        )
+        transport = _MeteredTransport(stats=stats, lock=_lock, limits=limits)
+        c = httpx.Client(
+            base_url=key,
+            transport=transport,
+            timeout=httpx.Timeout(
+                float(settings.HTTP_TIMEOUT_SECONDS),
+                connect=float(settings.HTTP_CONNECT_TIMEOUT_SECONDS),
+                pool=float(settings.HTTP_POOL_TIMEOUT_SECONDS),
+            ),
+        )
+        _clients[key] = c
+        return c
+
+
+def pool_metrics() -> dict[str, dict]:
+    """Per-base-URL pool counters plus currently open connections."""
+
+    with _lock:
+        out: dict[str, dict] = {}
+        for key, s in _stats.items():
+            m = asdict(s)
+            m["wait_seconds"] = round(s.wait_seconds, 6)
+            c = _clients.get(key)
+            conns = _pool_connections(c._transport) if c is not None else []
+            m["connections_open"] = len(conns) if conns is not None else None
+            out[key] = m
+        return out
+
+
+def close_all() -> None:
+    """Close every pooled client (idempotent). Counters are kept for the process lifetime."""
+
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for c in clients:
+        try:
+            c.close()
+        except Exception:
+            log.warning("Failed to close HTTP client %s", c.base_url)
@@ -2,13 +2,19 @@ from __future__ import annotations
 
 import httpx
 
+from app.core.config import settings
+from app.integrations.http_clients import get_client
+
 
 class TelegramSendError(Exception):
-    pass
+    def __init__(self, message: str, *, retryable: bool = False, retry_after_s: float | None = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after_s = retry_after_s
 
 
 def send_message(*, token: str, chat_id: str, text: str, parse_mode: str | None = None, disable_preview: bool = True) -> dict:
-    url = f"https://api.telegram.org/bot{token}/sendMessage"
+    url = f"/bot{token}/sendMessage"
     payload: dict = {
         "chat_id": chat_id,
         "text": text,
@@ -17,15 +23,23 @@ def send_message(*, token: str, chat_id: str, text: str, parse_mode: str | None
     if parse_mode:
         payload["parse_mode"] = parse_mode
 
-    with httpx.Client(timeout=10.0) as client:
-        r = client.post(url, json=payload)
+    try:
+        r = get_client(settings.TELEGRAM_API_BASE).post(url, json=payload)
+    except httpx.TransportError as e:
+        raise TelegramSendError(f"sendMessage transport error: {type(e).__name__}: {e}", retryable=True)
 
+    retryable = r.status_code == 429 or r.status_code >= 500
     try:
         data = r.json()
     except Exception:
-        raise TelegramSendError(f"Non-JSON response: status={r.status_code} body={r.text[:200]}")
+        raise TelegramSendError(f"Non-JSON response: status={r.status_code} body={r.text[:200]}", retryable=retryable)
 
     if r.status_code != 200 or not data.get("ok"):
-        raise TelegramSendError(f"sendMessage failed: status={r.status_code} data={data}")
+        retry_after = (data.get("parameters") or {}).get("retry_after")
+        raise TelegramSendError(
+            f"sendMessage failed: status={r.status_code} data={data}",
+            retryable=retryable,
+            retry_after_s=float(retry_after) if retry_after else None,
+        )
 
     return data
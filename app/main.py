@@ -10,6 +10,7 @@ from sqlalchemy import text
 
 from app.api.routers.actions import router as actions_router
 from app.api.routers.admin import router as admin_router
+from app.api.routers.audit import router as audit_router
 from app.api.routers.mindmap import router as mindmap_router
 from app.api.routers.memory import router as memory_router
 from app.api.routers.outbox import router as outbox_router
@@ -18,10 +19,15 @@ from app.api.routers.science_grants import router as science_grants_router
 from app.api.routers.skills import router as skills_router
 from app.api.routers.tasks import router as tasks_router
 from app.api.routers.tools import router as tools_router
+from app.audit.writer import close_writer as close_audit_writer
 from app.core.config import settings
 from app.core.db import engine
 from app.core.logging import configure_logging
+from app.integrations.http_clients import close_all as close_http_clients
+from app.integrations.http_clients import pool_metrics
+from app.memory.object_store import close_client as close_object_store_client
 from app.memory.object_store import ensure_minio_bucket, minio_ready
+from app.memory.vector_store import close_client as close_qdrant_client
 from app.memory.vector_store import ensure_qdrant_collection, qdrant_ready
 
 configure_logging(settings.LOG_LEVEL)
@@ -75,6 +81,14 @@ def _startup() -> None:
     _retry_backoff(lambda: ensure_minio_bucket(), what="minio")
 
 
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    close_http_clients()
+    close_object_store_client()
+    close_qdrant_client()
+    close_audit_writer()
+
+
 @app.get("/health")
 def health() -> dict[str, Any]:
     deps = {
@@ -83,7 +97,7 @@ def health() -> dict[str, Any]:
         "qdrant": qdrant_ready(),
         "minio": minio_ready(),
     }
-    return {"ok": all(deps.values()), "deps": deps, "app": settings.APP_NAME}
+    return {"ok": all(deps.values()), "deps": deps, "app": settings.APP_NAME, "http_pools": pool_metrics()}
 
 
 app.include_router(admin_router, prefix="/admin", tags=["admin"])
@@ -92,6 +106,7 @@ app.include_router(mindmap_router, prefix="/mindmap", tags=["mindmap"])
 app.include_router(memory_router, prefix="/memory", tags=["memory"])
 app.include_router(actions_router, prefix="/actions", tags=["actions"])
 app.include_router(outbox_router, prefix="/outbox", tags=["outbox"])
+app.include_router(audit_router, prefix="/audit", tags=["audit"])
 app.include_router(policy_router, prefix="/policy", tags=["policy"])
 app.include_router(skills_router, prefix="/skills", tags=["skills"])
 app.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
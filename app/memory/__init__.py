@@ -1,3 +1,4 @@
 from app.memory import vector_store  # noqa: F401
 from app.memory import object_store  # noqa: F401
 from app.memory import bootstrap  # noqa: F401
+from app.memory import blob_store  # noqa: F401
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import timedelta
+
+from sqlalchemy import case, delete, event, func, inspect, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.memory.object_store import delete_object, get_stream, put_bytes
+from app.models.tables import Blob, Document
+from app.util.time import now_utc
+
+log = logging.getLogger("memory.blob_store")
+
+# Content-addressed blobs: bytes are stored once per SHA-256 under blobs/sha256/<2>/<sha256> in the object
+# store, with a `blobs` row counting the documents that point at them (Document.object_key).
+# Documents are always written inline; offload_documents() (the offload_document_blobs beat task) later moves
+# content_text over DOCUMENT_INLINE_MAX_BYTES out of the row (content_text -> None, object_key -> blob), so no
+# request or flush waits on the object store. Read text with document_text().
+#
+# Refcounts: a flush listener adjusts them for ORM writes of Document.object_key (new, re-pointed, deleted
+# documents) in the flushing transaction, without any network I/O. Offloading reserves the blob row (and
+# refreshes its grace period) in its own short transaction before uploading, and takes the reference only
+# after the upload succeeded. GC deletes a row, only if unreferenced past BLOB_GC_GRACE_SECONDS, and its object
+# while holding that row, so an offload that reserved it meanwhile waits and then uploads again. Uploads
+# whose reference never commits leave an unreferenced row that GC collects with the object. Bulk deletes
+# (Query.delete) bypass the counts: such blobs leak instead of being collected, never the other way round.
+#
+# If the object store is unavailable, text stays inline (logged, then retried after _UPLOAD_BACKOFF_S).
+
+BLOB_PREFIX = "blobs/sha256"
+TEXT_CONTENT_TYPE = "text/plain; charset=utf-8"
+_UPLOAD_BACKOFF_S = 30.0
+
+_lock = threading.Lock()
+_upload_down_until = 0.0
+_cache: OrderedDict[str, bytes] = OrderedDict()
+_cache_bytes = 0
+
+
+def blob_key(sha256: str) -> str:
+    return f"{BLOB_PREFIX}/{sha256[:2]}/{sha256}"
+
+
+def blob_sha256(object_key: str | None) -> str | None:
+    """The SHA-256 a blob object key points at; None for any other key."""
+
+    if not object_key or not object_key.startswith(BLOB_PREFIX + "/"):
+        return None
+    return object_key.rsplit("/", 1)[-1]
+
+
+def _cache_get(sha256: str) -> bytes | None:
+    with _lock:
+        data = _cache.get(sha256)
+        if data is not None:
+            _cache.move_to_end(sha256)
+        return data
+
+
+def _cache_put(sha256: str, data: bytes) -> None:
+    global _cache_bytes
+    cap = int(settings.BLOB_READ_CACHE_BYTES)
+    if len(data) > cap // 4:
+        return
+    with _lock:
+        if sha256 in _cache:
+            return
+        _cache[sha256] = data
+        _cache_bytes += len(data)
+        while _cache_bytes > cap:
+            _, evicted = _cache.popitem(last=False)
+            _cache_bytes -= len(evicted)
+
+
+def read_blob(sha256: str) -> bytes:
+    """A blob's bytes (cached per process; blobs are immutable). Raises if the object cannot be read."""
+
+    data = _cache_get(sha256)
+    if data is not None:
+        return data
+    data = b"".join(get_stream(blob_key(sha256)))
+    if hashlib.sha256(data).hexdigest() != sha256:
+        raise ValueError(f"Blob {sha256} does not match its content hash")
+    _cache_put(sha256, data)
+    return data
+
+
+def document_text(doc: Document) -> str | None:
+    """The document's text, from the row or, when it was moved out, from the blob store."""
+
+    if doc.content_text is not None:
+        return doc.content_text
+    sha256 = blob_sha256(doc.object_key)
+    if sha256 is None:
+        return None
+    return read_blob(sha256).decode("utf-8")
+
+
+def _change_refs(conn: Connection, sha256: str, n: int, *, size_bytes: int = 0) -> int | None:
+    """Add n references to a blob (creating its row); returns the new refcount where the dialect reports it."""
+
+    now = now_utc()
+    if n < 0:
+        conn.execute(
+            update(Blob)
+            .where(Blob.sha256 == sha256)
+            .values(refcount=Blob.refcount + n, released_at=case((Blob.refcount + n <= 0, now), else_=Blob.released_at))
+        )
+        return None
+
+    values = {
+        "sha256": sha256,
+        "size_bytes": size_bytes,
+        "content_type": TEXT_CONTENT_TYPE,
+        "refcount": n,
+        "created_at": now,
+        "released_at": None,
+    }
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(Blob).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["sha256"], set_={"refcount": Blob.refcount + n, "released_at": None}
+        ).returning(Blob.refcount)
+        return conn.execute(stmt).scalar_one()
+
+    if conn.execute(update(Blob).where(Blob.sha256 == sha256).values(refcount=Blob.refcount + n, released_at=None)).rowcount:
+        return conn.execute(select(Blob.refcount).where(Blob.sha256 == sha256)).scalar_one()
+    conn.execute(Blob.__table__.insert().values(**values))
+    return n
+
+
+def _reserve(conn: Connection, sha256: str, size_bytes: int) -> int:
+    """Make sure a row exists before uploading; returns its refcount.
+
+    New rows start unreferenced, and an unreferenced row gets a fresh released_at, so GC leaves the blob
+    alone for BLOB_GC_GRACE_SECONDS while the caller uploads and takes its reference. An upload whose
+    reference never commits (failure, rollback) is still collected: its row ages out like any released blob.
+    """
+
+    now = now_utc()
+    values = {
+        "sha256": sha256,
+        "size_bytes": size_bytes,
+        "content_type": TEXT_CONTENT_TYPE,
+        "refcount": 0,
+        "created_at": now,
+        "released_at": now,
+    }
+    touch = case((Blob.refcount <= 0, now), else_=Blob.released_at)
+    dialect = conn.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        stmt = insert(Blob).values(**values).on_conflict_do_update(index_elements=["sha256"], set_={"released_at": touch})
+        return conn.execute(stmt.returning(Blob.refcount)).scalar_one()
+
+    if not conn.execute(update(Blob).where(Blob.sha256 == sha256).values(released_at=touch)).rowcount:
+        conn.execute(Blob.__table__.insert().values(**values))
+    return conn.execute(select(Blob.refcount).where(Blob.sha256 == sha256)).scalar_one()
+
+
+def _upload(object_key: str, data: bytes) -> bool:
+    global _upload_down_until
+    if time.monotonic() < _upload_down_until:
+        return False
+    try:
+        put_bytes(object_key=object_key, data=data, content_type=TEXT_CONTENT_TYPE, best_effort=False)
+        return True
+    except Exception as e:
+        _upload_down_until = time.monotonic() + _UPLOAD_BACKOFF_S
+        log.warning("Blob upload failed (keeping document text inline, retry in %ss): %s", _UPLOAD_BACKOFF_S, str(e))
+        return False
+
+
+def offload_document(db: Session, doc_id: str) -> bool:
+    """Move one document's large content_text into the blob store. False = left inline.
+
+    Three steps, none of which holds a transaction open across network I/O: reserve the blob row (commit),
+    upload unless the blob is already referenced, then move the text out and take the reference (commit),
+    guarded so a document edited in the meantime is left alone.
+    """
+
+    limit = int(settings.DOCUMENT_INLINE_MAX_BYTES)
+    row = db.execute(select(Document.object_key, Document.content_text).where(Document.id == doc_id)).first()
+    if limit <= 0 or row is None or row.object_key or not row.content_text:
+        return False
+    text = row.content_text
+    data = text.encode("utf-8")
+    if len(data) <= limit:
+        return False
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    key = blob_key(sha256)
+    refcount = _reserve(db.connection(), sha256, len(data))
+    db.commit()
+    # Referenced blobs exist in the object store; a new or released one may not (yet, or any more).
+    if refcount <= 0 and not _upload(key, data):
+        return False
+
+    moved = db.execute(
+        update(Document)
+        .where(Document.id == doc_id, Document.object_key.is_(None), Document.content_text == text)
+        .values(object_key=key, content_text=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if moved:
+        _change_refs(db.connection(), sha256, 1, size_bytes=len(data))
+    db.commit()
+    if moved:
+        _cache_put(sha256, data)
+    return bool(moved)
+
+
+def offload_documents(db: Session, *, limit: int = 100, after: str = "") -> dict:
+    """Offload up to `limit` inline documents over DOCUMENT_INLINE_MAX_BYTES (ids after `after`, in id order).
+
+    Selected by character length, which never exceeds the UTF-8 size: multi-byte texts just over the
+    threshold in bytes but not in characters stay inline. last_id is None once there is nothing left to scan
+    (or the object store is unavailable).
+    """
+
+    threshold = int(settings.DOCUMENT_INLINE_MAX_BYTES)
+    if threshold <= 0:
+        return {"moved": 0, "kept_inline": 0, "last_id": None}
+    ids = list(
+        db.execute(
+            select(Document.id)
+            .where(Document.id > after, Document.object_key.is_(None), func.length(Document.content_text) > threshold)
+            .order_by(Document.id)
+            .limit(limit)
+        ).scalars()
+    )
+    db.commit()
+    moved = 0
+    for doc_id in ids:
+        moved += offload_document(db, doc_id)
+        if time.monotonic() < _upload_down_until:
+            # Object store unavailable: stop the pass (last_id None) instead of reserving rows for nothing.
+            return {"moved": moved, "kept_inline": len(ids) - moved, "last_id": None}
+    return {"moved": moved, "kept_inline": len(ids) - moved, "last_id": ids[-1] if ids else None}
+
+
+def _committed_object_key(doc: Document) -> str | None:
+    hist = inspect(doc).attrs.object_key.history
+    old = hist.unchanged or hist.deleted
+    return old[0] if old else None
+
+
+@event.listens_for(Session, "before_flush")
+def _count_document_blobs(session: Session, flush_context, instances) -> None:
+    deltas: dict[str, int] = defaultdict(int)
+
+    for obj in list(session.new):
+        if isinstance(obj, Document):
+            sha256 = blob_sha256(obj.object_key)
+            if sha256:
+                deltas[sha256] += 1
+
+    for obj in list(session.dirty):
+        if not isinstance(obj, Document):
+            continue
+        state = inspect(obj)
+        if state.attrs.content_text.history.added and obj.content_text is not None and blob_sha256(obj.object_key):
+            # New inline text replaces the blob.
+            obj.object_key = None
+        hist = state.attrs.object_key.history
+        for key in hist.deleted:
+            if blob_sha256(key):
+                deltas[blob_sha256(key)] -= 1
+        for key in hist.added:
+            if blob_sha256(key):
+                deltas[blob_sha256(key)] += 1
+
+    for obj in list(session.deleted):
+        if isinstance(obj, Document):
+            sha256 = blob_sha256(_committed_object_key(obj))
+            if sha256:
+                deltas[sha256] -= 1
+
+    if any(deltas.values()):
+        conn = session.connection()
+        for sha256, n in deltas.items():
+            if n:
+                _change_refs(conn, sha256, n)
+
+
+def gc_blobs(db: Session, *, limit: int = 500) -> dict:
+    """Delete blobs that have been unreferenced for longer than BLOB_GC_GRACE_SECONDS.
+
+    Each blob's row is deleted (only if still unreferenced and not re-reserved) and its object removed before that row delete
+    commits; a failed object delete rolls the row back so the next run retries it.
+    """
+
+    cutoff = now_utc() - timedelta(seconds=float(settings.BLOB_GC_GRACE_SECONDS))
+    candidates = (
+        db.execute(select(Blob.sha256).where(Blob.refcount <= 0, Blob.released_at < cutoff).limit(limit)).scalars().all()
+    )
+    deleted = failed = 0
+    for sha256 in candidates:
+        try:
+            stmt = (
+                delete(Blob)
+                .where(Blob.sha256 == sha256, Blob.refcount <= 0, Blob.released_at < cutoff)
+                .execution_options(synchronize_session=False)
+            )
+            if db.execute(stmt).rowcount:
+                delete_object(blob_key(sha256))
+                deleted += 1
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            failed += 1
+            log.warning("Blob %s GC failed: %s", sha256, str(e))
+    return {"ok": True, "deleted": deleted, "failed": failed, "scanned": len(candidates)}
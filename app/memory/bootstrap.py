@@ -1,20 +1,27 @@
 from __future__ import annotations
 
 import hashlib
-import json
-from dataclasses import dataclass
-from datetime import timedelta
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from redis import Redis
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.audit import audit
 from app.core.config import settings
-from app.memory.vector_store import upsert_document_text_best_effort
-from app.models.tables import AuditLog, Document
+from app.memory.vector_indexer import enqueue_vector_index
+from app.models.tables import Document
 from app.util.ids import new_uuid
 from app.util.time import now_utc
 
+log = logging.getLogger("memory.bootstrap")
+
 
 @dataclass(frozen=True)
 class BootstrapSource:
@@ -54,21 +61,6 @@ def compute_context_version(doc_sha_by_type: dict[str, str]) -> str:
     return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
 
 
-def _audit(db: Session, *, tenant_id: str, user_id: str | None, event_type: str, severity: str, message: str, context: dict) -> None:
-    db.add(
-        AuditLog(
-            id=new_uuid(),
-            tenant_id=tenant_id,
-            user_id=user_id,
-            event_type=event_type,
-            severity=severity,
-            message=message,
-            context=context or {},
-            created_at=now_utc(),
-        )
-    )
-
-
 def refresh_bootstrap(
     db: Session,
     *,
@@ -130,21 +122,20 @@ def refresh_bootstrap(
             created_at=refreshed_at,
         )
         db.add(doc)
+        # Embedded off the request path (app.memory.vector_indexer), committed together with the document.
+        enqueue_vector_index(db, tenant_id=tenant_id, doc_id=doc.id, domain="sot", source_type=src.doc_type)
         db.commit()
 
-        # Vector upsert best-effort
-        upsert_document_text_best_effort(tenant_id=tenant_id, doc_id=doc.id, domain="sot", source_type=src.doc_type, text=content)
-
         updated.append({"doc_type": src.doc_type, "document_id": doc.id, "updated": True})
 
     context_version = compute_context_version(sha_by_type)
+    invalidate_bootstrap_cache(tenant_id=tenant_id)
 
-    _audit(
+    audit(
         db,
+        "BOOTSTRAP_REFRESHED",
         tenant_id=tenant_id,
         user_id=user_id,
-        event_type="BOOTSTRAP_REFRESHED",
-        severity="INFO",
         message="bootstrap_refreshed",
         context={"context_version": context_version, "updated": updated},
     )
@@ -153,31 +144,41 @@ def refresh_bootstrap(
     return {"ok": True, "updated": updated, "context_version": context_version, "refreshed_at": refreshed_at.isoformat()}
 
 
+def _latest_sot_documents(db: Session, *, tenant_id: str) -> dict[str, Document]:
+    """Latest SoT document per doc_type, fetched in a single windowed query."""
+
+    rn = (
+        func.row_number()
+        .over(partition_by=Document.doc_type, order_by=Document.created_at.desc())
+        .label("rn")
+    )
+    ranked = (
+        db.query(Document.id.label("id"), rn)
+        .filter(
+            Document.tenant_id == tenant_id,
+            Document.domain == "sot",
+            Document.doc_type.in_([src.doc_type for src in SOT_SOURCES]),
+        )
+        .subquery()
+    )
+    docs = db.query(Document).join(ranked, Document.id == ranked.c.id).filter(ranked.c.rn == 1).all()
+    return {d.doc_type: d for d in docs}
+
+
 def bootstrap_status(db: Session, *, tenant_id: str) -> dict[str, Any]:
-    latest_docs: dict[str, Document] = {}
+    latest_docs = _latest_sot_documents(db, tenant_id=tenant_id)
     sha_by_type: dict[str, str] = {}
     refreshed_at_max = None
 
     for src in SOT_SOURCES:
-        d: Document | None = (
-            db.query(Document)
-            .filter(Document.tenant_id == tenant_id, Document.domain == "sot", Document.doc_type == src.doc_type)
-            .order_by(Document.created_at.desc())
-            .first()
-        )
+        d = latest_docs.get(src.doc_type)
         if not d:
             continue
-        latest_docs[src.doc_type] = d
         sha = (d.meta or {}).get("content_sha256")
         if sha:
             sha_by_type[src.doc_type] = sha
-        ra = (d.meta or {}).get("refreshed_at")
-        try:
-            # if missing, use created_at
-            pass
-        finally:
-            if refreshed_at_max is None or d.created_at > refreshed_at_max:
-                refreshed_at_max = d.created_at
+        if refreshed_at_max is None or d.created_at > refreshed_at_max:
+            refreshed_at_max = d.created_at
 
     context_version = compute_context_version(sha_by_type) if sha_by_type else None
 
@@ -202,35 +203,151 @@ def bootstrap_status(db: Session, *, tenant_id: str) -> dict[str, Any]:
     }
 
 
+# Bootstrap snapshots are cached per process (_bootstrap_snapshot). A refresh drops the local entry and
+# INCRs the tenant's version stamp in Redis; other API/worker processes compare that stamp once per
+# BOOTSTRAP_CACHE_STAMP_CHECK_SECONDS and reload only when it moved. Without Redis (or a lost bump) a
+# snapshot is still reloaded after BOOTSTRAP_CACHE_TTL_SECONDS.
+
+# After a failed Redis call, skip Redis for this long instead of paying a connect timeout per lookup.
+_STAMP_BACKOFF_S = 30.0
+
+
+@dataclass(frozen=True)
+class _BootstrapSnapshot:
+    present: frozenset[str]
+    context_version: str | None
+    refreshed_at: str | None
+    stamp: int | None
+    checked_until: float
+    expires_at: float
+
+
+_cache_lock = threading.Lock()
+_snapshots: dict[str, _BootstrapSnapshot] = {}
+_redis: Redis | None = None
+_stamp_down_until = 0.0
+
+
+def get_redis() -> Redis:
+    global _redis
+    with _cache_lock:
+        if _redis is None:
+            _redis = Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        return _redis
+
+
+def set_redis(redis: Redis | None) -> None:
+    """Replace the process-wide Redis client used for version stamps (tests, or custom Redis wiring)."""
+
+    global _redis, _stamp_down_until
+    with _cache_lock:
+        _redis = redis
+        _stamp_down_until = 0.0
+
+
+def _stamp_key(tenant_id: str) -> str:
+    return f"{settings.BOOTSTRAP_CACHE_STAMP_PREFIX}:{tenant_id}"
+
+
+def _redis_call(fn, what: str):
+    """Run fn(redis); None when Redis is unavailable (logged, then skipped for _STAMP_BACKOFF_S)."""
+
+    global _stamp_down_until
+    if time.monotonic() < _stamp_down_until:
+        return None
+    try:
+        return fn(get_redis())
+    except Exception as e:
+        _stamp_down_until = time.monotonic() + _STAMP_BACKOFF_S
+        log.warning("Bootstrap version stamp %s failed (falling back to the cache TTL): %s", what, str(e))
+        return None
+
+
+def _read_stamp(tenant_id: str) -> int | None:
+    raw = _redis_call(lambda r: r.get(_stamp_key(tenant_id)), "read")
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def invalidate_bootstrap_cache(*, tenant_id: str | None = None) -> None:
+    """Drop cached bootstrap snapshots (one tenant, or all when tenant_id is None).
+
+    For a single tenant the Redis version stamp is bumped too, so other processes reload on their next
+    check. Called by refresh_bootstrap.
+    """
+
+    with _cache_lock:
+        if tenant_id is None:
+            _snapshots.clear()
+            return
+        _snapshots.pop(tenant_id, None)
+    _redis_call(lambda r: r.incr(_stamp_key(tenant_id)), "bump")
+
+
+def _bootstrap_snapshot(db: Session, *, tenant_id: str) -> _BootstrapSnapshot:
+    """Per-tenant bootstrap snapshot, cached for BOOTSTRAP_CACHE_TTL_SECONDS unless its stamp moves.
+
+    Only the latest-document summary is cached; the age check in check_bootstrap_fresh
+    is evaluated against the current time on every call.
+    """
+
+    ttl = float(settings.BOOTSTRAP_CACHE_TTL_SECONDS)
+    now_m = time.monotonic()
+    with _cache_lock:
+        snap = _snapshots.get(tenant_id)
+    if snap and snap.expires_at > now_m and snap.checked_until > now_m:
+        return snap
+
+    # Read the stamp before the documents: a refresh landing in between leaves us with an older stamp,
+    # which only causes one extra reload later.
+    stamp = _read_stamp(tenant_id) if ttl > 0 else None
+    checked_until = now_m + float(settings.BOOTSTRAP_CACHE_STAMP_CHECK_SECONDS)
+    if snap and snap.expires_at > now_m and stamp == snap.stamp:
+        snap = replace(snap, checked_until=checked_until)
+    else:
+        st = bootstrap_status(db, tenant_id=tenant_id)
+        snap = _BootstrapSnapshot(
+            present=frozenset(s["doc_type"] for s in st["sources"] if s.get("document_id")),
+            context_version=st.get("context_version"),
+            refreshed_at=st.get("refreshed_at"),
+            stamp=stamp,
+            checked_until=checked_until,
+            expires_at=now_m + ttl,
+        )
+    if ttl > 0:
+        with _cache_lock:
+            _snapshots[tenant_id] = snap
+    return snap
+
+
 def check_bootstrap_fresh(db: Session, *, tenant_id: str) -> tuple[bool, str | None, str]:
     """Return (ok, context_version, reason)."""
 
-    st = bootstrap_status(db, tenant_id=tenant_id)
+    st = _bootstrap_snapshot(db, tenant_id=tenant_id)
     now = now_utc()
 
     # Required docs
-    present = {s["doc_type"] for s in st["sources"] if s.get("document_id")}
-    missing = sorted(list(REQUIRED_DOC_TYPES - present))
+    missing = sorted(list(REQUIRED_DOC_TYPES - st.present))
     if missing:
-        return False, st.get("context_version"), f"missing_required_documents:{','.join(missing)}"
+        return False, st.context_version, f"missing_required_documents:{','.join(missing)}"
 
-    refreshed_at = st.get("refreshed_at")
+    refreshed_at = st.refreshed_at
     if not refreshed_at:
-        return False, st.get("context_version"), "no_refreshed_at"
+        return False, st.context_version, "no_refreshed_at"
 
     # parse with fromisoformat
     try:
-        from datetime import datetime, timezone
-
         ra = datetime.fromisoformat(refreshed_at.replace("Z", "+00:00"))
         if ra.tzinfo is None:
             # SQLite or legacy rows may be naive; treat as UTC.
             ra = ra.replace(tzinfo=timezone.utc)
     except Exception:
-        return False, st.get("context_version"), "bad_refreshed_at"
+        return False, st.context_version, "bad_refreshed_at"
 
     max_age = timedelta(hours=int(settings.BOOTSTRAP_MAX_AGE_HOURS))
     if now - ra > max_age:
-        return False, st.get("context_version"), "bootstrap_stale"
+        return False, st.context_version, "bootstrap_stale"
 
-    return True, st.get("context_version"), "ok"
+    return True, st.context_version, "ok"
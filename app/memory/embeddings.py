@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import importlib
+import re
+import threading
+import zlib
+from collections import Counter
+from collections.abc import Callable, Sequence
+from typing import Protocol
+
+import numpy as np
+
+from app.core.config import settings
+
+# Local, offline text embeddings for the memory vector store (app.memory.vector_store).
+# An Embedder maps a batch of texts to an (n, dim) float32 array of L2-normalised rows (all-zero rows for
+# texts without tokens). The process-wide embedder comes from EMBEDDING_BACKEND:
+#   hashing         - signed hashing-trick bag of words + bigrams with sublinear term frequency (no model files;
+#                     stable across processes and versions, so stored vectors stay valid)
+#   module:attr     - an Embedder instance, an Embedder class (called with dim=EMBEDDING_DIM), or a plain batch
+#                     callable list[str] -> array-like (n, EMBEDDING_DIM), e.g. a local ONNX/CPU model
+# Vectors from different embedders or dimensions are not comparable, so each (name, dim) gets its own Qdrant
+# collection (collection_name); scripts/migrate_vector_collection.py re-embeds an old collection into it.
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class Embedder(Protocol):
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalise each row in place (zero rows stay zero); returns the array."""
+
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class HashingEmbedder:
+    """Hashing-trick embedder: unigrams and bigrams hashed (CRC-32) into `dim` signed buckets, weighted 1 + log(tf)."""
+
+    name = "hashing"
+
+    def __init__(self, dim: int = 384, *, bigrams: bool = True):
+        if dim <= 0:
+            raise ValueError("dim must be positive")
+        self.dim = dim
+        self.bigrams = bigrams
+
+    def _features(self, text: str) -> Counter[str]:
+        tokens = tokenize(text or "")
+        features = Counter(tokens)
+        if self.bigrams:
+            features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        return features
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        n = len(texts)
+        rows: list[int] = []
+        features: list[str] = []
+        counts: list[int] = []
+        for row, text in enumerate(texts):
+            c = self._features(text)
+            rows.extend([row] * len(c))
+            features.extend(c)
+            counts.extend(c.values())
+
+        # Hash, weight and accumulate the whole batch as arrays: bit 0 of the hash is the sign, the rest the slot.
+        h = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.int64, count=len(features))
+        index = np.asarray(rows, dtype=np.int64) * self.dim + (h >> 1) % self.dim
+        weight = (1 - 2 * (h & 1)) * (1.0 + np.log(np.asarray(counts, dtype=np.float64)))
+        flat = np.bincount(index, weights=weight, minlength=n * self.dim)
+        return normalize_rows(flat.astype(np.float32).reshape(n, self.dim))
+
+
+class CallableEmbedder:
+    """Adapts a batch callable (list[str] -> array-like of shape (n, dim)), e.g. a local ONNX/CPU model."""
+
+    def __init__(self, fn: Callable[[list[str]], object], *, dim: int, name: str = "callable"):
+        self.fn = fn
+        self.dim = dim
+        self.name = name
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.array(self.fn(list(texts)), dtype=np.float32).reshape(len(texts), -1)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedder {self.name} returned {vectors.shape[1]}-dim vectors, expected {self.dim}")
+        return normalize_rows(vectors)
+
+
+def embed_batched(embedder: Embedder, texts: Sequence[str], *, batch_size: int | None = None) -> np.ndarray:
+    """Embed any number of texts in EMBEDDING_BATCH_SIZE chunks; returns one (n, dim) array."""
+
+    size = max(1, int(batch_size or settings.EMBEDDING_BATCH_SIZE))
+    if len(texts) <= size:
+        return embedder.embed(texts)
+    return np.vstack([embedder.embed(texts[i : i + size]) for i in range(0, len(texts), size)])
+
+
+def build_embedder(backend: str | None = None, *, dim: int | None = None) -> Embedder:
+    backend = backend or settings.EMBEDDING_BACKEND
+    dim = int(dim or settings.EMBEDDING_DIM)
+    if backend == "hashing":
+        return HashingEmbedder(dim)
+    if ":" not in backend:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r} (expected 'hashing' or 'module:attr')")
+
+    module, attr = backend.split(":", 1)
+    obj = getattr(importlib.import_module(module), attr)
+    if isinstance(obj, type):
+        return obj(dim=dim)
+    if hasattr(obj, "embed"):
+        return obj
+    return CallableEmbedder(obj, dim=dim, name=attr.lower())
+
+
+_lock = threading.Lock()
+_embedder: Embedder | None = None
+
+
+def get_embedder() -> Embedder:
+    global _embedder
+    with _lock:
+        if _embedder is None:
+            _embedder = build_embedder()
+        return _embedder
+
+
+def set_embedder(embedder: Embedder | None) -> None:
+    """Replace the process-wide embedder (tests, or wiring a model in code); None rebuilds it from settings."""
+
+    global _embedder
+    with _lock:
+        _embedder = embedder
+
+
+def collection_name(embedder: Embedder | None = None) -> str:
+    """Qdrant collection for an embedder's vectors: <QDRANT_COLLECTION>_<name>_<dim>."""
+
+    e = embedder or get_embedder()
+    return f"{settings.QDRANT_COLLECTION}_{e.name}_{e.dim}"
@@ -1,56 +1,285 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import os
+import threading
 import time
-from typing import Callable, TypeVar
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator, TypeVar
 
+import certifi
+import urllib3
 from minio import Minio
+from minio.commonconfig import CopySource
+from minio.error import S3Error
 
 from app.core.config import settings
 
+# One Minio client (and urllib3 connection pool) per process, shared by all threads; bucket existence is
+# checked once per MINIO_BUCKET_CHECK_TTL_SECONDS instead of on every write (a NoSuchBucket error forgets
+# the check, so a bucket deleted underneath us is recreated on the retry). put_many uploads on one
+# process-wide thread pool (MINIO_PUT_WORKERS threads), shut down with the client.
+
+_lock = threading.Lock()
+_bucket_check_lock = threading.Lock()
+_client_instance: Minio | None = None
+_put_pool: ThreadPoolExecutor | None = None
+_bucket_checked_until: dict[str, float] = {}
+
+
+@dataclass(frozen=True)
+class PutObject:
+    object_key: str
+    data: bytes
+    content_type: str = "application/octet-stream"
+
 
 def put_text(*, object_key: str, text: str, content_type: str = "text/plain; charset=utf-8") -> str:
     """Write text into MinIO. Best-effort (falls back to returning the key)."""
-    import io
 
     data = text.encode("utf-8")
     return put_bytes(object_key=object_key, data=data, content_type=content_type)
 
 
-def put_bytes(*, object_key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
-    """Write bytes into MinIO. Best-effort (falls back to returning the key)."""
-    import io
+def put_bytes(
+    *, object_key: str, data: bytes, content_type: str = "application/octet-stream", best_effort: bool = True
+) -> str:
+    """Write bytes into MinIO. Best-effort (falls back to returning the key) unless best_effort=False,
+    in which case errors are raised (callers that delete the source data afterwards need that)."""
 
     def _op() -> str:
         c = _client()
-        if not c.bucket_exists(settings.MINIO_BUCKET):
-            c.make_bucket(settings.MINIO_BUCKET)
-        c.put_object(
-            settings.MINIO_BUCKET,
-            object_key,
-            io.BytesIO(data),
-            length=len(data),
-            content_type=content_type,
-        )
+        _ensure_bucket(c, settings.MINIO_BUCKET)
+        try:
+            c.put_object(
+                settings.MINIO_BUCKET,
+                object_key,
+                io.BytesIO(data),
+                length=len(data),
+                content_type=content_type,
+            )
+        except S3Error as e:
+            if e.code == "NoSuchBucket":
+                _forget_bucket(settings.MINIO_BUCKET)
+            raise
         return object_key
 
     try:
         return _with_retry(_op, attempts=2)
     except Exception:
+        if not best_effort:
+            raise
         # In unit tests / offline mode we still return the deterministic key.
         return object_key
 
+
+def put_many(objects: list[PutObject], *, best_effort: bool = True) -> list[str]:
+    """Write several objects concurrently (up to MINIO_PUT_WORKERS at once); returns their keys in order.
+
+    Same error semantics as put_bytes: with best_effort=False the first failure is raised once every
+    upload has finished.
+    """
+
+    def _put(o: PutObject) -> str:
+        return put_bytes(object_key=o.object_key, data=o.data, content_type=o.content_type, best_effort=best_effort)
+
+    if min(int(settings.MINIO_PUT_WORKERS), len(objects)) <= 1:
+        return [_put(o) for o in objects]
+    futures = [_put_executor().submit(_put, o) for o in objects]
+    wait(futures)
+    return [f.result() for f in futures]
+
+
+def _put_executor() -> ThreadPoolExecutor:
+    global _put_pool
+    with _lock:
+        if _put_pool is None:
+            _put_pool = ThreadPoolExecutor(max_workers=int(settings.MINIO_PUT_WORKERS), thread_name_prefix="object-put")
+        return _put_pool
+
+
+@dataclass(frozen=True)
+class StoredObject:
+    """Result of a streamed upload; size and digest are computed while the data passes through."""
+
+    object_key: str
+    size_bytes: int
+    sha256: str
+    etag: str | None = None
+
+
+class _HashingReader:
+    """File-like wrapper that hashes and counts everything read through it."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._sha = hashlib.sha256()
+        self.size = 0
+
+    def read(self, n: int = -1) -> bytes:
+        data = self._stream.read(n)
+        if data:
+            self._sha.update(data)
+            self.size += len(data)
+        return data
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+
+def put_stream(
+    *, object_key: str, stream: BinaryIO, content_type: str = "application/octet-stream", part_size: int | None = None
+) -> StoredObject:
+    """Upload a stream of unknown length without loading it into memory; returns its size and SHA-256.
+
+    Data is sent in MINIO_PART_SIZE_BYTES parts (multipart upload once it exceeds one part), one part in
+    memory at a time. Not best-effort and not retried (the stream is consumed): errors are raised, and a
+    failed multipart upload is aborted.
+    """
+
+    c = _client()
+    _ensure_bucket(c, settings.MINIO_BUCKET)
+    reader = _HashingReader(stream)
+    result = c.put_object(
+        settings.MINIO_BUCKET,
+        object_key,
+        reader,
+        length=-1,
+        content_type=content_type,
+        part_size=int(part_size or settings.MINIO_PART_SIZE_BYTES),
+        # Parallel part uploads queue parts in memory without bound when reading outpaces the network.
+        num_parallel_uploads=1,
+    )
+    return StoredObject(object_key=object_key, size_bytes=reader.size, sha256=reader.hexdigest(), etag=result.etag)
+
+
+def get_stream(
+    object_key: str, *, offset: int = 0, length: int | None = None, chunk_size: int | None = None
+) -> Iterator[bytes]:
+    """Read an object (or the byte range [offset, offset + length)) as a stream of chunks.
+
+    The connection goes back to the pool when the iterator is exhausted or closed.
+    """
+
+    resp = _client().get_object(settings.MINIO_BUCKET, object_key, offset=offset, length=length or 0)
+    try:
+        yield from resp.stream(int(chunk_size or settings.MINIO_STREAM_CHUNK_BYTES))
+    finally:
+        resp.close()
+        resp.release_conn()
+
+
+def get_range(object_key: str, *, offset: int, length: int) -> bytes:
+    return b"".join(get_stream(object_key, offset=offset, length=length))
+
+
+def delete_object(object_key: str) -> None:
+    _client().remove_object(settings.MINIO_BUCKET, object_key)
+
+
+def copy_object(*, source_key: str, dest_key: str) -> str:
+    """Server-side copy within the bucket (no data passes through this process); returns dest_key."""
+
+    c = _client()
+    c.copy_object(settings.MINIO_BUCKET, dest_key, CopySource(settings.MINIO_BUCKET, source_key))
+    return dest_key
+
+
 T = TypeVar("T")
 
 
-def _client() -> Minio:
+class _PoolManager(urllib3.PoolManager):
+    """PoolManager whose requests wait at most `pool_timeout` for a free pooled connection.
+
+    Minio calls urlopen without pool_timeout, and urllib3 then waits forever on a blocking pool; past the
+    timeout the request fails with EmptyPoolError (retried like any other error by _with_retry).
+    """
+
+    def __init__(self, *, pool_timeout: float, **kw):
+        super().__init__(**kw)
+        self.pool_timeout = pool_timeout
+
+    def urlopen(self, method: str, url: str, redirect: bool = True, **kw):
+        kw.setdefault("pool_timeout", self.pool_timeout)
+        return super().urlopen(method, url, redirect=redirect, **kw)
+
+
+def _build_client() -> Minio:
+    timeout = float(settings.MINIO_TIMEOUT_SECONDS)
+    http = _PoolManager(
+        timeout=urllib3.Timeout(connect=float(settings.MINIO_CONNECT_TIMEOUT_SECONDS), read=timeout),
+        maxsize=int(settings.MINIO_POOL_MAXSIZE),
+        # Block instead of opening throwaway connections past maxsize when every pooled one is busy,
+        # for at most MINIO_POOL_TIMEOUT_SECONDS.
+        block=True,
+        pool_timeout=float(settings.MINIO_POOL_TIMEOUT_SECONDS),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+        # Transport-level retries stay short: callers retry whole operations (_with_retry).
+        retries=urllib3.Retry(total=1, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]),
+    )
     return Minio(
         endpoint=settings.MINIO_ENDPOINT,
         access_key=settings.MINIO_ACCESS_KEY,
         secret_key=settings.MINIO_SECRET_KEY,
         secure=settings.MINIO_SECURE,
+        http_client=http,
     )
 
 
+def _client() -> Minio:
+    global _client_instance
+    with _lock:
+        if _client_instance is None:
+            _client_instance = _build_client()
+        return _client_instance
+
+
+def set_client(client: Minio | None) -> None:
+    """Replace the process-wide Minio client (tests, benchmarks); None rebuilds it from settings on next use."""
+
+    global _client_instance
+    with _lock:
+        _client_instance = client
+        _bucket_checked_until.clear()
+
+
+def close_client() -> None:
+    """Drop the shared client and the put_many pool; pooled connections close with them (process shutdown)."""
+
+    global _put_pool
+    set_client(None)
+    with _lock:
+        pool, _put_pool = _put_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _bucket_fresh(bucket: str) -> bool:
+    with _lock:
+        return _bucket_checked_until.get(bucket, 0.0) > time.monotonic()
+
+
+def _ensure_bucket(c: Minio, bucket: str) -> None:
+    if _bucket_fresh(bucket):
+        return
+    # Concurrent first writers wait for one check instead of each issuing their own.
+    with _bucket_check_lock:
+        if _bucket_fresh(bucket):
+            return
+        if not c.bucket_exists(bucket):
+            c.make_bucket(bucket)
+        with _lock:
+            _bucket_checked_until[bucket] = time.monotonic() + float(settings.MINIO_BUCKET_CHECK_TTL_SECONDS)
+
+
+def _forget_bucket(bucket: str) -> None:
+    with _lock:
+        _bucket_checked_until.pop(bucket, None)
+
+
 def _with_retry(fn: Callable[[], T], *, attempts: int = 3, sleep_s: float = 0.3) -> T:
     last_exc: Exception | None = None
     for i in range(attempts):
@@ -74,9 +303,5 @@ def minio_ready() -> bool:
 
 
 def ensure_minio_bucket() -> None:
-    def _op() -> None:
-        c = _client()
-        if not c.bucket_exists(settings.MINIO_BUCKET):
-            c.make_bucket(settings.MINIO_BUCKET)
-
-    _with_retry(_op, attempts=3)
+    _forget_bucket(settings.MINIO_BUCKET)
+    _with_retry(lambda: _ensure_bucket(_client(), settings.MINIO_BUCKET), attempts=3)
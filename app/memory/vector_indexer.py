@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.leases import lease_seconds, worker_id
+from app.memory.blob_store import document_text
+from app.memory.vector_store import index_document_texts
+from app.models.tables import Document, VectorIndexJob
+from app.util.time import now_utc
+
+log = logging.getLogger("memory.vector_indexer")
+
+# Write-behind memory vectors. Document writers call enqueue_vector_index(db, ...) in the transaction that
+# creates the document; the row in vector_index_queue commits (or rolls back) with it, so no write is lost
+# and the writer never waits for embedding or Qdrant. index_pending() (the index_vectors task: beat tick,
+# and right after the writer commits with VECTOR_INDEX_MODE=celery) claims due rows, embeds them in batches
+# and upserts one call per tenant through the shared Qdrant client. When a tenant's call fails its documents
+# are retried one by one, so a single bad document does not hold back the rest. Failed rows stay queued and
+# are retried with exponential backoff until VECTOR_INDEX_MAX_ATTEMPTS, then go DEAD; a claimed row whose
+# worker died becomes due again when its lease expires.
+
+_SESSION_FLAG = "vector_index_kick"
+# After a failed task publish, skip publishing for this long instead of paying a broker timeout per commit.
+_KICK_BACKOFF_S = 30.0
+_ERROR_MAX_CHARS = 2000
+# After a failed tenant batch, give up on one-by-one retries once this many fail before any succeeds
+# (Qdrant is down, not a bad document): the remaining documents keep the batch error.
+_SINGLE_RETRY_PROBES = 3
+
+_kick_down_until = 0.0
+
+
+def enqueue_vector_index(db: Session, *, tenant_id: str, doc_id: str, domain: str, source_type: str) -> None:
+    """Queue a document for embedding in the caller's transaction (re-queuing resets its retries and revives it)."""
+
+    now = now_utc()
+    reset = {
+        "status": "QUEUED",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "claimed_by": None,
+        "last_error": None,
+        "enqueued_at": now,
+    }
+    values = {"doc_id": doc_id, "tenant_id": tenant_id, "domain": domain, "source_type": source_type, **reset}
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        db.execute(insert(VectorIndexJob).values(**values).on_conflict_do_update(index_elements=["doc_id"], set_=reset))
+    else:
+        db.merge(VectorIndexJob(**values))
+    db.info[_SESSION_FLAG] = True
+
+
+def _kick() -> None:
+    global _kick_down_until
+    if time.monotonic() < _kick_down_until:
+        return
+    try:
+        from app.tasks.vector_tasks import index_vectors
+
+        index_vectors.delay()
+    except Exception as e:
+        _kick_down_until = time.monotonic() + _KICK_BACKOFF_S
+        log.warning("Queueing index_vectors failed (rows are indexed on the next beat tick): %s", str(e))
+
+
+@event.listens_for(Session, "after_commit")
+def _kick_after_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_FLAG, False) and str(settings.VECTOR_INDEX_MODE).strip().lower() == "celery":
+        _kick()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
+
+
+def retry_delay_s(attempts: int) -> float:
+    """Backoff before retry number `attempts` (1-based): base * 2^(attempts-1), capped."""
+
+    base = float(settings.VECTOR_INDEX_RETRY_BASE_SECONDS)
+    return min(float(settings.VECTOR_INDEX_RETRY_MAX_SECONDS), base * 2 ** max(0, attempts - 1))
+
+
+def attempts_exhausted(attempts: int) -> bool:
+    return attempts >= int(settings.VECTOR_INDEX_MAX_ATTEMPTS)
+
+
+def claim_jobs(db: Session, *, limit: int) -> list[VectorIndexJob]:
+    """Lease up to `limit` due rows (oldest first) to this worker and commit the lease.
+
+    Same scheme as app.core.leases.claim_ids: UPDATE ... FOR UPDATE SKIP LOCKED RETURNING on Postgres,
+    a conditional UPDATE plus read-back elsewhere. The lease is next_attempt_at itself.
+    """
+
+    owner = worker_id()
+    now = now_utc()
+    until = now + timedelta(seconds=lease_seconds())
+    due = (
+        select(VectorIndexJob.doc_id)
+        .where(VectorIndexJob.status == "QUEUED", VectorIndexJob.next_attempt_at <= now)
+        .order_by(VectorIndexJob.next_attempt_at.asc())
+        .limit(limit)
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = (
+            update(VectorIndexJob)
+            .where(VectorIndexJob.doc_id.in_(due.with_for_update(skip_locked=True).scalar_subquery()))
+            .values(claimed_by=owner, next_attempt_at=until)
+            .returning(VectorIndexJob.doc_id)
+            .execution_options(synchronize_session=False)
+        )
+        ids = list(db.execute(stmt).scalars())
+    else:
+        ids = list(db.execute(due).scalars())
+        if ids:
+            db.execute(
+                update(VectorIndexJob)
+                .where(
+                    VectorIndexJob.doc_id.in_(ids),
+                    VectorIndexJob.status == "QUEUED",
+                    VectorIndexJob.next_attempt_at <= now,
+                )
+                .values(claimed_by=owner, next_attempt_at=until)
+                .execution_options(synchronize_session=False)
+            )
+            ids = list(
+                db.execute(
+                    select(VectorIndexJob.doc_id).where(
+                        VectorIndexJob.doc_id.in_(ids),
+                        VectorIndexJob.claimed_by == owner,
+                        VectorIndexJob.next_attempt_at == until,
+                    )
+                ).scalars()
+            )
+    db.commit()
+    if not ids:
+        return []
+    return list(db.execute(select(VectorIndexJob).where(VectorIndexJob.doc_id.in_(ids))).scalars())
+
+
+def _finish(db: Session, *, done: list[str], failed: dict[str, str], attempts: dict[str, int]) -> int:
+    """Delete indexed rows and back off (or dead-letter) failed ones; returns how many went DEAD."""
+
+    # Guarded by claimed_by: a row re-queued while we worked on it (claim reset) stays queued.
+    owner = worker_id()
+    if done:
+        db.execute(delete(VectorIndexJob).where(VectorIndexJob.doc_id.in_(done), VectorIndexJob.claimed_by == owner))
+    now = now_utc()
+    dead = 0
+    for doc_id, error in failed.items():
+        n = attempts[doc_id] + 1
+        values = {"attempts": n, "claimed_by": None, "last_error": error[:_ERROR_MAX_CHARS]}
+        if attempts_exhausted(n):
+            values["status"] = "DEAD"
+            dead += 1
+        else:
+            values["next_attempt_at"] = now + timedelta(seconds=retry_delay_s(n))
+        db.execute(
+            update(VectorIndexJob)
+            .where(VectorIndexJob.doc_id == doc_id, VectorIndexJob.claimed_by == owner)
+            .values(**values)
+        )
+    db.commit()
+    return dead
+
+
+def _index_tenant(tenant_id: str, items: list[dict[str, str]], *, done: list[str], failed: dict[str, str]) -> int:
+    """Upsert one tenant's documents in one call; if that fails, retry them one by one. Returns points written."""
+
+    try:
+        written = index_document_texts(tenant_id=tenant_id, docs=items)
+        done.extend(item["doc_id"] for item in items)
+        return written
+    except Exception as e:
+        batch_error = f"upsert failed: {e}"
+        if len(items) == 1:
+            failed[items[0]["doc_id"]] = batch_error
+            return 0
+
+    written = ok = 0
+    for i, item in enumerate(items):
+        if not ok and i >= _SINGLE_RETRY_PROBES:
+            failed.update({rest["doc_id"]: batch_error for rest in items[i:]})
+            break
+        try:
+            written += index_document_texts(tenant_id=tenant_id, docs=[item])
+            done.append(item["doc_id"])
+            ok += 1
+        except Exception as e:
+            failed[item["doc_id"]] = f"upsert failed: {e}"
+    return written
+
+
+def index_pending(db: Session, *, limit: int | None = None) -> dict:
+    """Claim one batch of due rows, embed and upsert them; returns counts for the batch."""
+
+    jobs = claim_jobs(db, limit=max(1, int(limit or settings.VECTOR_INDEX_BATCH)))
+    stats = {"claimed": len(jobs), "indexed": 0, "failed": 0, "skipped": 0, "dead": 0}
+    if not jobs:
+        return stats
+
+    docs = {d.id: d for d in db.execute(select(Document).where(Document.id.in_([j.doc_id for j in jobs]))).scalars()}
+    done: list[str] = []
+    failed: dict[str, str] = {}
+    by_tenant: dict[str, list[dict[str, str]]] = defaultdict(list)
+    for job in jobs:
+        doc = docs.get(job.doc_id)
+        if doc is None:
+            done.append(job.doc_id)  # deleted since it was queued
+            stats["skipped"] += 1
+            continue
+        try:
+            text = document_text(doc) or ""
+        except Exception as e:
+            failed[job.doc_id] = f"read failed: {e}"
+            continue
+        by_tenant[job.tenant_id].append(
+            {"doc_id": job.doc_id, "domain": job.domain, "source_type": job.source_type, "text": text}
+        )
+
+    for tenant_id, items in by_tenant.items():
+        stats["indexed"] += _index_tenant(tenant_id, items, done=done, failed=failed)
+
+    if failed:
+        log.warning("Vector indexing failed for %s documents (retrying later): %s", len(failed), next(iter(failed.values())))
+    stats["failed"] = len(failed)
+    stats["dead"] = _finish(db, done=done, failed=failed, attempts={j.doc_id: j.attempts for j in jobs})
+    if stats["dead"]:
+        log.warning("%s documents exhausted VECTOR_INDEX_MAX_ATTEMPTS and were dead-lettered", stats["dead"])
+    return stats
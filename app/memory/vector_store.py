@@ -1,19 +1,53 @@
 from __future__ import annotations
 
-import hashlib
+import threading
 import time
 from typing import Any, Callable, TypeVar
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qm
+from qdrant_client.http.exceptions import UnexpectedResponse
 
 from app.core.config import settings
+from app.memory.embeddings import collection_name, embed_batched, get_embedder
 
 T = TypeVar("T")
 
+# One client per process (its HTTP connection pool is reused across calls) and a memo of collections known
+# to exist, so writers do not list every collection before each upsert. A collection deleted underneath us
+# (404 on upsert) is forgotten and re-created on the next ensure.
+
+_lock = threading.Lock()
+_client_instance: QdrantClient | None = None
+_known_collections: set[str] = set()
+
 
 def _client() -> QdrantClient:
-    return QdrantClient(url=settings.QDRANT_URL, timeout=2.0)
+    global _client_instance
+    with _lock:
+        if _client_instance is None:
+            _client_instance = QdrantClient(url=settings.QDRANT_URL, timeout=2.0)
+        return _client_instance
+
+
+def set_client(client: QdrantClient | None) -> None:
+    """Replace the process-wide Qdrant client (tests); None rebuilds it from settings on next use."""
+
+    global _client_instance
+    with _lock:
+        old, _client_instance = _client_instance, client
+        _known_collections.clear()
+    if old is not None and old is not client:
+        try:
+            old.close()
+        except Exception:
+            pass
+
+
+def close_client() -> None:
+    """Drop the shared client and close its connections (process shutdown)."""
+
+    set_client(None)
 
 
 def _with_retry(fn: Callable[[], T], *, attempts: int = 3, sleep_s: float = 0.3) -> T:
@@ -37,22 +71,33 @@ def qdrant_ready() -> bool:
         return False
 
 
-def ensure_qdrant_collection() -> None:
+def ensure_qdrant_collection(name: str | None = None, *, dim: int | None = None) -> str:
+    """Create the collection (default: the active embedder's) if missing; returns its name."""
+
+    embedder = get_embedder()
+    name = name or collection_name(embedder)
+    size = dim or embedder.dim
+    if name in _known_collections:
+        return name
+
     def _op() -> None:
         c = _client()
-        name = settings.QDRANT_COLLECTION
         existing = {col.name for col in c.get_collections().collections}
         if name in existing:
             return
         c.create_collection(
             collection_name=name,
-            vectors_config=qm.VectorParams(size=8, distance=qm.Distance.COSINE),
+            vectors_config=qm.VectorParams(size=size, distance=qm.Distance.COSINE),
         )
 
     _with_retry(_op, attempts=3)
+    _known_collections.add(name)
+    return name
+
 
+def upsert_memory_vectors(*, tenant_id: str, points: list[dict[str, Any]], collection: str | None = None) -> None:
+    collection = collection or collection_name()
 
-def upsert_memory_vectors(*, tenant_id: str, points: list[dict[str, Any]]) -> None:
     def _op() -> None:
         c = _client()
         qpoints: list[qm.PointStruct] = []
@@ -60,17 +105,26 @@ def upsert_memory_vectors(*, tenant_id: str, points: list[dict[str, Any]]) -> No
             payload = dict(p["payload"])
             payload["tenant_id"] = tenant_id
             qpoints.append(qm.PointStruct(id=p["id"], vector=p["vector"], payload=payload))
-        c.upsert(collection_name=settings.QDRANT_COLLECTION, points=qpoints)
+        try:
+            c.upsert(collection_name=collection, points=qpoints)
+        except UnexpectedResponse as e:
+            if e.status_code == 404:
+                _known_collections.discard(collection)
+            raise
 
     _with_retry(_op, attempts=3)
 
 
-def search_memory(*, tenant_id: str, query_vector: list[float], top_k: int = 5) -> list[dict]:
+def search_memory(
+    *, tenant_id: str, query_vector: list[float], top_k: int = 5, collection: str | None = None
+) -> list[dict]:
+    collection = collection or collection_name()
+
     def _op() -> list[dict]:
         c = _client()
         must = [qm.FieldCondition(key="tenant_id", match=qm.MatchValue(value=tenant_id))]
         res = c.search(
-            collection_name=settings.QDRANT_COLLECTION,
+            collection_name=collection,
             query_vector=query_vector,
             limit=top_k,
             query_filter=qm.Filter(must=must),
@@ -80,38 +134,35 @@ def search_memory(*, tenant_id: str, query_vector: list[float], top_k: int = 5)
     return _with_retry(_op, attempts=3)
 
 
-def _hash_vector8(text: str) -> list[float]:
-    """Deterministic 8-dim pseudo-embedding based on sha256.
-
-    This is not a semantic embedding, but it enables consistent vector upserts
-    and makes bootstrap logic testable without external embedding services.
-    """
+def search_memory_text(*, tenant_id: str, query: str, top_k: int = 5) -> list[dict]:
+    """Embed the query with the active embedder and search its collection."""
 
-    h = hashlib.sha256(text.encode("utf-8")).digest()
-    # 8 floats in [0,1]
-    vec = [b / 255.0 for b in h[:8]]
-    return vec
+    vector = get_embedder().embed([query])[0]
+    if not vector.any():
+        return []
+    return search_memory(tenant_id=tenant_id, query_vector=vector.tolist(), top_k=top_k)
 
 
-def upsert_document_text_best_effort(*, tenant_id: str, doc_id: str, domain: str, source_type: str, text: str) -> None:
-    """Best-effort vector upsert for a document.
+def index_document_texts(*, tenant_id: str, docs: list[dict[str, str]]) -> int:
+    """Embed documents in EMBEDDING_BATCH_SIZE batches and upsert them in one call; returns the points written.
 
-    If Qdrant is unavailable, silently does nothing.
+    Each doc is {"doc_id", "domain", "source_type", "text"}; texts without tokens are skipped. Raises on
+    Qdrant errors (callers retry: app.memory.vector_indexer).
     """
 
-    try:
-        if not qdrant_ready():
-            return
-        ensure_qdrant_collection()
-        upsert_memory_vectors(
-            tenant_id=tenant_id,
-            points=[
-                {
-                    "id": doc_id,
-                    "vector": _hash_vector8(text or ""),
-                    "payload": {"domain": domain, "source_type": source_type},
-                }
-            ],
-        )
-    except Exception:
-        return
+    if not docs:
+        return 0
+    collection = ensure_qdrant_collection()
+    vectors = embed_batched(get_embedder(), [d.get("text") or "" for d in docs])
+    points = [
+        {
+            "id": d["doc_id"],
+            "vector": vector.tolist(),
+            "payload": {"domain": d["domain"], "source_type": d["source_type"]},
+        }
+        for d, vector in zip(docs, vectors)
+        if vector.any()
+    ]
+    if points:
+        upsert_memory_vectors(tenant_id=tenant_id, points=points, collection=collection)
+    return len(points)
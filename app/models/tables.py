@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import JSON
@@ -68,6 +68,37 @@ class Document(Base):
     created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
 
 
+class Blob(Base):
+    # Content-addressed objects (app.memory.blob_store), stored once under blobs/sha256/ in the object store.
+    # refcount = documents whose object_key points at the blob; released_at starts the GC grace period.
+    __tablename__ = "blobs"
+    __table_args__ = (Index("ix_blobs_released_unreferenced", "released_at", postgresql_where=text("refcount <= 0")),)
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    content_type: Mapped[str] = mapped_column(String(200), nullable=False)
+    refcount: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
+    released_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class VectorIndexJob(Base):
+    # Durable write-behind queue for memory vectors (app.memory.vector_indexer): one row per document awaiting
+    # embedding + upsert. next_attempt_at doubles as the claim lease (claimed_by) and the retry backoff.
+    # status is QUEUED, or DEAD once VECTOR_INDEX_MAX_ATTEMPTS failed (kept for inspection; re-enqueue revives).
+    __tablename__ = "vector_index_queue"
+    __table_args__ = (Index("ix_vector_index_queue_due", "status", "next_attempt_at"),)
+    doc_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    domain: Mapped[str] = mapped_column(String(50), nullable=False)
+    source_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    status: Mapped[str] = mapped_column(String(10), nullable=False, default="QUEUED")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
+    claimed_by: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    enqueued_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class PendingAction(Base):
     __tablename__ = "pending_actions"
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
@@ -84,9 +115,24 @@ class PendingAction(Base):
     created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
     decided_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # Executor lease (see app.core.leases): set while a worker processes the action.
+    claimed_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=True)
+
 
 class OutboxMessage(Base):
     __tablename__ = "outbox_messages"
+    # Declared here as well as in migration 0003: idempotent inserts (app.outbox.service) rely on it for
+    # ON CONFLICT DO NOTHING, including on SQLite databases built with metadata.create_all.
+    __table_args__ = (
+        Index(
+            "ux_outbox_messages_tenant_idempotency",
+            "tenant_id",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=text("idempotency_key IS NOT NULL"),
+        ),
+    )
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     tenant_id: Mapped[str] = mapped_column(String(36), ForeignKey("tenants.id"), nullable=False)
     user_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
@@ -102,12 +148,24 @@ class OutboxMessage(Base):
 
     meta: Mapped[dict] = mapped_column("metadata", JSONType, nullable=False, default=dict)
 
-    status: Mapped[str] = mapped_column(String(20), nullable=False)  # QUEUED/SENDING/STUB_SENT/SENT/FAILED
+    status: Mapped[str] = mapped_column(String(20), nullable=False)  # QUEUED/SENDING/STUB_SENT/SENT/FAILED/DEAD
     created_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=False)
     sent_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # Retry scheduling: QUEUED rows are only claimed once next_attempt_at (if set) has passed.
+    attempt_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Dispatcher lease (see app.core.leases): rows with a live lease are skipped by other workers;
+    # SENDING rows whose lease expired are re-queued by the reaper.
+    claimed_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    lease_expires_at: Mapped["DateTime"] = mapped_column(DateTime(timezone=True), nullable=True)
+
 
 class AuditLog(Base):
+    # Postgres: range-partitioned by month on created_at, primary key (id, created_at); see migration 0007
+    # and app.audit.partitions. Rows are written through app.audit, not as ORM objects.
     __tablename__ = "audit_log"
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
     tenant_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("tenants.id"), nullable=True)
@@ -15,6 +15,7 @@ class SendResult:
     raw_response: dict | None = None
     retryable: bool = False
     reason: str | None = None
+    retry_after_s: float | None = None  # server hint (e.g. Retry-After), lower bound for the backoff
 
 
 class SenderAdapter(Protocol):
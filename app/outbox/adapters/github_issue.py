@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 
-import httpx
-
 from app.core.config import settings
+from app.integrations.http_clients import get_client
 from app.models.tables import OutboxMessage
 from app.outbox.adapters.base import SendResult
 from app.schemas.outbox_v1 import OutboxPayloadV1
@@ -16,6 +14,13 @@ def _truncate(s: str, n: int = 200) -> str:
     return s if len(s) <= n else s[:n] + "…"
 
 
+def _retry_after_s(value: str | None) -> float | None:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
 @dataclass(frozen=True)
 class GitHubIssueAdapter:
     kind: str = "github_issue"
@@ -45,7 +50,7 @@ class GitHubIssueAdapter:
         if payload.attachments:
             body_md += "\n\n---\n## Attachments\n" + "\n".join([f"- {a.filename} ({a.object_key})" for a in payload.attachments])
 
-        url = f"{settings.GITHUB_API_BASE.rstrip('/')}/repos/{repo}/issues"
+        url = f"/repos/{repo}/issues"
         headers = {
             "Authorization": f"Bearer {token}",
             "Accept": "application/vnd.github+json",
@@ -60,11 +65,12 @@ class GitHubIssueAdapter:
         }
 
         try:
-            resp = httpx.post(url, headers=headers, json=data, timeout=10.0)
+            resp = get_client(settings.GITHUB_API_BASE).post(url, headers=headers, json=data)
             if resp.status_code >= 400:
                 return SendResult(
                     status="FAILED",
-                    retryable=resp.status_code >= 500,
+                    retryable=resp.status_code >= 500 or resp.status_code == 429,
+                    retry_after_s=_retry_after_s(resp.headers.get("Retry-After")),
                     reason=f"github_http_{resp.status_code}:{_truncate(resp.text, 200)}",
                     raw_response={"status_code": resp.status_code, "text": _truncate(resp.text, 1000)},
                 )
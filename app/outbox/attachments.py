@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from app.memory.object_store import get_stream, put_stream
+from app.schemas.outbox_v1 import AttachmentRef
+from app.util.ids import new_uuid
+
+# Outbox attachments are uploaded with put_stream, so AttachmentRef.size_bytes / sha256 come from the upload
+# itself (no second read of the file), and are read back chunk by chunk with get_stream.
+
+
+def store_attachment(
+    *,
+    tenant_id: str,
+    stream: BinaryIO,
+    filename: str,
+    content_type: str = "application/octet-stream",
+    disposition: str = "attachment",
+    content_id: str | None = None,
+) -> AttachmentRef:
+    attachment_id = new_uuid()
+    safe_name = filename.replace("/", "_").replace("\\", "_") or "file"
+    stored = put_stream(
+        object_key=f"{tenant_id}/attachments/{attachment_id}/{safe_name}", stream=stream, content_type=content_type
+    )
+    return AttachmentRef(
+        id=attachment_id,
+        filename=filename,
+        content_type=content_type,
+        object_key=stored.object_key,
+        size_bytes=stored.size_bytes,
+        sha256=stored.sha256,
+        disposition=disposition,
+        content_id=content_id,
+    )
+
+
+def open_attachment(ref: AttachmentRef, *, chunk_size: int | None = None) -> Iterator[bytes]:
+    return get_stream(ref.object_key, chunk_size=chunk_size)
@@ -0,0 +1,668 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.audit import AuditEvent, audit, new_event, record
+from app.core.config import settings
+from app.core.leases import LeaseHeartbeat, claim_ids, release
+from app.core.outbox_policy import enforce_allowlist
+from app.integrations.telegram import TelegramSendError, send_message
+from app.memory.bootstrap import check_bootstrap_fresh
+from app.models.tables import Document, OutboxMessage
+from app.outbox.preview_store import build_preview, preview_mode
+from app.outbox.rate_limit import TokenBucketLimiter, get_limiter
+from app.outbox.retry import attempts_exhausted, backoff_delay_s
+from app.policy.allowlist import CompiledAllowlist, get_compiled_allowlist
+from app.schemas.outbox_v1 import OutboxPayloadV1
+from app.util.ids import new_uuid
+from app.util.time import now_utc
+
+log = logging.getLogger("outbox.dispatcher")
+
+# Built once per process; TypeAdapter construction is far more expensive than validation.
+payload_adapter = TypeAdapter(OutboxPayloadV1)
+
+KNOWN_KINDS = {"email", "telegram", "github_issue"}
+
+
+@dataclass
+class DispatchStats:
+    sent: int = 0
+    stub_sent: int = 0
+    failed: int = 0
+    deferred: int = 0
+    retrying: int = 0
+    dead: int = 0
+    # Queued-to-sent latency (created_at -> sent_at) of rows sent in this batch, in seconds.
+    latencies_s: list[float] = field(default_factory=list)
+
+    @property
+    def handled(self) -> int:
+        """Rows that left the claimable set in this batch (everything except approval-blocked rows)."""
+
+        return self.sent + self.stub_sent + self.failed + self.deferred + self.retrying + self.dead
+
+    def as_dict(self) -> dict:
+        out = {
+            "ok": True,
+            "sent": self.sent,
+            "stub_sent": self.stub_sent,
+            "failed": self.failed,
+            "deferred": self.deferred,
+            "retrying": self.retrying,
+            "dead": self.dead,
+        }
+        if self.latencies_s:
+            ordered = sorted(self.latencies_s)
+            out["queue_latency_p50_s"] = round(ordered[len(ordered) // 2], 3)
+            out["queue_latency_max_s"] = round(ordered[-1], 3)
+        return out
+
+
+@dataclass(frozen=True)
+class _TenantState:
+    ok: bool
+    context_version: str | None
+    reason: str
+    allowlist: CompiledAllowlist | None
+
+
+@dataclass
+class _Item:
+    """One claimed row and the outcome computed for it (applied to the row in the persist stage)."""
+
+    row: OutboxMessage
+    context_version: str | None
+    payload: OutboxPayloadV1 | None = None  # None => legacy stub row (unknown channel, no payload)
+
+    status: str | None = None
+    sent_at: datetime | None = None
+    next_attempt_at: datetime | None = None
+    last_error: str | None = None
+    meta: dict = field(default_factory=dict)
+    documents: list[Document] = field(default_factory=list)
+    audits: list[AuditEvent] = field(default_factory=list)
+    counter: str | None = None  # sent | stub_sent | failed | retrying | dead
+
+
+def claim_batch(db: Session, *, limit: int) -> list[OutboxMessage]:
+    """Lease up to `limit` due QUEUED rows to this worker (see app.core.leases) and load them.
+
+    The lease is part of the caller's transaction and becomes visible to other workers on commit.
+    """
+
+    ids = claim_ids(
+        db,
+        OutboxMessage,
+        status="QUEUED",
+        limit=limit,
+        where=(or_(OutboxMessage.next_attempt_at.is_(None), OutboxMessage.next_attempt_at <= now_utc()),),
+    )
+    if not ids:
+        return []
+    return db.query(OutboxMessage).filter(OutboxMessage.id.in_(ids)).order_by(OutboxMessage.created_at.asc()).all()
+
+
+def _load_tenant_state(db: Session, *, tenant_id: str) -> _TenantState:
+    ok, context_version, reason = check_bootstrap_fresh(db, tenant_id=tenant_id)
+    allowlist: CompiledAllowlist | None = None
+    if ok:
+        try:
+            allowlist = get_compiled_allowlist(db, tenant_id=tenant_id)
+        except Exception:
+            # Fail closed: enforce the payload's own allowlist only.
+            log.exception("Allowlist load failed for tenant %s", tenant_id)
+    return _TenantState(ok=ok, context_version=context_version, reason=reason, allowlist=allowlist)
+
+
+def _legacy_payload_dict(m: OutboxMessage) -> dict:
+    return {
+        "schema": "clowbot.outbox.v1",
+        "kind": m.channel,
+        "idempotency_key": m.idempotency_key or "",
+        "context": {"source": "legacy"},
+        # For legacy rows, allow the explicit target by default (preserve old stub behavior).
+        "policy": {
+            "risk": "YELLOW",
+            "requires_approval": False,
+            "allowlist": {
+                "email_domains": [],
+                "emails": [m.to] if m.channel == "email" else [],
+                "telegram_chats": [m.to] if m.channel == "telegram" else [],
+                "github_repos": [m.to] if m.channel == "github_issue" else [],
+            },
+        },
+        "message": {
+            "chat": {"chat_id": m.to, "username": None},
+            "parse_mode": "Markdown",
+            "text": m.body,
+            "disable_web_page_preview": True,
+            "reply_to_message_id": None,
+            "silent": False,
+        }
+        if m.channel == "telegram"
+        else {
+            "from": {"name": "ClowBot", "email": "noreply@local"},
+            "to": [{"email": m.to, "name": None}],
+            "cc": [],
+            "bcc": [],
+            "reply_to": [],
+            "subject": m.subject or "(no subject)",
+            "body": {"text": m.body},
+            "headers": {},
+        },
+        "attachments": [],
+    }
+
+
+def _fail(item: _Item, *, message: str) -> None:
+    """Permanent failure. As in _retry_or_dead, preview documents rendered for this attempt are kept, since
+    the row's preview meta points at them."""
+
+    m = item.row
+    item.status = "FAILED"
+    item.sent_at = None
+    item.last_error = message
+    item.counter = "failed"
+    item.audits.append(
+        new_event(
+            "OUTBOX_FAILED",
+            tenant_id=m.tenant_id,
+            user_id=m.user_id,
+            severity="ERROR",
+            message=message,
+            context={"outbox_id": m.id},
+        )
+    )
+
+
+def _retry_or_dead(item: _Item, *, channel: str, message: str, retry_after_s: float | None = None) -> None:
+    """Retryable failure: re-queue with backoff, or dead-letter once OUTBOX_MAX_ATTEMPTS is reached.
+
+    Preview documents rendered for this attempt are kept; the row's preview meta points at them.
+    """
+
+    m = item.row
+    attempt = int(m.attempt_count or 0)
+    item.sent_at = None
+    item.last_error = message
+    if attempts_exhausted(attempt):
+        item.status = "DEAD"
+        item.next_attempt_at = None
+        item.counter = "dead"
+        item.audits.append(
+            new_event(
+                "OUTBOX_DEAD_LETTER",
+                tenant_id=m.tenant_id,
+                user_id=m.user_id,
+                severity="ERROR",
+                message=message,
+                context={"outbox_id": m.id, "channel": channel, "attempt": attempt},
+            )
+        )
+        return
+
+    delay_s = backoff_delay_s(channel, attempt=attempt, retry_after_s=retry_after_s)
+    item.status = "QUEUED"
+    item.next_attempt_at = now_utc() + timedelta(seconds=delay_s)
+    item.counter = "retrying"
+    item.audits.append(
+        new_event(
+            "OUTBOX_RETRY_SCHEDULED",
+            tenant_id=m.tenant_id,
+            user_id=m.user_id,
+            severity="WARN",
+            message=message,
+            context={
+                "outbox_id": m.id,
+                "channel": channel,
+                "attempt": attempt,
+                "next_attempt_at": item.next_attempt_at.isoformat(),
+            },
+        )
+    )
+
+
+def _is_real_send(payload: OutboxPayloadV1) -> bool:
+    """Whether dispatching this payload would call an external API (and so count against rate limits)."""
+
+    if payload.kind == "github_issue":
+        return bool(settings.OUTBOX_REAL_SEND_ENABLED and settings.GITHUB_TOKEN)
+    if payload.kind == "telegram":
+        return bool(settings.TELEGRAM_BOT_TOKEN)
+    return False
+
+
+def _prepare(
+    db: Session,
+    items: list[OutboxMessage],
+    audits: list[AuditEvent],
+    stats: DispatchStats,
+    *,
+    limiter: TokenBucketLimiter | None,
+) -> list[_Item]:
+    """Stage 1: per-tenant gating, payload validation, allowlist enforcement and rate limiting.
+
+    Returns items that should be sent; they are marked SENDING and keep their lease. Rows failing
+    validation are marked FAILED here; blocked and rate-limited rows stay QUEUED. Every row that is
+    not sent has its lease released.
+    """
+
+    # (channel, tenant, target) lanes that ran out of budget in this batch -> seconds until a token
+    # is available. Later rows for the same target are deferred too, so per-target order is preserved.
+    exhausted: dict[tuple[str, str, str], float] = {}
+
+    by_tenant: dict[str, list[OutboxMessage]] = defaultdict(list)
+    for m in items:
+        by_tenant[m.tenant_id].append(m)
+
+    ready: list[_Item] = []
+    for tenant_id, rows in by_tenant.items():
+        state = _load_tenant_state(db, tenant_id=tenant_id)
+        # One dispatch-attempt event per tenant and batch (not per row); outcomes are audited per row.
+        users = {m.user_id for m in rows}
+        audits.append(
+            new_event(
+                "OUTBOX_DISPATCH_ATTEMPT",
+                tenant_id=tenant_id,
+                user_id=users.pop() if len(users) == 1 else None,
+                severity="INFO" if state.ok else "WARN",
+                message="dispatch_attempt",
+                context={
+                    "context_version": state.context_version,
+                    "ok": state.ok,
+                    "reason": state.reason,
+                    "outbox_ids": [m.id for m in rows],
+                },
+            )
+        )
+
+        for m in rows:
+            if not state.ok:
+                # Do not dispatch without fresh bootstrap.
+                continue
+
+            item = _Item(row=m, context_version=state.context_version, meta=dict(m.meta or {}))
+            try:
+                if not m.payload and m.channel not in KNOWN_KINDS:
+                    # Legacy rows: if channel is unknown, keep stub behavior.
+                    m.status = "SENDING"
+                    ready.append(item)
+                    continue
+
+                payload: OutboxPayloadV1 = payload_adapter.validate_python(m.payload or _legacy_payload_dict(m))
+
+                # Re-enforce allowlist at dispatch time (in case policy docs changed or legacy rows).
+                decision = enforce_allowlist(payload, tenant_allowlist=state.allowlist)
+                payload = decision.payload
+                if decision.upgraded_to_red:
+                    # Persist upgraded policy back to the outbox row.
+                    m.payload = payload.model_dump(by_alias=True)
+                    item.meta["policy_upgraded_to_red_at_dispatch"] = True
+                    m.meta = dict(item.meta)
+
+                # Approval gate: if requires approval, only dispatch after outbox meta has approved flag.
+                if payload.policy.requires_approval and not item.meta.get("approved"):
+                    # Keep queued; do not fail.
+                    audits.append(
+                        new_event(
+                            "OUTBOX_BLOCKED",
+                            tenant_id=m.tenant_id,
+                            user_id=m.user_id,
+                            severity="INFO",
+                            message="requires_approval",
+                            context={"outbox_id": m.id},
+                        )
+                    )
+                    continue
+
+                if limiter is not None and _is_real_send(payload):
+                    lane = (payload.kind, m.tenant_id, m.to)
+                    if lane not in exhausted:
+                        decision = limiter.acquire(channel=payload.kind, tenant_id=m.tenant_id, target=m.to)
+                        if not decision.allowed:
+                            exhausted[lane] = decision.retry_after_s
+                    if lane in exhausted:
+                        # Over budget: keep queued (not claimable until a token is due) instead of risking a 429.
+                        retry_after_s = exhausted[lane]
+                        m.next_attempt_at = now_utc() + timedelta(seconds=retry_after_s)
+                        audits.append(
+                            new_event(
+                                "OUTBOX_DEFERRED",
+                                tenant_id=m.tenant_id,
+                                user_id=m.user_id,
+                                severity="INFO",
+                                message="rate_limited",
+                                context={"outbox_id": m.id, "channel": payload.kind, "to": m.to, "retry_after_s": retry_after_s},
+                            )
+                        )
+                        stats.deferred += 1
+                        continue
+
+                item.payload = payload
+                m.status = "SENDING"
+                m.attempt_count = int(m.attempt_count or 0) + 1
+                ready.append(item)
+            except Exception as e:
+                log.warning("Outbox %s failed validation: %s", m.id, str(e))
+                _fail(item, message=str(e))
+                m.status = "FAILED"
+                audits.extend(item.audits)
+                stats.failed += 1
+
+    sending = {item.row.id for item in ready}
+    for m in items:
+        if m.id not in sending:
+            release(m)
+    return ready
+
+
+def _send_legacy_stub(item: _Item) -> None:
+    m = item.row
+    preview_doc = Document(
+        id=new_uuid(),
+        tenant_id=m.tenant_id,
+        workflow_id=None,
+        domain="outbox",
+        doc_type="outbox_preview",
+        title=f"Outbox preview: {m.channel} -> {m.to}",
+        content_text=f"# Outbox Preview — {m.channel}\n\n{m.body}\n",
+        object_key=None,
+        meta={"outbox_id": m.id},
+        created_at=now_utc(),
+    )
+    item.documents.append(preview_doc)
+    item.meta["preview"] = {"document_id": preview_doc.id, "object_keys": {}}
+    item.status = "STUB_SENT"
+    item.sent_at = now_utc()
+    item.counter = "stub_sent"
+
+
+def _send(item: _Item) -> None:
+    """Stage 2: render the preview pack (eager mode) and perform the (real, dry-run or stub) send for one row."""
+
+    m = item.row
+    payload = item.payload
+    if payload is None:
+        _send_legacy_stub(item)
+        return
+
+    preview_document_id: str | None = None
+    # Rows without a stored v1 payload (legacy) always render now: only payload rows can render later.
+    mode = preview_mode() if m.payload else "eager"
+    if mode == "eager":
+        preview_doc, item.meta["preview"] = build_preview(row=m, payload=payload, status="SENDING")
+        item.documents.append(preview_doc)
+        preview_document_id = preview_doc.id
+    elif not (item.meta.get("preview") or {}).get("document_id"):
+        # Rendered on first view, or by render_outbox_previews once this batch is committed (async).
+        item.meta["preview"] = {"mode": mode}
+
+    # Sender adapters (real sends) - start with GitHub Issue.
+    if payload.kind == "github_issue":
+        from app.outbox.adapters.registry import get_adapter
+
+        res = get_adapter(payload.kind).send(payload=payload, outbox_row=m)
+
+        if res.status == "SENT":
+            ext = dict(item.meta.get("external") or {})
+            if res.external_id:
+                ext["id"] = res.external_id
+            if res.external_url:
+                ext["url"] = res.external_url
+            if res.raw_response:
+                ext["raw"] = res.raw_response
+            item.meta["external"] = ext
+            item.status = "SENT"
+            item.sent_at = now_utc()
+            item.counter = "sent"
+            item.audits.append(
+                new_event(
+                    "OUTBOX_SEND_SUCCESS",
+                    tenant_id=m.tenant_id,
+                    user_id=m.user_id,
+                    severity="INFO",
+                    message="send_success",
+                    context={"context_version": item.context_version, "outbox_id": m.id, "kind": payload.kind, "external_id": res.external_id, "url": res.external_url},
+                )
+            )
+        elif res.status == "DRY_RUN_SENT":
+            item.status = "DRY_RUN_SENT"
+            item.sent_at = now_utc()
+            item.counter = "stub_sent"
+            item.audits.append(
+                new_event(
+                    "OUTBOX_DRY_RUN",
+                    tenant_id=m.tenant_id,
+                    user_id=m.user_id,
+                    severity="INFO",
+                    message="dry_run",
+                    context={"context_version": item.context_version, "outbox_id": m.id, "kind": payload.kind, "reason": res.reason},
+                )
+            )
+        else:
+            item.audits.append(
+                new_event(
+                    "OUTBOX_SEND_FAILED",
+                    tenant_id=m.tenant_id,
+                    user_id=m.user_id,
+                    severity="ERROR",
+                    message=res.reason or "send_failed",
+                    context={"context_version": item.context_version, "outbox_id": m.id, "kind": payload.kind, "retryable": res.retryable},
+                )
+            )
+            if res.retryable:
+                _retry_or_dead(item, channel=payload.kind, message=res.reason or "send_failed", retry_after_s=res.retry_after_s)
+            else:
+                item.status = "FAILED"
+                item.last_error = res.reason or "send_failed"
+                item.counter = "failed"
+
+    # Telegram send (real) optional.
+    elif payload.kind == "telegram" and settings.TELEGRAM_BOT_TOKEN:
+        chat_id = payload.message.chat.chat_id or payload.message.chat.username
+        allow = {x.strip() for x in (settings.TELEGRAM_ALLOWLIST_CHATS or "").split(",") if x.strip()}
+        if not chat_id or chat_id not in allow:
+            raise TelegramSendError(f"Telegram chat not allowlisted: {chat_id}")
+
+        resp = send_message(
+            token=settings.TELEGRAM_BOT_TOKEN,
+            chat_id=chat_id,
+            text=payload.message.text,
+            parse_mode=None if payload.message.parse_mode == "Plain" else payload.message.parse_mode,
+            disable_preview=payload.message.disable_web_page_preview,
+        )
+
+        item.meta["telegram_result"] = {"message_id": resp.get("result", {}).get("message_id")}
+        item.status = "SENT"
+        item.sent_at = now_utc()
+        item.counter = "sent"
+        item.audits.append(
+            new_event(
+                "OUTBOX_SENT",
+                tenant_id=m.tenant_id,
+                user_id=m.user_id,
+                severity="INFO",
+                message="telegram_sent",
+                context={"context_version": item.context_version, "outbox_id": m.id, "preview_document_id": preview_document_id},
+            )
+        )
+    else:
+        item.status = "STUB_SENT"
+        item.sent_at = now_utc()
+        item.counter = "stub_sent"
+        item.audits.append(
+            new_event(
+                "OUTBOX_STUB_SENT",
+                tenant_id=m.tenant_id,
+                user_id=m.user_id,
+                severity="INFO",
+                message="stub_sent",
+                context={"context_version": item.context_version, "outbox_id": m.id, "preview_document_id": preview_document_id},
+            )
+        )
+
+
+def _send_one(item: _Item) -> None:
+    try:
+        _send(item)
+    except TelegramSendError as e:
+        log.warning("Outbox %s telegram send failed (retryable=%s): %s", item.row.id, e.retryable, str(e))
+        if e.retryable:
+            _retry_or_dead(item, channel="telegram", message=str(e), retry_after_s=e.retry_after_s)
+        else:
+            _fail(item, message=str(e))
+    except Exception as e:
+        log.warning("Outbox %s send failed: %s", item.row.id, str(e))
+        _fail(item, message=str(e))
+
+
+def _send_all(ready: list[_Item]) -> None:
+    """Stage 2 driver: run sends concurrently, outside of any DB work.
+
+    Items are split into lanes per (channel, target); a lane is sent in order, one request at a
+    time, so a chat or repo never sees reordered or parallel messages. Lanes run on a thread pool
+    of OUTBOX_SEND_WORKERS, with at most OUTBOX_SEND_PER_CHANNEL in-flight sends per channel.
+    """
+
+    lanes: dict[tuple[str, str], list[_Item]] = defaultdict(list)
+    for item in ready:
+        channel = item.payload.kind if item.payload is not None else item.row.channel
+        lanes[(channel, item.row.to)].append(item)
+
+    workers = min(int(settings.OUTBOX_SEND_WORKERS), len(lanes))
+    if workers <= 1:
+        for item in ready:
+            _send_one(item)
+        return
+
+    per_channel = max(1, int(settings.OUTBOX_SEND_PER_CHANNEL))
+    slots = {channel: threading.BoundedSemaphore(per_channel) for channel, _ in lanes}
+
+    def run_lane(key: tuple[str, str]) -> None:
+        for item in lanes[key]:
+            with slots[key[0]]:
+                _send_one(item)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outbox-send") as pool:
+        list(pool.map(run_lane, list(lanes)))
+
+
+def _apply(db: Session, item: _Item) -> None:
+    m = item.row
+    m.status = item.status
+    if item.sent_at is not None:
+        m.sent_at = item.sent_at
+    m.next_attempt_at = item.next_attempt_at
+    if item.last_error is not None:
+        m.last_error = item.last_error
+    m.meta = dict(item.meta)
+    release(m)
+    db.add_all(item.documents)
+    record(db, item.audits)
+
+
+def _persist(db: Session, ready: list[_Item]) -> None:
+    """Stage 3: write every outcome in one transaction; fall back to per-row commits on error."""
+
+    try:
+        for item in ready:
+            _apply(db, item)
+        db.commit()
+        return
+    except Exception:
+        db.rollback()
+        log.exception("Bulk persist of %s outbox rows failed; retrying row by row", len(ready))
+
+    for item in ready:
+        try:
+            _apply(db, item)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            try:
+                m2 = db.query(OutboxMessage).filter(OutboxMessage.id == item.row.id).one_or_none()
+                if m2:
+                    m2.status = "FAILED"
+                    release(m2)
+                    audit(db, "OUTBOX_FAILED", tenant_id=m2.tenant_id, user_id=m2.user_id, message=str(e), context={"outbox_id": m2.id})
+                    db.commit()
+            except Exception:
+                db.rollback()
+            item.counter = "failed"
+
+
+def _queue_previews(outbox_ids: list[str]) -> None:
+    """Async preview mode: render the batch's previews on the dispatch queue. Best-effort; rows the task
+    never reaches are rendered on first view instead."""
+
+    if not outbox_ids:
+        return
+    try:
+        from app.tasks.jarvis_tasks import render_outbox_previews
+
+        render_outbox_previews.delay(outbox_ids=outbox_ids)
+    except Exception as e:
+        log.warning("Queueing %s outbox previews failed (rendered on first view instead): %s", len(outbox_ids), str(e))
+
+
+def dispatch_batch(db: Session, *, limit: int = 25) -> DispatchStats:
+    """Claim up to `limit` QUEUED rows and dispatch them as one batch.
+
+    The batch costs two commits regardless of its size: one after claiming/gating (leases, SENDING marks,
+    dispatch-attempt audits, policy upgrades) and one after sending (final statuses, preview
+    documents, result audits). Network I/O happens between the two, concurrently (see _send_all).
+    A failure in one row never affects the others.
+    """
+
+    stats = DispatchStats()
+    items = claim_batch(db, limit=limit)
+    if not items:
+        return stats
+
+    audits: list[AuditEvent] = []
+    ready = _prepare(db, items, audits, stats, limiter=get_limiter())
+    record(db, audits)
+    db.commit()
+
+    if ready:
+        # Commit expired the rows; reload them in one query so the send stage never touches the session.
+        db.query(OutboxMessage).filter(OutboxMessage.id.in_([item.row.id for item in ready])).all()
+
+    # Keep the SENDING rows' leases alive while network I/O runs, so the reaper only recovers rows
+    # of workers that actually died.
+    with LeaseHeartbeat(db, OutboxMessage, [item.row.id for item in ready]):
+        _send_all(ready)
+
+    # Read before persisting: the commit expires the rows.
+    for item in ready:
+        if item.counter in ("sent", "stub_sent") and item.sent_at is not None:
+            created_at = item.row.created_at
+            if created_at.tzinfo is None:
+                # SQLite returns naive datetimes; they are stored as UTC.
+                created_at = created_at.replace(tzinfo=item.sent_at.tzinfo)
+            stats.latencies_s.append((item.sent_at - created_at).total_seconds())
+    _persist(db, ready)
+    _queue_previews([item.row.id for item in ready if (item.meta.get("preview") or {}).get("mode") == "async"])
+
+    for item in ready:
+        if item.counter == "sent":
+            stats.sent += 1
+        elif item.counter == "stub_sent":
+            stats.stub_sent += 1
+        elif item.counter == "failed":
+            stats.failed += 1
+        elif item.counter == "retrying":
+            stats.retrying += 1
+        elif item.counter == "dead":
+            stats.dead += 1
+    return stats
@@ -82,8 +82,26 @@ def _github_issue_preview_json(payload: OutboxPayloadV1) -> str:
     return json.dumps(obj, ensure_ascii=False, indent=2)
 
 
-def render_preview_pack(*, outbox_id: str, payload: OutboxPayloadV1, status: str) -> PreviewPack:
-    payload_json = json.dumps(payload.model_dump(by_alias=True), ensure_ascii=False, indent=2)
+def render_payload_json(payload: OutboxPayloadV1) -> str:
+    return json.dumps(payload.model_dump(mode="json", by_alias=True), ensure_ascii=False, indent=2)
+
+
+def channel_raw_name(payload: OutboxPayloadV1) -> str:
+    return "preview.eml" if payload.kind == "email" else "preview.json"
+
+
+def render_channel_raw(payload: OutboxPayloadV1) -> str:
+    """The channel-native artifact (.eml / API request JSON). Depends only on the payload."""
+
+    if payload.kind == "email":
+        return _email_eml(payload)
+    if payload.kind == "telegram":
+        return _telegram_preview_json(payload)
+    return _github_issue_preview_json(payload)
+
+
+def render_preview_md(*, outbox_id: str, payload: OutboxPayloadV1, status: str) -> str:
+    """Markdown preview with per-row front-matter (outbox id, status, render time)."""
 
     targets_summary: dict = {}
     if payload.kind == "email":
@@ -128,19 +146,13 @@ def render_preview_pack(*, outbox_id: str, payload: OutboxPayloadV1, status: str
     if payload.attachments:
         preview_md += "## Attachments\n" + "\n".join([f"- {a.filename} ({a.content_type}) — {a.object_key}" for a in payload.attachments]) + "\n"
 
-    if payload.kind == "email":
-        raw = _email_eml(payload)
-        raw_name = "preview.eml"
-    elif payload.kind == "telegram":
-        raw = _telegram_preview_json(payload)
-        raw_name = "preview.json"
-    else:
-        raw = _github_issue_preview_json(payload)
-        raw_name = "preview.json"
+    return preview_md
+
 
+def render_preview_pack(*, outbox_id: str, payload: OutboxPayloadV1, status: str) -> PreviewPack:
     return PreviewPack(
-        preview_md=preview_md,
-        preview_payload_json=payload_json,
-        channel_raw_name=raw_name,
-        channel_raw=raw,
+        preview_md=render_preview_md(outbox_id=outbox_id, payload=payload, status=status),
+        preview_payload_json=render_payload_json(payload),
+        channel_raw_name=channel_raw_name(payload),
+        channel_raw=render_channel_raw(payload),
     )
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.memory.object_store import PutObject, put_many
+from app.models.tables import Document, OutboxMessage
+from app.outbox.preview import channel_raw_name, render_channel_raw, render_payload_json, render_preview_md
+from app.schemas.outbox_v1 import OutboxPayloadV1
+from app.util.ids import new_uuid
+from app.util.time import now_utc
+
+log = logging.getLogger("outbox.preview_store")
+
+# Preview packs are a stage of their own (OUTBOX_PREVIEW_MODE): rendered by the dispatcher before sending
+# (eager), on first view (lazy), or by a dispatch-queue task after the batch commits (async).
+# The channel artifacts (.eml / request JSON, payload JSON) depend only on the payload, so they are stored
+# once per payload hash under <tenant>/outbox/previews/<sha256>/: retries and re-dispatches of the same
+# payload reuse them without rendering or uploading again. The markdown preview carries the row's id and
+# status and stays per row, in its outbox_preview Document.
+
+PREVIEW_MODES = ("eager", "lazy", "async")
+# Statuses the dispatcher never moves a row out of; only these rows' deferred previews are stored.
+FINAL_STATUSES = frozenset({"SENT", "DRY_RUN_SENT", "STUB_SENT", "FAILED", "DEAD"})
+# Content addresses this process has already uploaded (LRU, bounded).
+_UPLOADED_MAX = 4096
+
+payload_adapter = TypeAdapter(OutboxPayloadV1)
+
+_lock = threading.Lock()
+_uploaded: OrderedDict[str, None] = OrderedDict()
+
+
+def preview_mode() -> str:
+    mode = (settings.OUTBOX_PREVIEW_MODE or "").strip().lower()
+    return mode if mode in PREVIEW_MODES else "eager"
+
+
+def payload_sha256(payload: OutboxPayloadV1) -> str:
+    data = json.dumps(payload.model_dump(mode="json", by_alias=True), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def artifact_keys(*, tenant_id: str, payload: OutboxPayloadV1, content_sha256: str) -> dict[str, str]:
+    base = f"{tenant_id}/outbox/previews/{content_sha256}"
+    raw_name = channel_raw_name(payload)
+    return {"preview_payload_json": f"{base}/preview_payload.json", raw_name: f"{base}/{raw_name}"}
+
+
+def _already_uploaded(address: str) -> bool:
+    with _lock:
+        if address not in _uploaded:
+            return False
+        _uploaded.move_to_end(address)
+        return True
+
+
+def _remember_uploaded(address: str) -> None:
+    with _lock:
+        _uploaded[address] = None
+        _uploaded.move_to_end(address)
+        while len(_uploaded) > _UPLOADED_MAX:
+            _uploaded.popitem(last=False)
+
+
+def reset_upload_cache() -> None:
+    """Forget which artifacts were uploaded (tests)."""
+
+    with _lock:
+        _uploaded.clear()
+
+
+def store_artifacts(*, tenant_id: str, payload: OutboxPayloadV1, content_sha256: str) -> dict[str, str]:
+    """Upload the payload's channel artifacts under their content address; returns their object keys.
+
+    Skipped when this process already uploaded the address. Best-effort: a failed upload is logged and the
+    keys are still returned; the next row with the same payload tries again.
+    """
+
+    keys = artifact_keys(tenant_id=tenant_id, payload=payload, content_sha256=content_sha256)
+    address = f"{tenant_id}/{content_sha256}"
+    if _already_uploaded(address):
+        return keys
+
+    raw_name = channel_raw_name(payload)
+    try:
+        put_many(
+            [
+                PutObject(object_key=keys[raw_name], data=render_channel_raw(payload).encode("utf-8"), content_type="text/plain"),
+                PutObject(
+                    object_key=keys["preview_payload_json"],
+                    data=render_payload_json(payload).encode("utf-8"),
+                    content_type="application/json",
+                ),
+            ],
+            best_effort=False,
+        )
+    except Exception as e:
+        log.warning("Preview artifacts %s upload failed: %s", address, str(e))
+        return keys
+    _remember_uploaded(address)
+    return keys
+
+
+def build_preview(*, row: OutboxMessage, payload: OutboxPayloadV1, status: str) -> tuple[Document, dict]:
+    """Render one row's preview pack: its Document (not added to any session) and the row's meta["preview"]."""
+
+    content_sha256 = payload_sha256(payload)
+    object_keys = store_artifacts(tenant_id=row.tenant_id, payload=payload, content_sha256=content_sha256)
+    doc = Document(
+        id=new_uuid(),
+        tenant_id=row.tenant_id,
+        workflow_id=None,
+        domain="outbox",
+        doc_type="outbox_preview",
+        title=f"Outbox preview: {payload.kind} -> {row.to}",
+        content_text=render_preview_md(outbox_id=row.id, payload=payload, status=status),
+        object_key=None,
+        meta={"outbox_id": row.id, "content_sha256": content_sha256},
+        created_at=now_utc(),
+    )
+    return doc, {"document_id": doc.id, "object_keys": object_keys, "content_sha256": content_sha256}
+
+
+def _cached(db: Session, row: OutboxMessage) -> tuple[Document, dict] | None:
+    preview = dict((row.meta or {}).get("preview") or {})
+    doc = db.get(Document, preview["document_id"]) if preview.get("document_id") else None
+    return (doc, preview) if doc is not None else None
+
+
+def ensure_preview(db: Session, row: OutboxMessage) -> tuple[Document, dict] | None:
+    """The row's preview Document and meta["preview"], rendering it first if it was deferred (lazy/async modes).
+
+    The markdown carries the row's status, so only rows in a FINAL_STATUSES status get their preview stored;
+    for any other status a fresh, uncommitted Document is returned on every call. Rendering (and the artifact
+    upload) runs before the row is locked; the row is then re-read under FOR UPDATE and only the "preview"
+    key is merged into its current meta, so concurrent writers (the dispatcher's outcome, another viewer)
+    are never overwritten. None for rows without a v1 payload that were never dispatched (legacy rows get
+    their stub preview from the dispatcher).
+    """
+
+    cached = _cached(db, row)
+    if cached is not None:
+        return cached
+    if not row.payload:
+        return None
+
+    status = row.status
+    payload: OutboxPayloadV1 = payload_adapter.validate_python(row.payload)
+    doc, preview = build_preview(row=row, payload=payload, status=status)
+    if status not in FINAL_STATUSES:
+        return doc, preview
+
+    locked = db.execute(
+        select(OutboxMessage)
+        .where(OutboxMessage.id == row.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if locked is None or locked.status != status:
+        db.rollback()
+        return doc, preview
+    cached = _cached(db, locked)
+    if cached is not None:  # another viewer stored one first
+        db.rollback()
+        return cached
+
+    db.add(doc)
+    locked.meta = {**(locked.meta or {}), "preview": preview}
+    db.commit()
+    return doc, preview
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+
+from redis import Redis
+
+from app.core.config import settings
+
+log = logging.getLogger("outbox.rate_limit")
+
+# Atomic token bucket. Uses the Redis server clock so every dispatcher worker shares one timeline.
+# KEYS[1] = bucket key; ARGV = rate (tokens/s), burst (capacity), requested tokens.
+# Returns {allowed (0/1), retry_after_seconds (string; Lua numbers are truncated to integers)}.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = burst
+  ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= requested then
+  tokens = tokens - requested
+  allowed = 1
+else
+  retry_after = (requested - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float  # tokens per second
+    burst: int
+
+
+@dataclass(frozen=True)
+class RateDecision:
+    allowed: bool
+    retry_after_s: float = 0.0
+
+
+def parse_rate_limits(spec: str) -> dict[str, RateLimit]:
+    """Parse OUTBOX_RATE_LIMITS: comma-separated `channel=rate:burst` (rate in sends/second)."""
+
+    out: dict[str, RateLimit] = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            channel, value = part.split("=", 1)
+            rate_s, _, burst_s = value.partition(":")
+            rate = float(rate_s)
+            burst = int(burst_s) if burst_s else max(1, int(rate))
+        except ValueError:
+            log.warning("Ignoring malformed OUTBOX_RATE_LIMITS entry: %s", part)
+            continue
+        if rate > 0 and burst > 0:
+            out[channel.strip()] = RateLimit(rate=rate, burst=burst)
+    return out
+
+
+class TokenBucketLimiter:
+    """Distributed token bucket per (channel, tenant, target), shared by all workers through Redis.
+
+    Channels without a configured limit are always allowed. Redis errors fail open (logged), so an
+    unavailable Redis never blocks dispatch.
+    """
+
+    def __init__(self, redis: Redis, *, limits: dict[str, RateLimit], prefix: str = "clowbot:ratelimit"):
+        self._redis = redis
+        self._limits = limits
+        self._prefix = prefix
+        self._script = redis.register_script(_TOKEN_BUCKET_LUA)
+
+    def key(self, *, channel: str, tenant_id: str, target: str) -> str:
+        return f"{self._prefix}:{channel}:{tenant_id}:{target}"
+
+    def acquire(self, *, channel: str, tenant_id: str, target: str, tokens: int = 1) -> RateDecision:
+        limit = self._limits.get(channel)
+        if limit is None:
+            return RateDecision(allowed=True)
+        try:
+            allowed, retry_after = self._script(
+                keys=[self.key(channel=channel, tenant_id=tenant_id, target=target)],
+                args=[limit.rate, limit.burst, tokens],
+            )
+        except Exception as e:
+            log.warning("Rate limiter unavailable (failing open): %s", str(e))
+            return RateDecision(allowed=True)
+        return RateDecision(allowed=bool(int(allowed)), retry_after_s=float(retry_after))
+
+
+_lock = threading.Lock()
+_limiter: TokenBucketLimiter | None = None
+
+
+def get_limiter() -> TokenBucketLimiter | None:
+    """Process-wide limiter, or None when OUTBOX_RATE_LIMIT_ENABLED is off."""
+
+    global _limiter
+    if not settings.OUTBOX_RATE_LIMIT_ENABLED:
+        return None
+    with _lock:
+        if _limiter is None:
+            r = Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+            _limiter = TokenBucketLimiter(r, limits=parse_rate_limits(settings.OUTBOX_RATE_LIMITS))
+        return _limiter
+
+
+def set_limiter(limiter: TokenBucketLimiter | None) -> None:
+    """Replace the process-wide limiter (tests, or custom Redis wiring)."""
+
+    global _limiter
+    with _lock:
+        _limiter = limiter
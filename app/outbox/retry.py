@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import logging
+import random
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+log = logging.getLogger("outbox.retry")
+
+
+@dataclass(frozen=True)
+class BackoffPolicy:
+    base_s: float
+    max_s: float
+
+
+DEFAULT_BACKOFF = BackoffPolicy(base_s=30.0, max_s=3600.0)
+
+
+def parse_backoff_policies(spec: str) -> dict[str, BackoffPolicy]:
+    """Parse OUTBOX_RETRY_BACKOFF: comma-separated `channel=base_seconds:max_seconds`."""
+
+    out: dict[str, BackoffPolicy] = {}
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            channel, value = part.split("=", 1)
+            base_s, _, max_s = value.partition(":")
+            policy = BackoffPolicy(base_s=float(base_s), max_s=float(max_s) if max_s else DEFAULT_BACKOFF.max_s)
+        except ValueError:
+            log.warning("Ignoring malformed OUTBOX_RETRY_BACKOFF entry: %s", part)
+            continue
+        out[channel.strip()] = policy
+    return out
+
+
+def backoff_delay_s(channel: str, *, attempt: int, retry_after_s: float | None = None, rng: random.Random | None = None) -> float:
+    """Delay before the next attempt after `attempt` failed attempts (1-based).
+
+    Exponential (base * 2^(attempt-1), capped at max) with equal jitter: half of the delay is
+    fixed, the other half random, so retries from one burst spread out without collapsing to ~0.
+    A server-provided retry-after hint is treated as a lower bound.
+    """
+
+    policy = parse_backoff_policies(settings.OUTBOX_RETRY_BACKOFF).get(channel, DEFAULT_BACKOFF)
+    exp = min(policy.max_s, policy.base_s * (2 ** max(0, attempt - 1)))
+    delay = exp / 2 + (rng or random).uniform(0, exp / 2)
+    if retry_after_s:
+        delay = max(delay, float(retry_after_s))
+    return delay
+
+
+def attempts_exhausted(attempt: int) -> bool:
+    return attempt >= int(settings.OUTBOX_MAX_ATTEMPTS)
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, replace
+from datetime import timedelta
 
-from pydantic import TypeAdapter
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from app.core.outbox_policy import enforce_allowlist
-from app.policy.allowlist import load_policy_allowlist
+from app.core.outbox_policy import PolicyDecision, enforce_allowlist
+from app.policy.allowlist import get_compiled_allowlist
 from app.models.tables import OutboxMessage
+from app.outbox.wakeup import request_wake
 from app.schemas.outbox_v1 import OutboxPayloadV1, compute_idempotency_key
 from app.util.ids import new_uuid
 from app.util.time import now_utc
@@ -15,49 +21,178 @@ from app.util.time import now_utc
 adapter = TypeAdapter(OutboxPayloadV1)
 
 
+@dataclass(frozen=True)
+class OutboxCreateResult:
+    """Outcome of one item of create_outbox_messages_bulk (error set means nothing was stored)."""
+
+    id: str | None
+    idempotency_key: str | None
+    created: bool = False  # False: an existing row (or an earlier item in the batch) had this key
+    risk: str | None = None
+    requires_approval: bool = False
+    upgraded_to_red: bool = False
+    error: str | None = None
+
+
 def create_outbox_message(*, db: Session, tenant_id: str, user_id: str | None, payload_dict: dict) -> str:
-    """Validate + enforce policy + idempotency insert."""
+    """Validate + enforce policy + idempotent insert; returns the new or existing row id."""
 
+    payload: OutboxPayloadV1 = adapter.validate_python(payload_dict)
     # Fill idempotency_key if missing.
-    if not payload_dict.get("idempotency_key"):
-        payload_dict = dict(payload_dict)
-        payload_dict["idempotency_key"] = compute_idempotency_key(payload_dict)
+    if not payload.idempotency_key:
+        payload.idempotency_key = compute_idempotency_key(payload)
+
+    decision = enforce_allowlist(payload, tenant_allowlist=get_compiled_allowlist(db, tenant_id=tenant_id))
+    return _store(db, tenant_id=tenant_id, user_id=user_id, decisions=[decision])[payload.idempotency_key].id
+
+
+def create_outbox_messages_bulk(
+    *, db: Session, tenant_id: str, user_id: str | None, payload_dicts: list[dict]
+) -> list[OutboxCreateResult]:
+    """Validate + enforce policy + idempotent insert for many payloads, in one transaction.
+
+    One result per payload, in input order, carrying the row id and policy outcome (so callers need not
+    re-read rows). Invalid payloads get an error result and never block valid ones. New rows go in as one
+    multi-row upsert; keys that already existed are resolved with one IN query.
+    """
+
+    results: list[OutboxCreateResult | None] = [None] * len(payload_dicts)
+    decisions: list[tuple[int, PolicyDecision]] = []
+    tenant_allowlist = get_compiled_allowlist(db, tenant_id=tenant_id)
+    for i, payload_dict in enumerate(payload_dicts):
+        if not isinstance(payload_dict, dict):
+            results[i] = OutboxCreateResult(id=None, idempotency_key=None, error="payload must be an object")
+            continue
+        try:
+            payload = adapter.validate_python(payload_dict)
+        except ValidationError as e:
+            results[i] = OutboxCreateResult(id=None, idempotency_key=payload_dict.get("idempotency_key") or None, error=_error_text(e))
+            continue
+        if not payload.idempotency_key:
+            payload.idempotency_key = compute_idempotency_key(payload)
+        decisions.append((i, enforce_allowlist(payload, tenant_allowlist=tenant_allowlist)))
+
+    # First item per key is the one stored; later duplicates resolve to it.
+    first: dict[str, PolicyDecision] = {}
+    for _, decision in decisions:
+        first.setdefault(decision.payload.idempotency_key, decision)
+    stored = _store(db, tenant_id=tenant_id, user_id=user_id, decisions=list(first.values()))
+
+    for i, decision in decisions:
+        key = decision.payload.idempotency_key
+        res = stored.get(key) or OutboxCreateResult(id=None, idempotency_key=key, error="conflict")
+        results[i] = res if first[key] is decision else replace(res, created=False)
+    return results  # type: ignore[return-value]
+
+
+def _store(
+    db: Session, *, tenant_id: str, user_id: str | None, decisions: list[PolicyDecision]
+) -> dict[str, OutboxCreateResult]:
+    """Insert-or-get by (tenant_id, idempotency_key) and commit; one result per key.
+
+    INSERT ... ON CONFLICT DO NOTHING RETURNING id, then one lookup for the keys that were not inserted.
+    Concurrent writers of the same key never raise: the loser waits for the winner's commit and gets its row.
+    Keys must be unique within `decisions`.
+    """
+
+    created_at = now_utc()
+    # Distinct, increasing created_at keeps the dispatcher's per-target send order equal to input order.
+    rows = [
+        _row_values(tenant_id=tenant_id, user_id=user_id, decision=d, created_at=created_at + timedelta(microseconds=n))
+        for n, d in enumerate(decisions)
+    ]
+    # Pending ORM objects first (e.g. the tenant row), so the Core INSERT sees them.
+    db.flush()
+    inserted = _insert_ignoring_conflicts(db, rows)
+    out = {r["idempotency_key"]: _created_result(r, d) for r, d in zip(rows, decisions) if r["id"] in inserted}
+    out.update(_existing_by_key(db, tenant_id=tenant_id, keys=[r["idempotency_key"] for r in rows if r["id"] not in inserted]))
+    if inserted:
+        request_wake(db)
+    db.commit()
+    return out
 
-    payload: OutboxPayloadV1 = adapter.validate_python(payload_dict)
 
-    allow_doc = load_policy_allowlist(db, tenant_id=tenant_id)
-    decision = enforce_allowlist(payload, tenant_allowlist=allow_doc.allowlist)
-    payload = decision.payload
+def _error_text(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(x) for x in err['loc'])}: {err['msg']}" for err in e.errors()[:5])
 
-    existing = (
-        db.query(OutboxMessage)
-        .filter(OutboxMessage.tenant_id == tenant_id, OutboxMessage.idempotency_key == payload.idempotency_key)
-        .one_or_none()
-    )
-    if existing:
-        return existing.id
-
-    # store compact + normalized
-    payload_json = payload.model_dump(by_alias=True)
-
-    msg = OutboxMessage(
-        id=new_uuid(),
-        tenant_id=tenant_id,
-        user_id=user_id,
-        channel=payload.kind,
-        to=_to_field(payload),
-        subject=_subject_field(payload),
-        body=_body_field(payload),
-        payload=payload_json,
-        idempotency_key=payload.idempotency_key,
-        meta={"policy_upgraded_to_red": decision.upgraded_to_red},
-        status="QUEUED",
-        created_at=now_utc(),
-        sent_at=None,
+
+def _row_values(*, tenant_id: str, user_id: str | None, decision: PolicyDecision, created_at) -> dict:
+    # Keys are column names (outbox_messages.metadata, not the ORM attribute `meta`).
+    payload = decision.payload
+    return {
+        "id": new_uuid(),
+        "tenant_id": tenant_id,
+        "user_id": user_id,
+        "channel": payload.kind,
+        "to": _to_field(payload),
+        "subject": _subject_field(payload),
+        "body": _body_field(payload),
+        "payload": payload.model_dump(by_alias=True),
+        "idempotency_key": payload.idempotency_key,
+        "metadata": {"policy_upgraded_to_red": decision.upgraded_to_red},
+        "status": "QUEUED",
+        "created_at": created_at,
+        "sent_at": None,
+        "attempt_count": 0,
+    }
+
+
+def _created_result(row: dict, decision: PolicyDecision) -> OutboxCreateResult:
+    policy = decision.payload.policy
+    return OutboxCreateResult(
+        id=row["id"],
+        idempotency_key=row["idempotency_key"],
+        created=True,
+        risk=policy.risk,
+        requires_approval=policy.requires_approval,
+        upgraded_to_red=decision.upgraded_to_red,
     )
-    db.add(msg)
-    db.commit()
-    return msg.id
+
+
+def _existing_by_key(db: Session, *, tenant_id: str, keys: list[str]) -> dict[str, OutboxCreateResult]:
+    if not keys:
+        return {}
+    # Only the policy outcome is read back, not the whole payload.
+    policy = OutboxMessage.payload["policy"]
+    q = db.query(
+        OutboxMessage.id,
+        OutboxMessage.idempotency_key,
+        policy["risk"].as_string().label("risk"),
+        policy["requires_approval"].as_boolean().label("requires_approval"),
+        OutboxMessage.meta["policy_upgraded_to_red"].as_boolean().label("upgraded_to_red"),
+    ).filter(OutboxMessage.tenant_id == tenant_id, OutboxMessage.idempotency_key.in_(keys))
+    return {
+        r.idempotency_key: OutboxCreateResult(
+            id=r.id,
+            idempotency_key=r.idempotency_key,
+            risk=r.risk,
+            requires_approval=bool(r.requires_approval),
+            upgraded_to_red=bool(r.upgraded_to_red),
+        )
+        for r in q
+    }
+
+
+def _insert_ignoring_conflicts(db: Session, rows: list[dict]) -> set[str]:
+    """Multi-row INSERT skipping (tenant_id, idempotency_key) conflicts; returns the ids actually inserted."""
+
+    if not rows:
+        return set()
+    table = OutboxMessage.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Partial unique index ux_outbox_messages_tenant_idempotency (migration 0003).
+        stmt = pg_insert(table).on_conflict_do_nothing(
+            index_elements=["tenant_id", "idempotency_key"], index_where=table.c.idempotency_key.isnot(None)
+        )
+    elif dialect == "sqlite":
+        stmt = sqlite_insert(table).on_conflict_do_nothing()
+    else:
+        # No upsert support: plain INSERT (a duplicate key raises IntegrityError).
+        db.execute(insert(table), rows)
+        return {r["id"] for r in rows}
+    # executemany + RETURNING: SQLAlchemy batches this into multi-row VALUES statements ("insertmanyvalues").
+    return set(db.execute(stmt.returning(table.c.id), rows).scalars())
 
 
 def _to_field(payload: OutboxPayloadV1) -> str:
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from redis import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+log = logging.getLogger("outbox.wakeup")
+
+# Writers call request_wake(db) after adding QUEUED outbox rows (or approving one). When that session
+# commits, a Redis PUBLISH on OUTBOX_WAKE_CHANNEL tells the dispatcher loop (run_wake_loop, started with
+# `python -m app.outbox.wakeup`) to drain the queue immediately. The loop still sweeps every
+# OUTBOX_SWEEP_INTERVAL_SECONDS, so a lost notification (Redis down, publisher crash right after commit)
+# only delays delivery until the next sweep; beat's dispatch tick remains a further fallback.
+
+_SESSION_FLAG = "outbox_wake"
+# After a failed publish, skip publishing for this long instead of paying a connect timeout per commit.
+_PUBLISH_BACKOFF_S = 30.0
+
+_lock = threading.Lock()
+_redis: Redis | None = None
+_publish_down_until = 0.0
+
+
+def get_redis() -> Redis:
+    global _redis
+    with _lock:
+        if _redis is None:
+            _redis = Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        return _redis
+
+
+def set_redis(redis: Redis | None) -> None:
+    """Replace the process-wide Redis client used for wake-ups (tests, or custom Redis wiring)."""
+
+    global _redis, _publish_down_until
+    with _lock:
+        _redis = redis
+        _publish_down_until = 0.0
+
+
+def request_wake(db: Session) -> None:
+    """Publish a dispatcher wake-up once `db` commits (dropped if it rolls back)."""
+
+    db.info[_SESSION_FLAG] = True
+
+
+def publish_wake() -> bool:
+    """Best-effort PUBLISH; never raises. Returns whether a notification was sent."""
+
+    global _publish_down_until
+    if not settings.OUTBOX_WAKE_ENABLED or time.monotonic() < _publish_down_until:
+        return False
+    try:
+        get_redis().publish(settings.OUTBOX_WAKE_CHANNEL, b"1")
+        return True
+    except Exception as e:
+        _publish_down_until = time.monotonic() + _PUBLISH_BACKOFF_S
+        log.warning("Outbox wake-up publish failed (dispatcher falls back to sweeps): %s", str(e))
+        return False
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    if session.info.pop(_SESSION_FLAG, False):
+        publish_wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(session: Session) -> None:
+    session.info.pop(_SESSION_FLAG, None)
+
+
+def _drain(*, limit: int) -> int:
+    from app.core.db import SessionLocal
+    from app.outbox.dispatcher import dispatch_batch
+
+    total = 0
+    while True:
+        with SessionLocal() as db:
+            handled = dispatch_batch(db, limit=limit).handled
+        total += handled
+        if handled < limit:
+            return total
+
+
+def run_wake_loop(*, stop: threading.Event | None = None, limit: int | None = None, sweep_s: float | None = None) -> None:
+    """Dispatch on every wake-up notification, and at least every `sweep_s` seconds.
+
+    Notifications that arrive while a drain is running are coalesced into one follow-up drain.
+    Redis errors degrade the loop to plain sweeps; it re-subscribes on the next iteration.
+    """
+
+    stop = stop or threading.Event()
+    limit = int(limit or settings.OUTBOX_WAKE_BATCH)
+    sweep_s = float(sweep_s if sweep_s is not None else settings.OUTBOX_SWEEP_INTERVAL_SECONDS)
+    pubsub = None
+
+    while not stop.is_set():
+        if pubsub is None and settings.OUTBOX_WAKE_ENABLED:
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(settings.OUTBOX_WAKE_CHANNEL)
+            except Exception as e:
+                log.warning("Outbox wake-up subscribe failed (sweeping every %ss): %s", sweep_s, str(e))
+                pubsub = None
+
+        try:
+            _drain(limit=limit)
+        except Exception:
+            log.exception("Outbox drain failed")
+
+        if pubsub is None:
+            stop.wait(sweep_s)
+            continue
+        try:
+            # Block until a wake-up or the sweep deadline, then swallow anything queued meanwhile.
+            deadline = time.monotonic() + sweep_s
+            while not stop.is_set() and time.monotonic() < deadline:
+                if pubsub.get_message(timeout=min(1.0, max(0.0, deadline - time.monotonic()))):
+                    while pubsub.get_message(timeout=0):
+                        pass
+                    break
+        except Exception as e:
+            log.warning("Outbox wake-up subscription lost: %s", str(e))
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+            pubsub = None
+
+    if pubsub is not None:
+        try:
+            pubsub.close()
+        except Exception:
+            pass
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    run_wake_loop()
+
+
+if __name__ == "__main__":
+    main()
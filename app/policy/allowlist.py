@@ -1,12 +1,33 @@
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from dataclasses import dataclass
 
-from sqlalchemy.orm import Session
+from redis import Redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
 
+from app.core.config import settings
 from app.models.tables import Document
 from app.schemas.outbox_v1 import Allowlist
 
+log = logging.getLogger("policy.allowlist")
+
+# Tenant allowlists are compiled once into frozen sets and cached per process (get_compiled_allowlist).
+# Committing a new policy_allowlist Document (PUT /policy/allowlist, or any ORM insert) drops the local
+# entry and INCRs the tenant's version stamp in Redis; other API/worker processes compare that stamp
+# after POLICY_ALLOWLIST_CACHE_SECONDS and reload only when it moved. Without Redis (or without a stamp)
+# they compare the latest document id instead, so a lost bump only costs one cheap query per window.
+
+_SESSION_KEY = "policy_allowlist_changed"
+# After a failed Redis call, skip Redis for this long instead of paying a connect timeout per lookup.
+_STAMP_BACKOFF_S = 30.0
+# Entries trusted through an unchanged stamp are still re-checked against the database this often,
+# bounding staleness if a stamp bump was lost (Redis down at commit time).
+_DB_RECHECK_S = 60.0
+
 
 @dataclass(frozen=True)
 class AllowlistDoc:
@@ -14,6 +35,40 @@ class AllowlistDoc:
     document_id: str | None
 
 
+@dataclass(frozen=True)
+class CompiledAllowlist:
+    """Normalized, immutable allowlist: lowercase emails/domains, stripped chat ids and repos."""
+
+    emails: frozenset[str] = frozenset()
+    email_domains: frozenset[str] = frozenset()
+    telegram_chats: frozenset[str] = frozenset()
+    github_repos: frozenset[str] = frozenset()
+    document_id: str | None = None
+
+    @classmethod
+    def from_allowlist(cls, allow: Allowlist, *, document_id: str | None = None) -> CompiledAllowlist:
+        return cls(
+            emails=frozenset(e.strip().lower() for e in allow.emails or []),
+            email_domains=frozenset(d.strip().lower().lstrip("@") for d in allow.email_domains or []),
+            telegram_chats=frozenset(c.strip() for c in allow.telegram_chats or []),
+            github_repos=frozenset(r.strip() for r in allow.github_repos or []),
+            document_id=document_id,
+        )
+
+    def allows_email(self, addr: str) -> bool:
+        a = addr.strip().lower()
+        if a in self.emails:
+            return True
+        _, at, dom = a.partition("@")
+        return bool(at) and dom in self.email_domains
+
+    def allows_telegram(self, target: str) -> bool:
+        return target.strip() in self.telegram_chats
+
+    def allows_github(self, repo: str) -> bool:
+        return repo.strip() in self.github_repos
+
+
 def load_policy_allowlist(db: Session, *, tenant_id: str) -> AllowlistDoc:
     """Load tenant-wide allowlist from documents.
 
@@ -44,6 +99,16 @@ def load_policy_allowlist(db: Session, *, tenant_id: str) -> AllowlistDoc:
     return AllowlistDoc(allowlist=allow, document_id=doc.id)
 
 
+def _latest_document_id(db: Session, *, tenant_id: str) -> str | None:
+    return (
+        db.query(Document.id)
+        .filter(Document.tenant_id == tenant_id, Document.domain == "policy", Document.doc_type == "policy_allowlist")
+        .order_by(Document.created_at.desc())
+        .limit(1)
+        .scalar()
+    )
+
+
 def merge_allowlists(*, base: Allowlist, extra: Allowlist) -> Allowlist:
     """Union allowlists (dedup, stable-ish ordering)."""
 
@@ -62,3 +127,133 @@ def merge_allowlists(*, base: Allowlist, extra: Allowlist) -> Allowlist:
         telegram_chats=uniq((base.telegram_chats or []) + (extra.telegram_chats or [])),
         github_repos=uniq((base.github_repos or []) + (extra.github_repos or [])),
     )
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    compiled: CompiledAllowlist
+    stamp: int | None
+    fresh_until: float
+    verified_at: float
+
+
+_lock = threading.Lock()
+_cache: dict[str, _CacheEntry] = {}
+_redis: Redis | None = None
+_stamp_down_until = 0.0
+
+
+def get_redis() -> Redis:
+    global _redis
+    with _lock:
+        if _redis is None:
+            _redis = Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1)
+        return _redis
+
+
+def set_redis(redis: Redis | None) -> None:
+    """Replace the process-wide Redis client used for version stamps (tests, or custom Redis wiring)."""
+
+    global _redis, _stamp_down_until
+    with _lock:
+        _redis = redis
+        _stamp_down_until = 0.0
+
+
+def _stamp_key(tenant_id: str) -> str:
+    return f"{settings.POLICY_ALLOWLIST_STAMP_PREFIX}:{tenant_id}"
+
+
+def _redis_call(fn, what: str):
+    """Run fn(redis); None when Redis is unavailable (logged, then skipped for _STAMP_BACKOFF_S)."""
+
+    global _stamp_down_until
+    if time.monotonic() < _stamp_down_until:
+        return None
+    try:
+        return fn(get_redis())
+    except Exception as e:
+        _stamp_down_until = time.monotonic() + _STAMP_BACKOFF_S
+        log.warning("Allowlist version stamp %s failed (falling back to document checks): %s", what, str(e))
+        return None
+
+
+def _read_stamp(tenant_id: str) -> int | None:
+    raw = _redis_call(lambda r: r.get(_stamp_key(tenant_id)), "read")
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def invalidate_allowlist_cache(*, tenant_id: str | None = None) -> None:
+    """Drop cached allowlists (one tenant, or all when tenant_id is None).
+
+    For a single tenant the Redis version stamp is bumped too, so other processes reload on their next
+    check. Called automatically when a session commits a new policy_allowlist Document.
+    """
+
+    with _lock:
+        if tenant_id is None:
+            _cache.clear()
+            return
+        _cache.pop(tenant_id, None)
+    _redis_call(lambda r: r.incr(_stamp_key(tenant_id)), "bump")
+
+
+def get_compiled_allowlist(db: Session, *, tenant_id: str) -> CompiledAllowlist:
+    """The tenant's allowlist, compiled and cached per process (see module comment).
+
+    Within POLICY_ALLOWLIST_CACHE_SECONDS of the last check this is a dict lookup; afterwards it costs one
+    Redis GET (or, without a stamp, one indexed id query), and the document is only re-read and
+    re-validated when it changed.
+    """
+
+    ttl = float(settings.POLICY_ALLOWLIST_CACHE_SECONDS)
+    if ttl <= 0:
+        doc = load_policy_allowlist(db, tenant_id=tenant_id)
+        return CompiledAllowlist.from_allowlist(doc.allowlist, document_id=doc.document_id)
+
+    now_m = time.monotonic()
+    with _lock:
+        entry = _cache.get(tenant_id)
+    if entry is not None and entry.fresh_until > now_m:
+        return entry.compiled
+
+    # Read the stamp before the document: a commit landing in between leaves us with an older stamp,
+    # which only causes one extra reload later.
+    stamp = _read_stamp(tenant_id)
+    verified_at = now_m
+    if entry is not None and stamp is not None and stamp == entry.stamp and now_m - entry.verified_at < _DB_RECHECK_S:
+        compiled = entry.compiled
+        verified_at = entry.verified_at
+    elif entry is not None and _latest_document_id(db, tenant_id=tenant_id) == entry.compiled.document_id:
+        compiled = entry.compiled
+    else:
+        doc = load_policy_allowlist(db, tenant_id=tenant_id)
+        compiled = CompiledAllowlist.from_allowlist(doc.allowlist, document_id=doc.document_id)
+
+    with _lock:
+        _cache[tenant_id] = _CacheEntry(compiled=compiled, stamp=stamp, fresh_until=now_m + ttl, verified_at=verified_at)
+    return compiled
+
+
+@event.listens_for(Session, "before_flush")
+def _track_allowlist_writes(session: Session, flush_context, instances) -> None:
+    for obj in session.new:
+        if isinstance(obj, Document) and obj.domain == "policy" and obj.doc_type == "policy_allowlist":
+            session.info.setdefault(_SESSION_KEY, set()).add(obj.tenant_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    for tenant_id in session.info.pop(_SESSION_KEY, ()):
+        invalidate_allowlist_cache(tenant_id=tenant_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_uncommitted(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_SESSION_KEY, None)
@@ -91,7 +91,8 @@ class GitHubIssueMessage(BaseModel):
 class OutboxPayloadBase(BaseModel):
     schema_: Literal["clowbot.outbox.v1"] = Field(default="clowbot.outbox.v1", alias="schema")
     kind: Literal["email", "telegram", "github_issue"]
-    idempotency_key: str
+    # Empty: derived from the message content on creation (compute_idempotency_key).
+    idempotency_key: str = ""
     context: OutboxContext = Field(default_factory=OutboxContext)
     policy: Policy = Field(default_factory=Policy)
     attachments: list[AttachmentRef] = Field(default_factory=list)
@@ -118,13 +119,53 @@ OutboxPayloadV1 = Annotated[
 ]
 
 
-def compute_idempotency_key(payload_dict: dict) -> str:
-    """Deterministic idempotency key.
+def _feed(h, value: str | None) -> None:
+    # Length-prefixed, so field boundaries are unambiguous; None and "" hash differently.
+    if value is None:
+        h.update(b"\x00")
+        return
+    data = value.encode("utf-8")
+    h.update(b"\x01" + len(data).to_bytes(8, "big"))
+    h.update(data)
 
-    NOTE: This is a conservative v1 implementation: stable JSON hashing.
+
+def _feed_all(h, values: list[str]) -> None:
+    h.update(len(values).to_bytes(8, "big"))
+    for v in values:
+        _feed(h, v)
+
+
+def compute_idempotency_key(payload: OutboxPayloadEmail | OutboxPayloadTelegram | OutboxPayloadGitHubIssue) -> str:
+    """Deterministic idempotency key from the validated payload.
+
+    Hashes only what makes two messages the same message: kind, target (recipients lowercased and
+    sorted), content and attachment hashes. Context, policy and delivery options are left out, so a
+    resubmission with another trace id or risk level dedups. Fields are streamed into SHA-256 one by
+    one instead of serializing the payload to JSON first.
     """
-    import json
 
-    normalized = json.dumps(payload_dict, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
-    h = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
-    return f"sha256:{h}"
+    h = hashlib.sha256()
+    _feed(h, payload.kind)
+    m = payload.message
+    if payload.kind == "email":
+        for recipients in (m.to, m.cc, m.bcc):
+            _feed_all(h, sorted(a.email.strip().lower() for a in recipients))
+        _feed(h, m.subject)
+        _feed(h, m.body.text)
+        _feed(h, m.body.markdown)
+        _feed(h, m.body.html)
+    elif payload.kind == "telegram":
+        _feed(h, (m.chat.chat_id or m.chat.username or "").strip())
+        _feed(h, m.parse_mode)
+        _feed(h, m.text)
+    else:
+        _feed(h, m.repo.strip())
+        _feed(h, m.title)
+        _feed(h, m.body.markdown)
+        _feed(h, m.body.text)
+        _feed_all(h, sorted(m.labels))
+        _feed_all(h, sorted(m.assignees))
+        _feed(h, m.milestone)
+    # Attachments by content (sha256, or the object key when no hash is known), order-insensitive.
+    _feed_all(h, sorted(f"{a.sha256 or a.object_key}:{a.disposition}:{a.filename}" for a in payload.attachments))
+    return f"sha256:{h.hexdigest()}"
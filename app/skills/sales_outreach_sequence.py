@@ -6,7 +6,7 @@ import secrets
 from sqlalchemy.orm import Session
 
 from app.models.tables import Document, PendingAction
-from app.outbox.service import create_outbox_message
+from app.outbox.service import create_outbox_messages_bulk
 from app.skills.registry import register
 from app.skills.runner import SkillRunResult, _create_task
 from app.util.ids import new_uuid
@@ -130,41 +130,48 @@ def sales_outreach_sequence(*, db: Session, tenant_id: str, user_id: str | None,
     db.add(out_doc)
     db.commit()
 
+    payload_dicts: list[dict] = []
+    for idx, text in enumerate(messages):
+        payload_dicts.append(
+            {
+                "schema": "clowbot.outbox.v1",
+                "kind": "telegram",
+                "idempotency_key": "",
+                "context": {"source": "skill.sales_outreach_sequence", "sequence_index": idx},
+                "policy": {
+                    "risk": "YELLOW",
+                    "requires_approval": False,
+                    # Per-message allowlist can be empty; tenant policy_allowlist can allow it.
+                    "allowlist": {"email_domains": [], "emails": [], "telegram_chats": [], "github_repos": []},
+                },
+                "message": {
+                    "chat": {"chat_id": chat_id, "username": chat_username},
+                    "parse_mode": "Markdown",
+                    "text": text,
+                    "disable_web_page_preview": True,
+                    "reply_to_message_id": None,
+                    "silent": False,
+                },
+                "attachments": [],
+            }
+        )
+
+    results = create_outbox_messages_bulk(db=db, tenant_id=tenant_id, user_id=user_id, payload_dicts=payload_dicts)
+    failed = [r.error for r in results if r.error]
+    if failed:
+        raise ValueError(f"Invalid outbox payload: {failed[0]}")
+
     outbox_ids: list[str] = []
     pending_action_ids: list[str] = []
     confirmation_tokens: dict[str, str] = {}
-
-    for idx, text in enumerate(messages):
-        payload_dict = {
-            "schema": "clowbot.outbox.v1",
-            "kind": "telegram",
-            "idempotency_key": "",
-            "context": {"source": "skill.sales_outreach_sequence", "sequence_index": idx},
-            "policy": {
-                "risk": "YELLOW",
-                "requires_approval": False,
-                # Per-message allowlist can be empty; tenant policy_allowlist can allow it.
-                "allowlist": {"email_domains": [], "emails": [], "telegram_chats": [], "github_repos": []},
-            },
-            "message": {
-                "chat": {"chat_id": chat_id, "username": chat_username},
-                "parse_mode": "Markdown",
-                "text": text,
-                "disable_web_page_preview": True,
-                "reply_to_message_id": None,
-                "silent": False,
-            },
-            "attachments": [],
-        }
-
-        outbox_id = create_outbox_message(db=db, tenant_id=tenant_id, user_id=user_id, payload_dict=payload_dict)
-        outbox_ids.append(outbox_id)
-
-        # If allowlist enforcement upgraded this message to require approval, create pending action.
-        from app.models.tables import OutboxMessage
-
-        m = db.query(OutboxMessage).filter(OutboxMessage.id == outbox_id).one()
-        if (m.payload or {}).get("policy", {}).get("requires_approval"):
+    for res in results:
+        # Identical messages share one row (the idempotency key hashes chat + text): list it once.
+        if res.id in outbox_ids:
+            continue
+        outbox_ids.append(res.id)
+        # If allowlist enforcement upgraded this message to require approval, create pending action. Only for
+        # rows this run created: an existing row already has its action (and may already be sent).
+        if res.created and res.requires_approval:
             token = secrets.token_urlsafe(18)
             pa = PendingAction(
                 id=new_uuid(),
@@ -172,16 +179,17 @@ def sales_outreach_sequence(*, db: Session, tenant_id: str, user_id: str | None,
                 user_id=user_id,
                 risk_level="RED",
                 action_type="outbox.send",
-                payload={"outbox_id": outbox_id},
+                payload={"outbox_id": res.id},
                 status="PENDING",
                 confirmation_token_hash=_hash_token(token),
                 created_at=now_utc(),
                 decided_at=None,
             )
             db.add(pa)
-            db.commit()
             pending_action_ids.append(pa.id)
             confirmation_tokens[pa.id] = token
+    if pending_action_ids:
+        db.commit()
 
     return SkillRunResult(
         status="DONE",
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session
 
+from app.memory.blob_store import document_text
 from app.models.tables import Document
 from app.portfolio.scoring import parse_portfolio_markdown_table, pick_active_set
 from app.skills.registry import register
@@ -34,8 +35,8 @@ def weekly_review(*, db: Session, tenant_id: str, user_id: str | None, inputs: d
             .filter(Document.tenant_id == tenant_id, Document.id == portfolio_doc_id)
             .one_or_none()
         )
-        if doc and doc.content_text:
-            portfolio_md = doc.content_text
+        if doc:
+            portfolio_md = document_text(doc)
 
     if not portfolio_md:
         tid = _create_task(db, tenant_id=tenant_id, title="[PORTFOLIO] Provide portfolio_markdown or portfolio_doc_id")
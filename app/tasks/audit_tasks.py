@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import logging
+
+from app.core.celery_app import celery
+from app.core.db import SessionLocal
+
+log = logging.getLogger("audit_tasks")
+
+
+@celery.task(name="app.tasks.audit_tasks.maintain_audit_log")
+def maintain_audit_log() -> dict:
+    """Pre-create upcoming audit_log partitions, then archive and drop months past retention."""
+
+    from app.audit.partitions import archive_expired, ensure_partitions
+
+    db = SessionLocal()
+    try:
+        created = ensure_partitions(db)
+        res = archive_expired(db)
+        return {**res, "created_partitions": created}
+    finally:
+        db.close()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from app.core.celery_app import celery
+from app.core.db import SessionLocal
+
+
+@celery.task(name="app.tasks.blob_tasks.gc_blobs")
+def gc_blobs(limit: int = 500) -> dict:
+    """Delete document blobs that have stayed unreferenced past BLOB_GC_GRACE_SECONDS."""
+
+    from app.memory.blob_store import gc_blobs as run_gc
+
+    db = SessionLocal()
+    try:
+        return run_gc(db, limit=limit)
+    finally:
+        db.close()
+
+
+@celery.task(name="app.tasks.blob_tasks.offload_document_blobs")
+def offload_document_blobs(limit: int = 100) -> dict:
+    """Move large inline document bodies to the blob store (one pass over the current candidates)."""
+
+    from app.memory.blob_store import offload_documents
+
+    db = SessionLocal()
+    try:
+        totals = {"moved": 0, "kept_inline": 0}
+        after = ""
+        while True:
+            res = offload_documents(db, limit=limit, after=after)
+            totals["moved"] += res["moved"]
+            totals["kept_inline"] += res["kept_inline"]
+            if res["last_id"] is None:
+                return totals
+            after = res["last_id"]
+    finally:
+        db.close()
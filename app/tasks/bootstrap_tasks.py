@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import logging
+
+from app.core.celery_app import celery
+from app.core.db import SessionLocal
+
+log = logging.getLogger("bootstrap_tasks")
+
+
+@celery.task(name="app.tasks.bootstrap_tasks.refresh_bootstrap_all")
+def refresh_bootstrap_all() -> dict:
+    """Refresh Source-of-Truth documents for every tenant (picks up SoT file changes between manual refreshes)."""
+
+    from app.memory.bootstrap import refresh_bootstrap
+    from app.models.tables import Tenant
+
+    db = SessionLocal()
+    try:
+        tenant_ids = [t for (t,) in db.query(Tenant.id).order_by(Tenant.created_at.asc()).all()]
+        refreshed = 0
+        failed = 0
+        for tenant_id in tenant_ids:
+            try:
+                refresh_bootstrap(db, tenant_id=tenant_id, user_id=None)
+                refreshed += 1
+            except Exception as e:
+                db.rollback()
+                log.exception("Bootstrap refresh failed for tenant %s: %s", tenant_id, str(e))
+                failed += 1
+        return {"ok": True, "refreshed": refreshed, "failed": failed}
+    finally:
+        db.close()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from app.core.celery_app import celery
+from app.core.config import settings
+from app.core.db import SessionLocal
+
+
+@celery.task(name="app.tasks.vector_tasks.index_vectors")
+def index_vectors(limit: int | None = None) -> dict:
+    """Drain the vector index queue: embed and upsert due documents batch by batch."""
+
+    from app.memory.vector_indexer import index_pending
+
+    batch = max(1, int(limit or settings.VECTOR_INDEX_BATCH))
+    totals = {"claimed": 0, "indexed": 0, "failed": 0, "skipped": 0, "dead": 0}
+    db = SessionLocal()
+    try:
+        while True:
+            stats = index_pending(db, limit=batch)
+            for k, v in stats.items():
+                totals[k] += v
+            # Stop on a short batch, or when a whole batch failed (Qdrant down: wait for the backoff).
+            if stats["claimed"] < batch or stats["failed"] == stats["claimed"]:
+                return totals
+    finally:
+        db.close()
@@ -5,7 +5,7 @@ import uuid
 from sqlalchemy.orm import Session
 
 from app.core.db import SessionLocal
-from app.models.tables import AuditLog, Tenant, User
+from app.models.tables import Tenant, User
 from app.util.time import now_utc
 
 
@@ -14,6 +14,8 @@ def new_uuid() -> str:
 
 
 def seed() -> None:
+    from app.audit import audit  # app.audit imports this module
+
     db: Session = SessionLocal()
     try:
         tenant = db.query(Tenant).filter(Tenant.name == "seed-tenant").one_or_none()
@@ -36,18 +38,7 @@ def seed() -> None:
             db.add(user)
             db.commit()
 
-        db.add(
-            AuditLog(
-                id=new_uuid(),
-                tenant_id=tenant.id,
-                user_id=user.id,
-                event_type="SEED_DONE",
-                severity="INFO",
-                message="Seed completed",
-                context={},
-                created_at=now_utc(),
-            )
-        )
+        audit(db, "SEED_DONE", tenant_id=tenant.id, user_id=user.id, message="Seed completed")
         db.commit()
         print(tenant.id)
     finally:
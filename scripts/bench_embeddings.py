@@ -0,0 +1,89 @@
+"""Embedding throughput on CPU: documents embedded per second, per text vs batched.
+
+Embeds BENCH_DOCS synthetic documents (~BENCH_WORDS words each) with the configured embedder
+(EMBEDDING_BACKEND / EMBEDDING_DIM), once text by text and once in EMBEDDING_BATCH_SIZE batches, and
+compares both with the legacy 8-dim sha256 pseudo-vector. Also reports a retrieval sanity check: how often a
+document's nearest neighbour is its own paraphrase (the legacy vector scores at chance).
+
+    python scripts/bench_embeddings.py
+    EMBEDDING_DIM=768 BENCH_DOCS=5000 python scripts/bench_embeddings.py
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+DOCS = int(os.getenv('BENCH_DOCS', '2000'))
+WORDS = int(os.getenv('BENCH_WORDS', '200'))
+
+VOCAB = [f'w{i}' for i in range(5000)]
+
+
+def corpus(rng: random.Random) -> tuple[list[str], list[str]]:
+    docs, paraphrases = [], []
+    for _ in range(DOCS):
+        words = rng.choices(VOCAB, k=WORDS)
+        docs.append(' '.join(words))
+        # Same topic: ~70% of the words kept in place, the rest replaced.
+        kept = [w if rng.random() < 0.7 else rng.choice(VOCAB) for w in words]
+        paraphrases.append(' '.join(kept))
+    return docs, paraphrases
+
+
+def legacy_vector8(text: str) -> list[float]:
+    h = hashlib.sha256(text.encode('utf-8')).digest()
+    return [b / 255.0 for b in h[:8]]
+
+
+def rate(fn) -> tuple[object, float]:
+    started = time.perf_counter()
+    out = fn()
+    return out, DOCS / (time.perf_counter() - started)
+
+
+def main() -> int:
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+    import numpy as np
+
+    from app.core.config import settings
+    from app.memory.embeddings import embed_batched, get_embedder
+
+    embedder = get_embedder()
+    docs, paraphrases = corpus(random.Random(7))
+    embedder.embed(docs[:8])  # warm-up
+
+    _, legacy_rate = rate(lambda: [legacy_vector8(t) for t in docs])
+    _, single_rate = rate(lambda: [embedder.embed([t]) for t in docs])
+    vectors, batched_rate = rate(lambda: embed_batched(embedder, docs))
+
+    queries = embed_batched(embedder, paraphrases[:500])
+    hits = int((np.argmax(queries @ vectors.T, axis=1) == np.arange(len(queries))).sum())
+
+    print(
+        json.dumps(
+            {
+                'docs': DOCS,
+                'words_per_doc': WORDS,
+                'embedder': embedder.name,
+                'dim': embedder.dim,
+                'batch_size': settings.EMBEDDING_BATCH_SIZE,
+                'legacy_sha256_8d_docs_per_s': round(legacy_rate),
+                'per_text_docs_per_s': round(single_rate),
+                'batched_docs_per_s': round(batched_rate),
+                'paraphrase_top1': round(hits / len(queries), 3),
+                'legacy_paraphrase_top1_expected': round(1 / DOCS, 4),
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""Idempotency key benchmark: legacy JSON hashing vs canonical field hashing (compute_idempotency_key).
+
+Times both over large email bodies and long attachment lists, and reports how many distinct keys each
+produces for resubmissions of the same messages that differ only in context/policy (lower = better dedup).
+
+    python scripts/bench_idempotency_key.py
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+ITERATIONS = int(os.getenv('BENCH_ITERATIONS', '50'))
+BODY_KB = int(os.getenv('BENCH_BODY_KB', '1024'))
+ATTACHMENTS = int(os.getenv('BENCH_ATTACHMENTS', '500'))
+
+
+def legacy_key(payload_dict: dict) -> str:
+    normalized = json.dumps(payload_dict, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return 'sha256:' + hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def email(*, body: str, attachments: int, trace_id: str = 't0', risk: str = 'YELLOW') -> dict:
+    return {
+        'schema': 'clowbot.outbox.v1',
+        'kind': 'email',
+        'idempotency_key': '',
+        'context': {'source': 'bench', 'trace_id': trace_id},
+        'policy': {'risk': risk, 'requires_approval': False, 'allowlist': {'email_domains': ['example.com']}},
+        'message': {
+            'to': [{'email': f'user{i}@example.com'} for i in range(20)],
+            'subject': 'Quarterly report',
+            'body': {'text': body, 'markdown': body},
+        },
+        'attachments': [
+            {
+                'id': str(i),
+                'filename': f'file{i}.pdf',
+                'content_type': 'application/pdf',
+                'object_key': f'attachments/{i}.pdf',
+                'size_bytes': 1024 * i,
+                'sha256': hashlib.sha256(str(i).encode()).hexdigest(),
+            }
+            for i in range(attachments)
+        ],
+    }
+
+
+def timed(fn, items) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for item in items:
+            fn(item)
+    return (time.perf_counter() - started) / (ITERATIONS * len(items))
+
+
+def main() -> int:
+    from pydantic import TypeAdapter
+
+    from app.schemas.outbox_v1 import OutboxPayloadV1, compute_idempotency_key
+
+    adapter = TypeAdapter(OutboxPayloadV1)
+    cases = {
+        'large_body': email(body='lorem ipsum dolor sit amet ' * (BODY_KB * 1024 // 27), attachments=2),
+        'many_attachments': email(body='short', attachments=ATTACHMENTS),
+    }
+    out: dict = {'iterations': ITERATIONS, 'body_kb': BODY_KB, 'attachments': ATTACHMENTS}
+    for name, payload in cases.items():
+        model = adapter.validate_python(payload)
+        legacy_s = timed(legacy_key, [payload])
+        canonical_s = timed(compute_idempotency_key, [model])
+        out[name] = {
+            'legacy_ms': round(legacy_s * 1000, 3),
+            'canonical_ms': round(canonical_s * 1000, 3),
+            'speedup': round(legacy_s / canonical_s, 2) if canonical_s else None,
+        }
+
+    # 50 messages, each resubmitted 10 times with a different trace id / risk level.
+    resubmits = [
+        email(body=f'message {m}', attachments=1, trace_id=f't{r}', risk=('YELLOW', 'RED')[r % 2])
+        for m in range(50)
+        for r in range(10)
+    ]
+    out['dedup'] = {
+        'payloads': len(resubmits),
+        'distinct_messages': 50,
+        'legacy_keys': len({legacy_key(p) for p in resubmits}),
+        'canonical_keys': len({compute_idempotency_key(adapter.validate_python(p)) for p in resubmits}),
+    }
+    print(json.dumps(out))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
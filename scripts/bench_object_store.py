@@ -0,0 +1,174 @@
+"""Object store upload latency per dispatched message: fresh client per write vs the shared client.
+
+Each dispatched message uploads two preview artifacts. The legacy path built a new Minio client for every
+write and checked bucket existence first (region lookup + HEAD + PUT on a new connection, twice, one after
+the other); the shared path reuses one pooled client, trusts a memoized bucket check and uploads both
+artifacts concurrently with put_many.
+
+Runs against an in-process S3 stub by default (BENCH_RTT_MS simulates the network round trip per request);
+set BENCH_MINIO_ENDPOINT to measure a real MinIO instead.
+
+    python scripts/bench_object_store.py
+    BENCH_MINIO_ENDPOINT=localhost:9000 python scripts/bench_object_store.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+MESSAGES = int(os.getenv('BENCH_MESSAGES', '200'))
+RTT_MS = float(os.getenv('BENCH_RTT_MS', '2'))
+ENDPOINT = os.getenv('BENCH_MINIO_ENDPOINT', '')
+
+LOCATION_XML = b'<?xml version="1.0" encoding="UTF-8"?>\n<LocationConstraint xmlns="http://s3.amazonaws.com/doc/2006-03-01/">us-east-1</LocationConstraint>'
+
+
+class S3Stub:
+    """Minimal S3 endpoint: bucket location/HEAD and object PUT; counts requests and TCP connections."""
+
+    def __init__(self, rtt_s: float):
+        self.rtt_s = rtt_s
+        self.lock = threading.Lock()
+        self.requests: dict[str, int] = {}
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with stub.lock:
+                    stub.connections += 1
+
+            def _reply(self, status: int, body: bytes = b'', headers: dict | None = None) -> None:
+                self.send_response(status)
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body and self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def _count(self, what: str) -> None:
+                time.sleep(stub.rtt_s)
+                with stub.lock:
+                    stub.requests[what] = stub.requests.get(what, 0) + 1
+
+            def do_GET(self):  # noqa: N802
+                self._count('location' if 'location' in self.path else 'get')
+                self._reply(200, LOCATION_XML, {'Content-Type': 'application/xml'})
+
+            def do_HEAD(self):  # noqa: N802
+                self._count('bucket_exists')
+                self._reply(200)
+
+            def do_PUT(self):  # noqa: N802
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                self._count('put_bucket' if self.path.strip('/').count('/') == 0 else 'put_object')
+                self._reply(200, headers={'ETag': '"0"'})
+
+            def log_message(self, format, *args):
+                return
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint = f'127.0.0.1:{self.server.server_address[1]}'
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return {'connections': self.connections, **self.requests}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.requests = {}
+            self.connections = 0
+
+
+def artifacts(i: int) -> list[tuple[str, bytes, str]]:
+    raw = json.dumps({'adapter_kind': 'telegram', 'params': {'chat_id': '100', 'text': f'message {i} ' * 40}}, indent=2)
+    return [
+        (f'bench/outbox/previews/{i:064x}/preview.json', raw.encode('utf-8'), 'text/plain'),
+        (f'bench/outbox/previews/{i:064x}/preview_payload.json', (raw * 2).encode('utf-8'), 'application/json'),
+    ]
+
+
+def legacy_put(key: str, data: bytes, content_type: str) -> None:
+    import io
+
+    from minio import Minio
+
+    from app.core.config import settings
+
+    c = Minio(
+        endpoint=settings.MINIO_ENDPOINT,
+        access_key=settings.MINIO_ACCESS_KEY,
+        secret_key=settings.MINIO_SECRET_KEY,
+        secure=settings.MINIO_SECURE,
+    )
+    if not c.bucket_exists(settings.MINIO_BUCKET):
+        c.make_bucket(settings.MINIO_BUCKET)
+    c.put_object(settings.MINIO_BUCKET, key, io.BytesIO(data), length=len(data), content_type=content_type)
+
+
+def run(upload_message, stub: S3Stub | None) -> dict:
+    if stub is not None:
+        stub.reset()
+    latencies: list[float] = []
+    for i in range(MESSAGES):
+        started = time.perf_counter()
+        upload_message(artifacts(i))
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    out = {
+        'per_message_p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'per_message_p95_ms': round(latencies[int(len(latencies) * 0.95)] * 1000, 3),
+        'total_s': round(sum(latencies), 3),
+    }
+    if stub is not None:
+        out['requests'] = stub.snapshot()
+    return out
+
+
+def main() -> int:
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    stub = None
+    if ENDPOINT:
+        os.environ['MINIO_ENDPOINT'] = ENDPOINT
+    else:
+        stub = S3Stub(RTT_MS / 1000)
+        os.environ['MINIO_ENDPOINT'] = stub.endpoint
+
+    from app.memory import object_store
+    from app.memory.object_store import PutObject
+
+    object_store.set_client(None)
+
+    def legacy(objs):
+        for key, data, content_type in objs:
+            legacy_put(key, data, content_type)
+
+    def shared(objs):
+        object_store.put_many(
+            [PutObject(object_key=k, data=d, content_type=ct) for k, d, ct in objs],
+            best_effort=False,
+        )
+
+    out: dict = {'messages': MESSAGES, 'rtt_ms': RTT_MS if stub else None, 'endpoint': ENDPOINT or 'in-process stub'}
+    out['legacy'] = run(legacy, stub)
+    out['shared'] = run(shared, stub)
+    out['speedup_p50'] = round(out['legacy']['per_message_p50_ms'] / out['shared']['per_message_p50_ms'], 2)
+    print(json.dumps(out))
+    object_store.close_client()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""Streaming object store benchmark: memory and throughput of put_stream / get_stream on large objects.
+
+Uploads a generated BENCH_STREAM_MB object through put_stream (multipart, MINIO_PART_SIZE_BYTES parts) and reads
+it back through get_stream, reporting peak Python heap (tracemalloc) for each, the throughput, and whether the
+incrementally computed SHA-256/size match. put_bytes would need the whole object in memory (twice: bytes +
+BytesIO). Runs against an in-process S3 stub (multipart-capable, discards uploads and serves generated data);
+set BENCH_MINIO_ENDPOINT to use a real MinIO instead.
+
+    python scripts/bench_object_stream.py
+    BENCH_STREAM_MB=1024 python scripts/bench_object_stream.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+SIZE_MB = int(os.getenv('BENCH_STREAM_MB', '256'))
+ENDPOINT = os.getenv('BENCH_MINIO_ENDPOINT', '')
+
+PATTERN = bytes(range(256)) * 4096  # 1 MiB
+NS = 'xmlns="http://s3.amazonaws.com/doc/2006-03-01/"'
+
+
+class Generated:
+    """Deterministic stream of `size` bytes that never holds more than one read in memory."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.pos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        n = self.size - self.pos if n is None or n < 0 else min(n, self.size - self.pos)
+        out = bytearray()
+        while len(out) < n:
+            start = (self.pos + len(out)) % len(PATTERN)
+            out += PATTERN[start : start + n - len(out)]
+        self.pos += n
+        return bytes(out)
+
+
+def expected_sha256(size: int) -> str:
+    sha = hashlib.sha256()
+    g = Generated(size)
+    while chunk := g.read(1 << 20):
+        sha.update(chunk)
+    return sha.hexdigest()
+
+
+def start_stub(object_size: int) -> str:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _reply(self, status: int, body: bytes = b'', headers: dict | None = None) -> None:
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if body and self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def _drain(self) -> None:
+            remaining = int(self.headers.get('Content-Length') or 0)
+            while remaining:
+                remaining -= len(self.rfile.read(min(remaining, 1 << 20)))
+
+        def do_HEAD(self):  # noqa: N802
+            self._reply(200)
+
+        def do_DELETE(self):  # noqa: N802
+            self._reply(204)
+
+        def do_PUT(self):  # noqa: N802
+            self._drain()
+            self._reply(200, headers={'ETag': '"part"'})
+
+        def do_POST(self):  # noqa: N802
+            self._drain()
+            if '?uploads' in self.path:
+                body = f'<InitiateMultipartUploadResult {NS}><UploadId>u1</UploadId></InitiateMultipartUploadResult>'
+            else:
+                body = f'<CompleteMultipartUploadResult {NS}><ETag>"done"</ETag></CompleteMultipartUploadResult>'
+            self._reply(200, body.encode(), {'Content-Type': 'application/xml'})
+
+        def do_GET(self):  # noqa: N802
+            if 'location' in self.path:
+                body = f'<LocationConstraint {NS}>us-east-1</LocationConstraint>'.encode()
+                self._reply(200, body, {'Content-Type': 'application/xml'})
+                return
+            start, end = 0, object_size - 1
+            m = re.match(r'bytes=(\d+)-(\d*)', self.headers.get('Range') or '')
+            if m:
+                start, end = int(m.group(1)), int(m.group(2) or end)
+            g = Generated(end + 1)
+            g.pos = start
+            self.send_response(206 if m else 200)
+            self.send_header('Content-Length', str(end - start + 1))
+            self.end_headers()
+            while chunk := g.read(1 << 20):
+                self.wfile.write(chunk)
+
+        def log_message(self, format, *args):
+            return
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'127.0.0.1:{server.server_address[1]}'
+
+
+def measured(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = fn()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> int:
+    size = SIZE_MB * 1024 * 1024
+    os.environ.setdefault('DATABASE_URL', 'sqlite://')
+    os.environ['MINIO_ENDPOINT'] = ENDPOINT or start_stub(size)
+
+    from app.core.config import settings
+    from app.memory import object_store
+
+    object_store.set_client(None)
+    object_store.ensure_minio_bucket()
+
+    key = f'bench/stream/{SIZE_MB}mb.bin'
+    stored, put_s, put_peak = measured(lambda: object_store.put_stream(object_key=key, stream=Generated(size)))
+
+    def read_all() -> tuple[int, str]:
+        sha = hashlib.sha256()
+        n = 0
+        for chunk in object_store.get_stream(key):
+            sha.update(chunk)
+            n += len(chunk)
+        return n, sha.hexdigest()
+
+    (read_n, read_sha), get_s, get_peak = measured(read_all)
+    expected = expected_sha256(size)
+
+    mib = 1024 * 1024
+    out = {
+        'size_mb': SIZE_MB,
+        'part_size_mb': round(settings.MINIO_PART_SIZE_BYTES / mib, 1),
+        'endpoint': ENDPOINT or 'in-process stub',
+        'put_stream': {
+            'mb_per_s': round(SIZE_MB / put_s, 1),
+            'peak_heap_mb': round(put_peak / mib, 1),
+            'size_ok': stored.size_bytes == size,
+            'sha256_ok': stored.sha256 == expected,
+        },
+        'get_stream': {
+            'mb_per_s': round(SIZE_MB / get_s, 1),
+            'peak_heap_mb': round(get_peak / mib, 1),
+            'size_ok': read_n == size,
+            'sha256_ok': read_sha == expected,
+        },
+        'put_bytes_would_hold_mb': 2 * SIZE_MB,
+    }
+    print(json.dumps(out))
+    object_store.close_client()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
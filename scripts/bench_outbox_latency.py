@@ -0,0 +1,132 @@
+"""Outbox queued-to-sent latency benchmark (created_at -> sent_at).
+
+A producer thread enqueues BENCH_RATE telegram rows/second for BENCH_SECONDS while the main thread
+simulates the beat-driven dispatcher: one dispatch_batch(limit=BENCH_BATCH) drain every BENCH_TICK
+seconds (BEAT_DISPATCH_INTERVAL_SECONDS). Prints p50/p95/max latency as JSON, e.g.:
+
+    BENCH_TICK=5 python scripts/bench_outbox_latency.py
+    BENCH_TICK=1 python scripts/bench_outbox_latency.py
+
+Without a beat schedule there is no tick at all: rows wait until something invokes dispatch_outbox.
+Object store writes are skipped (see bench_outbox_dispatch.py).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault('DATABASE_URL', 'sqlite+pysqlite:///:memory:')
+
+RATE = float(os.getenv('BENCH_RATE', '20'))
+SECONDS = float(os.getenv('BENCH_SECONDS', '20'))
+TICK = float(os.getenv('BENCH_TICK', '5'))
+BATCH = int(os.getenv('BENCH_BATCH', '100'))
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def main() -> int:
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Document, OutboxMessage, Tenant
+    from app.outbox import dispatcher, preview_store
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+    preview_store.put_many = lambda objects, *, best_effort: [o.object_key for o in objects]
+
+    tenant_id = new_uuid()
+    lock = threading.Lock()  # one shared SQLite connection: serialize producer and dispatcher
+    with SessionLocal() as db:
+        now = now_utc()
+        db.add(Tenant(id=tenant_id, name=f'bench-{tenant_id}', created_at=now))
+        for doc_type in ('mission', 'status', 'next'):
+            db.add(
+                Document(
+                    id=new_uuid(),
+                    tenant_id=tenant_id,
+                    workflow_id=None,
+                    domain='sot',
+                    doc_type=doc_type,
+                    title=doc_type,
+                    content_text='',
+                    object_key=None,
+                    meta={'content_sha256': 'bench', 'refreshed_at': now.isoformat()},
+                    created_at=now,
+                )
+            )
+        db.commit()
+
+    done = threading.Event()
+
+    def produce() -> None:
+        i = 0
+        started = time.monotonic()
+        while time.monotonic() - started < SECONDS:
+            with lock, SessionLocal() as db:
+                db.add(
+                    OutboxMessage(
+                        id=new_uuid(),
+                        tenant_id=tenant_id,
+                        user_id='bench',
+                        channel='stub',
+                        to='bench',
+                        subject=None,
+                        body=f'message {i}',
+                        meta={},
+                        status='QUEUED',
+                        created_at=now_utc(),
+                        sent_at=None,
+                    )
+                )
+                db.commit()
+            i += 1
+            time.sleep(1 / RATE)
+        done.set()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    while True:
+        time.sleep(TICK)
+        with lock, SessionLocal() as db:
+            while dispatcher.dispatch_batch(db, limit=BATCH).stub_sent:
+                pass
+            queued = db.query(OutboxMessage).filter(OutboxMessage.status == 'QUEUED').count()
+        if done.is_set() and not queued:
+            break
+
+    latencies = []
+    with SessionLocal() as db:
+        for created_at, sent_at in db.query(OutboxMessage.created_at, OutboxMessage.sent_at).filter(OutboxMessage.sent_at.isnot(None)):
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            if sent_at.tzinfo is None:
+                sent_at = sent_at.replace(tzinfo=timezone.utc)
+            latencies.append((sent_at - created_at).total_seconds())
+    latencies.sort()
+
+    print(
+        json.dumps(
+            {
+                'dialect': engine.dialect.name,
+                'tick_seconds': TICK,
+                'rows': len(latencies),
+                'latency_p50_s': round(_percentile(latencies, 0.5), 3) if latencies else None,
+                'latency_p95_s': round(_percentile(latencies, 0.95), 3) if latencies else None,
+                'latency_max_s': round(latencies[-1], 3) if latencies else None,
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
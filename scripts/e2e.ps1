@@ -50,7 +50,7 @@ function Dump-ComposeStateAndLogs {
     (docker compose ps | Out-String) | Add-Content -LiteralPath $FailLogPath -Encoding UTF8
 
     Add-Content -LiteralPath $FailLogPath -Value "\n--- docker compose logs --tail=200 ---\n" -Encoding UTF8
-    (docker compose logs --tail=200 api worker postgres redis qdrant minio | Out-String) | Add-Content -LiteralPath $FailLogPath -Encoding UTF8
+    (docker compose logs --tail=200 api worker-executor worker-dispatch worker-workflow worker-bootstrap outbox-dispatcher beat postgres redis qdrant minio | Out-String) | Add-Content -LiteralPath $FailLogPath -Encoding UTF8
   } catch {
     # best-effort
   } finally {
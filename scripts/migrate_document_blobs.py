@@ -0,0 +1,49 @@
+"""Move existing large document bodies out of Postgres into the content-addressed blob store.
+
+Runs the same offload as the offload_document_blobs beat task (app.memory.blob_store.offload_documents) over
+every inline document above DOCUMENT_INLINE_MAX_BYTES, in id order and batches, without waiting for the beat
+tick. Each distinct body is uploaded once; documents it cannot move (object store unavailable) stay inline
+and are picked up by the next run. Prints a JSON summary.
+
+    python scripts/migrate_document_blobs.py
+    MIGRATE_BATCH=200 MIGRATE_LIMIT=10000 python scripts/migrate_document_blobs.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+BATCH = int(os.getenv('MIGRATE_BATCH', '100'))
+LIMIT = int(os.getenv('MIGRATE_LIMIT', '0'))
+
+
+def main() -> int:
+    from app.core.config import settings
+    from app.core.db import SessionLocal
+    from app.memory.blob_store import offload_documents
+
+    threshold = int(settings.DOCUMENT_INLINE_MAX_BYTES)
+    if threshold <= 0:
+        print(json.dumps({'ok': False, 'reason': 'DOCUMENT_INLINE_MAX_BYTES is 0 (inline storage only)'}))
+        return 1
+
+    moved = kept = 0
+    after = ''
+    with SessionLocal() as db:
+        while not LIMIT or moved + kept < LIMIT:
+            res = offload_documents(db, limit=BATCH, after=after)
+            moved += res['moved']
+            kept += res['kept_inline']
+            if res['last_id'] is None:
+                break
+            after = res['last_id']
+
+    print(json.dumps({'ok': True, 'moved': moved, 'kept_inline': kept, 'threshold_bytes': threshold}))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
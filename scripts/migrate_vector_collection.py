@@ -0,0 +1,97 @@
+"""Re-embed the memory vectors of an old Qdrant collection into the active embedder's collection.
+
+Collections are per embedder and dimension (<QDRANT_COLLECTION>_<embedder>_<dim>); vectors from the legacy
+8-dim sha256 pseudo-embedding (collection QDRANT_COLLECTION) are not comparable with real embeddings, so they
+are recomputed from the document text in Postgres rather than copied. Points keep their id and payload;
+points whose document no longer exists (or has no text) are skipped. Set MIGRATE_DROP_OLD=1 to delete the old collection
+afterwards. Prints a JSON summary.
+
+    python scripts/migrate_vector_collection.py
+    MIGRATE_FROM=memory MIGRATE_DROP_OLD=1 python scripts/migrate_vector_collection.py
+"""
+
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+PAGE = int(os.getenv('MIGRATE_PAGE', '256'))
+DROP_OLD = os.getenv('MIGRATE_DROP_OLD', '0') == '1'
+
+
+def main() -> int:
+    from app.core.config import settings
+    from app.core.db import SessionLocal
+    from app.memory import vector_store
+    from app.memory.blob_store import document_text
+    from app.memory.embeddings import embed_batched, get_embedder
+    from app.models.tables import Document
+
+    source = os.getenv('MIGRATE_FROM', settings.QDRANT_COLLECTION)
+    embedder = get_embedder()
+    target = vector_store.ensure_qdrant_collection()
+    if source == target:
+        print(json.dumps({'ok': False, 'reason': f'source and target are both {target}'}))
+        return 1
+
+    client = vector_store._client()
+    started = time.perf_counter()
+    migrated = missing = 0
+    offset = None
+    with SessionLocal() as db:
+        while True:
+            points, offset = client.scroll(
+                collection_name=source, limit=PAGE, offset=offset, with_payload=True, with_vectors=False
+            )
+            if not points:
+                break
+            docs = {
+                d.id: d for d in db.query(Document).filter(Document.id.in_([str(p.id) for p in points])).all()
+            }
+            found = [p for p in points if str(p.id) in docs]
+            missing += len(points) - len(found)
+            vectors = embed_batched(embedder, [document_text(docs[str(p.id)]) or '' for p in found])
+
+            by_tenant: dict[str, list[dict]] = defaultdict(list)
+            for p, vector in zip(found, vectors):
+                if not vector.any():  # no tokens: nothing to search for
+                    continue
+                payload = dict(p.payload or {})
+                by_tenant[payload.pop('tenant_id', docs[str(p.id)].tenant_id)].append(
+                    {'id': p.id, 'vector': vector.tolist(), 'payload': payload}
+                )
+            for tenant_id, tenant_points in by_tenant.items():
+                vector_store.upsert_memory_vectors(tenant_id=tenant_id, points=tenant_points, collection=target)
+            migrated += len(found)
+            db.expunge_all()
+            if offset is None:
+                break
+
+    if DROP_OLD:
+        client.delete_collection(collection_name=source)
+
+    elapsed = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                'ok': True,
+                'from': source,
+                'to': target,
+                'embedder': embedder.name,
+                'dim': embedder.dim,
+                'migrated': migrated,
+                'skipped_missing_document': missing,
+                'dropped_old': DROP_OLD,
+                'seconds': round(elapsed, 3),
+            }
+        )
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+
+def test_audit_keyset_pages_and_filters(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.audit import new_event
+    from app.audit.writer import write_events
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    import app.main
+
+    Base.metadata.create_all(bind=engine)
+
+    tenant_id = new_uuid()
+    base = now_utc()
+    events = []
+    for i in range(20):
+        ev = new_event("OUTBOX_STUB_SENT", tenant_id=tenant_id, user_id="u1", message="stub_sent", context={"outbox_id": f"o{i}", "attempt": i})
+        events.append(dataclasses.replace(ev, created_at=base - timedelta(minutes=min(i, 15))))
+    events.append(
+        new_event("OUTBOX_DISPATCH_ATTEMPT", tenant_id=tenant_id, user_id=None, message="dispatch_attempt", context={"context_version": "v", "outbox_ids": ["o3", "o4"]})
+    )
+    events.append(new_event("OUTBOX_FAILED", tenant_id=tenant_id, user_id="u1", message="boom", context={"outbox_id": "o3"}))
+    events.append(new_event("TOOL_CALL", tenant_id=tenant_id, user_id="u1", message="tool", context={"action_id": "a1"}))
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=base))
+        db.commit()
+    with engine.begin() as conn:
+        write_events(conn, events)
+
+    c = TestClient(app.main.app)
+    c.headers.update({"X-Tenant-Id": tenant_id, "X-User-Id": "u1"})
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        r = c.get("/audit", params={"limit": 6, "fields": "id,event_type", **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200
+        data = r.json()
+        assert all(set(item) == {"id", "event_type"} for item in data["items"])
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 23
+    assert [e["id"] for e in c.get("/audit", params={"fields": "id"}).json()["items"]] == seen
+
+    by_outbox = c.get("/audit", params={"outbox_id": "o3", "fields": "event_type"}).json()["items"]
+    assert sorted(e["event_type"] for e in by_outbox) == ["OUTBOX_DISPATCH_ATTEMPT", "OUTBOX_FAILED", "OUTBOX_STUB_SENT"]
+
+    errors = c.get("/audit", params={"severity": "error,warn"}).json()["items"]
+    assert [e["event_type"] for e in errors] == ["OUTBOX_FAILED"]
+
+    assert len(c.get("/audit", params={"action_id": "a1"}).json()["items"]) == 1
+    assert [e["context"]["outbox_id"] for e in c.get("/audit", params={"context": "attempt:7"}).json()["items"]] == ["o7"]
+    assert len(c.get("/audit", params={"event_type": "OUTBOX_STUB_SENT,TOOL_CALL"}).json()["items"]) == 21
+    old = c.get("/audit", params={"created_to": (base - timedelta(minutes=14)).isoformat(), "order": "asc"}).json()["items"]
+    assert {e["context"]["outbox_id"] for e in old} == {f"o{i}" for i in range(15, 20)}
+
+    r = c.get("/audit", params={"format": "ndjson", "event_type": "OUTBOX_STUB_SENT", "fields": "id"})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    assert len([json.loads(line) for line in r.text.splitlines()]) == 20
+
+    assert c.get("/audit", params={"context": "nocolon"}).status_code == 400
+    assert c.get("/audit", params={"fields": "id,tenant_secret"}).status_code == 400
+
+    other = c.get("/audit", headers={"X-Tenant-Id": new_uuid()}).json()
+    assert other["items"] == []
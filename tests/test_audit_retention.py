@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import dataclasses
+import gzip
+import json
+from datetime import datetime, timezone
+
+
+def test_archive_exports_expired_months_then_deletes_them(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.audit import new_event, partitions
+    from app.audit.writer import write_events
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import AuditLog, Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+
+    assert partitions.add_months(datetime(2001, 11, 5, tzinfo=timezone.utc), 3) == datetime(2002, 2, 5, tzinfo=timezone.utc)
+    assert partitions.partition_name(partitions.month_start(datetime(2001, 2, 14))) == "audit_log_p2001_02"
+
+    tenant_id = new_uuid()
+    old = {
+        "2001-01": [datetime(2001, 1, 3, tzinfo=timezone.utc), datetime(2001, 1, 31, 23, 59, tzinfo=timezone.utc)],
+        "2001-03": [datetime(2001, 3, 1, tzinfo=timezone.utc)],
+    }
+    events = []
+    for stamps in old.values():
+        for ts in stamps:
+            ev = new_event("SEED_DONE", tenant_id=tenant_id, user_id="u1", message="old")
+            events.append(dataclasses.replace(ev, created_at=ts))
+    recent = new_event("SEED_DONE", tenant_id=tenant_id, user_id="u1", message="recent")
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        db.commit()
+        with engine.begin() as conn:
+            write_events(conn, [*events, recent])
+
+    uploads: dict[str, bytes] = {}
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_PART_ROWS", 1)
+
+    def failing_put(*, object_key, data, content_type, best_effort):
+        # The first part uploads, the second fails: nothing may be removed.
+        if uploads:
+            raise RuntimeError("object store down")
+        uploads[object_key] = data
+        return object_key
+
+    def put(*, object_key, data, content_type, best_effort):
+        assert best_effort is False
+        uploads[object_key] = data
+        return object_key
+
+    monkeypatch.setattr(partitions, "put_bytes", failing_put)
+    with SessionLocal() as db:
+        res = partitions.archive_expired(db, retention_months=12)
+        assert res["ok"] is False and res["archived"] == []
+        assert db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id).count() == 4  # nothing removed
+    uploads.clear()
+
+    monkeypatch.setattr(partitions, "put_bytes", put)
+    with SessionLocal() as db:
+        res = partitions.archive_expired(db, retention_months=12)
+        assert res["ok"] is True
+        assert [a["month"] for a in res["archived"]] == ["2001-01", "2001-03"]
+        assert [a["rows"] for a in res["archived"]] == [2, 1]
+
+        remaining = db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id).all()
+        assert [r.id for r in remaining] == [recent.id]
+
+    # One bounded object per part, in order.
+    keys = res["archived"][0]["object_keys"]
+    assert [k.rsplit("/", 1)[1][:9] for k in keys] == ["part-0001", "part-0002"]
+    assert all(k.startswith("_archive/audit_log/2001-01/") and k.endswith(".ndjson.gz") for k in keys)
+    assert len(res["archived"][1]["object_keys"]) == 1
+    lines = [json.loads(x) for k in keys for x in gzip.decompress(uploads[k]).decode("utf-8").splitlines()]
+    assert [x["id"] for x in lines] == [ev.id for ev in events[:2]]
+    assert lines[0]["event_type"] == "SEED_DONE" and lines[0]["tenant_id"] == tenant_id
+
+    with SessionLocal() as db:
+        assert partitions.archive_expired(db, retention_months=0) == {"ok": True, "archived": []}
+        assert partitions.ensure_partitions(db) == []  # SQLite: not partitioned
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import pytest
+
+
+def _count(db, tenant_id: str, event_type: str | None = None) -> int:
+    from app.models.tables import AuditLog
+
+    q = db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id)
+    if event_type:
+        q = q.filter(AuditLog.event_type == event_type)
+    return q.count()
+
+
+def test_sync_audit_is_written_on_commit_and_dropped_on_rollback(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.audit import audit
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        # Same transaction as the tenant row the events reference (FK order is handled by a flush).
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        for i in range(3):
+            audit(db, "WORKFLOW_STARTED", tenant_id=tenant_id, user_id="u1", message=f"wf {i}", context={"workflow_id": str(i)})
+        assert _count(db, tenant_id) == 0  # buffered, not flushed with the unit of work
+        db.commit()
+        assert _count(db, tenant_id, "WORKFLOW_STARTED") == 3
+
+        audit(db, "WORKFLOW_STARTED", tenant_id=tenant_id, user_id="u1", message="rolled back", context={"workflow_id": "x"})
+        db.rollback()
+        db.commit()
+        assert _count(db, tenant_id) == 3
+
+    with SessionLocal() as db:
+        audit(db, "WORKFLOW_STARTED", tenant_id=tenant_id, user_id="u1", message="never committed", context={"workflow_id": "y"})
+    with SessionLocal() as db:
+        assert _count(db, tenant_id) == 3
+
+    with pytest.raises(ValueError):
+        audit(db, "NOT_A_TYPE", tenant_id=tenant_id, user_id=None, message="x")
+    with pytest.raises(ValueError):
+        audit(db, "WORKFLOW_STARTED", tenant_id=tenant_id, user_id=None, message="x", context={})
+
+
+def test_async_writer_batches_after_commit(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.audit import audit
+    from app.audit import writer
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        db.commit()
+
+    monkeypatch.setattr(settings, "AUDIT_WRITE_MODE", "async")
+    w = writer.AuditWriter(batch_size=50, interval_s=0.05, max_queue=10)
+    writer.set_writer(w)
+    try:
+        with SessionLocal() as db:
+            for i in range(25):  # more than max_queue: the overflow is written by the committing thread
+                audit(db, "WORKFLOW_STARTED", tenant_id=tenant_id, user_id="u1", message=f"wf {i}", context={"workflow_id": str(i)})
+            db.commit()
+            w.flush()
+            assert _count(db, tenant_id, "WORKFLOW_STARTED") == 25
+
+            audit(db, "WORKFLOW_STARTED", tenant_id=tenant_id, user_id="u1", message="rolled back", context={"workflow_id": "x"})
+            db.rollback()
+
+        w.close()
+        with SessionLocal() as db:
+            audit(db, "WORKFLOW_STARTED", tenant_id=tenant_id, user_id="u1", message="after close", context={"workflow_id": "z"})
+            db.commit()  # closed writer: written synchronously
+            assert _count(db, tenant_id, "WORKFLOW_STARTED") == 26
+    finally:
+        writer.set_writer(None)
+
+
+def test_dispatcher_writes_one_attempt_event_per_tenant_batch(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import AuditLog, OutboxMessage
+    from app.outbox import dispatcher, preview_store
+    from app.util.ids import new_uuid
+    from tests.test_worker_leases import _seed_rows
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        ids = _seed_rows(db, tenant_id=tenant_id, n=5)
+        while dispatcher.dispatch_batch(db, limit=50).handled:
+            pass
+
+        attempts = db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id, AuditLog.event_type == "OUTBOX_DISPATCH_ATTEMPT").all()
+        assert len(attempts) == 1 and set(attempts[0].context["outbox_ids"]) == set(ids)
+        # Legacy stub rows have no outcome event; before batching this was one attempt row per message.
+        assert _count(db, tenant_id) == 1
+        assert db.query(OutboxMessage).filter(OutboxMessage.id.in_(ids), OutboxMessage.status == "STUB_SENT").count() == 5
+
+        db.query(OutboxMessage).filter(OutboxMessage.tenant_id == tenant_id).delete(synchronize_session=False)
+        db.commit()
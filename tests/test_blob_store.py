@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+
+
+class _FakeMinio:
+    """In-memory stand-in for the Minio client (put/get/remove_object and bucket checks)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets: set[str] = set()
+        self.objects: dict[str, bytes] = {}
+        self.puts: list[str] = []
+        self.down = False
+
+    def bucket_exists(self, bucket):
+        return bucket in self.buckets
+
+    def make_bucket(self, bucket):
+        self.buckets.add(bucket)
+
+    def put_object(self, bucket, key, data, length, content_type):
+        if self.down:
+            raise OSError("minio down")
+        with self.lock:
+            self.puts.append(key)
+            self.objects[key] = data.read()
+
+    def get_object(self, bucket, key, offset=0, length=0):
+        data = self.objects[key]
+        return type(
+            "Response",
+            (),
+            {"stream": lambda self, amt: iter([data]), "close": lambda self: None, "release_conn": lambda self: None},
+        )()
+
+    def remove_object(self, bucket, key):
+        self.objects.pop(key, None)
+
+
+def _setup(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.memory import blob_store, object_store
+    from app.models.base import Base
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(settings, "DOCUMENT_INLINE_MAX_BYTES", 1024)
+    monkeypatch.setattr(blob_store, "_upload_down_until", 0.0)
+    fake = _FakeMinio()
+    object_store.set_client(fake)
+    return SessionLocal, fake
+
+
+def _doc(tenant_id: str, text: str):
+    from app.models.tables import Document
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    return Document(
+        id=new_uuid(),
+        tenant_id=tenant_id,
+        domain="test",
+        doc_type="note",
+        title="note",
+        content_text=text,
+        object_key=None,
+        meta={},
+        created_at=now_utc(),
+    )
+
+
+def test_large_documents_share_one_blob_and_are_collected(monkeypatch):
+    SessionLocal, fake = _setup(monkeypatch)
+    from app.core.config import settings
+    from app.memory import blob_store, object_store
+    from app.models.tables import Blob, Document
+    from app.util.ids import new_uuid
+
+    tenant_id = new_uuid()
+    body = f"{tenant_id}\n" + "lorem ipsum " * 500
+    try:
+        with SessionLocal() as db:
+            docs = [_doc(tenant_id, body), _doc(tenant_id, body), _doc(tenant_id, "short")]
+            db.add_all(docs)
+            db.commit()
+            ids = [d.id for d in docs]
+            # Writes stay inline and never touch the object store.
+            assert fake.puts == [] and all(d.content_text for d in docs)
+
+            assert [blob_store.offload_document(db, doc_id) for doc_id in ids] == [True, True, False]
+
+        with SessionLocal() as db:
+            big1, big2, small = (db.get(Document, i) for i in ids)
+            assert big1.content_text is None and big1.object_key == big2.object_key
+            assert small.content_text == "short" and small.object_key is None
+            assert fake.puts == [big1.object_key]
+            sha = blob_store.blob_sha256(big1.object_key)
+            assert db.get(Blob, sha).refcount == 2
+
+            # Reads go to the object store (not the process cache) and verify the hash.
+            blob_store._cache.clear()
+            blob_store._cache_bytes = 0
+            assert blob_store.document_text(big2) == body
+
+            db.delete(big1)
+            db.commit()
+            assert db.get(Blob, sha).refcount == 1
+
+            # New inline text on the remaining document drops the last reference.
+            big2.content_text = "edited"
+            db.commit()
+            row = db.get(Blob, sha)
+            assert big2.object_key is None and row.refcount == 0 and row.released_at is not None
+
+            # Within the grace period nothing is collected.
+            assert blob_store.gc_blobs(db)["deleted"] == 0
+            monkeypatch.setattr(settings, "BLOB_GC_GRACE_SECONDS", 0.0)
+            assert blob_store.gc_blobs(db)["deleted"] >= 1
+            assert db.get(Blob, sha) is None
+            assert blob_store.blob_key(sha) not in fake.objects
+    finally:
+        object_store.set_client(None)
+
+
+def test_unreferenced_uploads_are_collected(monkeypatch):
+    SessionLocal, fake = _setup(monkeypatch)
+    from app.core.config import settings
+    from app.memory import blob_store, object_store
+    from app.models.tables import Blob, Document
+    from app.util.ids import new_uuid
+
+    tenant_id = new_uuid()
+    body = f"{tenant_id}\n" + "dolor sit amet " * 500
+    try:
+        with SessionLocal() as db:
+            doc = _doc(tenant_id, body)
+            db.add(doc)
+            db.commit()
+
+            # Object store down: the text stays inline; the reserved row holds no reference.
+            fake.down = True
+            assert blob_store.offload_document(db, doc.id) is False
+            db.refresh(doc)
+            assert doc.content_text == body and doc.object_key is None
+            assert blob_store.document_text(doc) == body
+
+            # The upload succeeds but the document changed before the reference was taken: the object is
+            # orphaned, and GC removes it with its unreferenced row.
+            fake.down = False
+            monkeypatch.setattr(blob_store, "_upload_down_until", 0.0)
+            real_upload = blob_store._upload
+
+            def upload_then_edit(key, data):
+                ok = real_upload(key, data)
+                with SessionLocal() as other:
+                    other.get(Document, doc.id).content_text = "rewritten"
+                    other.commit()
+                return ok
+
+            monkeypatch.setattr(blob_store, "_upload", upload_then_edit)
+            assert blob_store.offload_document(db, doc.id) is False
+            sha = blob_store.blob_sha256(fake.puts[-1])
+            assert db.get(Blob, sha).refcount == 0
+
+            monkeypatch.setattr(settings, "BLOB_GC_GRACE_SECONDS", 0.0)
+            blob_store.gc_blobs(db)
+            assert db.get(Blob, sha) is None and fake.puts[-1] not in fake.objects
+    finally:
+        object_store.set_client(None)
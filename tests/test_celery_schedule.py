@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+
+def test_beat_schedule_and_queue_routes(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.core import celery_app
+    from app.core.config import settings
+
+    routes = celery_app.celery.conf.task_routes
+    assert routes["app.tasks.jarvis_tasks.dispatch_outbox"]["queue"] == "dispatch"
+    assert routes["app.tasks.jarvis_tasks.process_pending_actions"]["queue"] == "executor"
+    assert routes["app.tasks.grant_tasks.run_grants_workflow_task"]["queue"] == "workflow"
+    assert {q.name for q in celery_app.celery.conf.task_queues} == set(celery_app.QUEUES)
+
+    # Every scheduled task exists and is routed to a declared queue.
+    celery_app.celery.loader.import_default_modules()
+    schedule = celery_app.build_beat_schedule()
+    for entry in schedule.values():
+        assert entry["task"] in celery_app.celery.tasks
+        assert routes[entry["task"]]["queue"] in celery_app.QUEUES
+        assert entry["options"]["expires"] == entry["schedule"]
+
+    # Late acks only for leased, idempotent tasks; the grants workflow is acked on receipt.
+    tasks = celery_app.celery.tasks
+    assert tasks["app.tasks.jarvis_tasks.dispatch_outbox"].acks_late is True
+    assert tasks["app.tasks.jarvis_tasks.process_pending_actions"].acks_late is True
+    assert tasks["app.tasks.grant_tasks.run_grants_workflow_task"].acks_late is False
+    assert celery_app.celery.conf.broker_transport_options["visibility_timeout"] == (
+        settings.CELERY_VISIBILITY_TIMEOUT_SECONDS
+    )
+
+    monkeypatch.setattr(settings, "BEAT_BOOTSTRAP_REFRESH_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(settings, "BEAT_DISPATCH_INTERVAL_SECONDS", 2)
+    schedule = celery_app.build_beat_schedule()
+    assert "bootstrap-refresh" not in schedule
+    assert schedule["dispatch-tick"]["schedule"] == 2.0
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+def test_hashing_embedder_batches_are_normalised_and_semantic(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.memory.embeddings import HashingEmbedder, embed_batched
+
+    e = HashingEmbedder(256)
+    texts = [
+        "Grant application deadline for the marine biology project",
+        "The marine biology grant application is due next week",
+        "Telegram bot token rotation and chat allowlist",
+        "",
+    ]
+    vectors = e.embed(texts)
+    assert vectors.shape == (4, 256) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0) and not vectors[3].any()
+
+    # Batching does not change the result, and the vectors are stable across instances.
+    assert np.allclose(embed_batched(e, texts, batch_size=1), vectors)
+    assert np.allclose(HashingEmbedder(256).embed(texts[:1]), vectors[:1])
+
+    sims = vectors[:3] @ vectors[0]
+    assert sims[1] > 0.3 > sims[2]
+    assert e.embed([]).shape == (0, 256)
+
+
+def test_backend_selection_collections_and_upsert(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    import pytest
+
+    from app.core.config import settings
+    from app.memory import embeddings, vector_store
+    from app.memory.embeddings import CallableEmbedder, HashingEmbedder
+
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "hashing")
+    monkeypatch.setattr(settings, "EMBEDDING_DIM", 64)
+    embeddings.set_embedder(None)
+
+    class _FakeQdrant:
+        def __init__(self):
+            self.created: dict[str, int] = {}
+            self.upserts: list[tuple[str, list]] = []
+
+        def get_collections(self):
+            return type("R", (), {"collections": [type("C", (), {"name": n})() for n in self.created]})()
+
+        def create_collection(self, *, collection_name, vectors_config):
+            self.created[collection_name] = vectors_config.size
+
+        def upsert(self, *, collection_name, points):
+            self.upserts.append((collection_name, points))
+
+        def close(self):
+            pass
+
+    fake = _FakeQdrant()
+    vector_store.set_client(fake)
+    try:
+        assert isinstance(embeddings.get_embedder(), HashingEmbedder)
+        assert embeddings.collection_name() == "memory_hashing_64"
+
+        n = vector_store.index_document_texts(
+            tenant_id="t1",
+            docs=[
+                {"doc_id": "d1", "domain": "sot", "source_type": "next", "text": "ship the weekly review"},
+                {"doc_id": "d2", "domain": "sot", "source_type": "empty", "text": ""},
+            ],
+        )
+        assert n == 1 and fake.created == {"memory_hashing_64": 64}
+        collection, points = fake.upserts[-1]
+        assert collection == "memory_hashing_64" and [p.id for p in points] == ["d1"]
+        assert len(points[0].vector) == 64 and points[0].payload["tenant_id"] == "t1"
+
+        # A plain batch callable is wrapped, normalised and checked against EMBEDDING_DIM.
+        monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "tests.test_embeddings:constant_model")
+        e = embeddings.build_embedder()
+        assert isinstance(e, CallableEmbedder) and embeddings.collection_name(e) == "memory_constant_model_64"
+        assert np.allclose(e.embed(["a", "b"]), 0.125)
+        with pytest.raises(ValueError):
+            CallableEmbedder(constant_model, dim=32).embed(["a"])
+    finally:
+        vector_store.set_client(None)
+        embeddings.set_embedder(None)
+
+
+def constant_model(texts: list[str]) -> list[list[float]]:
+    return [[1.0] * 64 for _ in texts]
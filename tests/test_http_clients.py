@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _serve(delay_s: float = 0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            time.sleep(delay_s)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", "11")
+            self.end_headers()
+            self.wfile.write(b'{"ok":true}')
+
+        def log_message(self, format, *args):
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_shared_client_reuses_connections_and_reports_metrics(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.integrations import http_clients
+
+    server = _serve()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        c = http_clients.get_client(base)
+        assert http_clients.get_client(base.rstrip("/")) is c
+
+        for _ in range(5):
+            assert c.post("/x", json={}).status_code == 200
+
+        m = http_clients.pool_metrics()[base.rstrip("/")]
+        assert m["requests"] == 5
+        assert m["connections_opened"] == 1
+        assert m["connections_reused"] == 4
+        assert m["connections_open"] == 1
+        assert m["failed"] == 0 and m["waited"] == 0
+
+        http_clients.close_all()
+        assert http_clients.get_client(base) is not c
+    finally:
+        http_clients.close_all()
+        server.shutdown()
+        server.server_close()
+
+
+def test_pool_wait_is_measured_apart_from_the_request_and_failures_counted(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    import httpx
+    import pytest
+
+    from app.core.config import settings
+    from app.integrations import http_clients
+
+    monkeypatch.setattr(settings, "HTTP_POOL_MAX_CONNECTIONS", 1)
+    server = _serve(delay_s=0.2)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        c = http_clients.get_client(base)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            codes = list(pool.map(lambda _: c.post("/x", json={}).status_code, range(2)))
+        assert codes == [200, 200]
+
+        m = http_clients.pool_metrics()[base]
+        assert (m["requests"], m["connections_opened"], m["connections_reused"]) == (2, 1, 1)
+        # Only the second request waited, for about one request's duration (not both requests' durations).
+        assert m["waited"] == 1
+        assert 0.15 < m["wait_seconds"] < 0.35
+
+        server.shutdown()
+        server.server_close()
+        http_clients.close_all()
+        c = http_clients.get_client(base)
+        with pytest.raises(httpx.ConnectError):
+            c.post("/x", json={})
+        m = http_clients.pool_metrics()[base]
+        assert (m["requests"], m["failed"], m["connections_reused"]) == (3, 1, 1)
+    finally:
+        http_clients.close_all()
+        server.server_close()
@@ -101,3 +101,76 @@ def test_pending_action_approve_requires_token(client: TestClient):
     assert pending.status_code == 200
     ids = [x["id"] for x in pending.json()["items"]]
     assert action_id not in ids
+
+
+def test_pending_actions_paginate_and_bulk_decide(client: TestClient):
+    from datetime import timedelta
+
+    from app.core.db import SessionLocal
+    from app.models.tables import PendingAction
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    base = now_utc()
+    ids = [new_uuid() for _ in range(6)]
+    with SessionLocal() as db:
+        for i, action_id in enumerate(ids):
+            db.add(
+                PendingAction(
+                    id=action_id,
+                    tenant_id=client.headers["X-Tenant-Id"],
+                    user_id=None,
+                    risk_level="RED",
+                    action_type="outbox.send",
+                    payload={"n": i},
+                    status="PENDING",
+                    confirmation_token_hash=_hash_token(f"tok-{i}"),
+                    created_at=base + timedelta(seconds=i),
+                    decided_at=None,
+                )
+            )
+        db.commit()
+
+    first = client.get("/actions/pending", params={"limit": 4}).json()
+    second = client.get("/actions/pending", params={"limit": 4, "cursor": first["next_cursor"]}).json()
+    assert [x["id"] for x in first["items"] + second["items"]] == ids
+    assert second["next_cursor"] is None
+
+    r = client.post(
+        "/actions/bulk",
+        json={
+            "decision": "approve",
+            "items": [
+                {"id": ids[0], "confirmation_token": "tok-0"},
+                {"id": ids[1], "confirmation_token": "wrong"},
+                {"id": ids[2]},
+                {"id": "missing", "confirmation_token": "x"},
+                {"id": ids[3], "confirmation_token": "tok-3"},
+            ],
+        },
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert body["updated"] == 2
+    assert [(x["ok"], x.get("error")) for x in body["results"]] == [
+        (True, None),
+        (False, "invalid_confirmation_token"),
+        (False, "missing_confirmation_token"),
+        (False, "not_found"),
+        (True, None),
+    ]
+
+    r = client.post("/actions/bulk", json={"decision": "reject", "items": [{"id": ids[0]}, {"id": ids[4]}]})
+    assert [(x["ok"], x.get("error")) for x in r.json()["results"]] == [(False, "not_pending:APPROVED"), (True, None)]
+
+    # A duplicated id fails on every copy, even when one copy carries the right token.
+    items = [{"id": ids[5], "confirmation_token": "tok-5"}, {"id": ids[5], "confirmation_token": "wrong"}]
+    body = client.post("/actions/bulk", json={"decision": "approve", "items": items}).json()
+    assert body["updated"] == 0
+    assert [(x["ok"], x.get("error")) for x in body["results"]] == [(False, "duplicate_id"), (False, "duplicate_id")]
+
+    with SessionLocal() as db:
+        statuses = {a.id: a.status for a in db.query(PendingAction).filter(PendingAction.id.in_(ids))}
+    assert [statuses[i] for i in ids] == ["APPROVED", "PENDING", "PENDING", "APPROVED", "REJECTED", "PENDING"]
+
+    assert client.post("/actions/bulk", json={"decision": "maybe", "items": [{"id": ids[1]}]}).status_code == 400
@@ -104,3 +104,95 @@ def test_context_version_stable_and_changes_on_file_change(client: TestClient):
 
     r3 = client.post("/memory/bootstrap").json()
     assert r3["context_version"] != r2["context_version"]
+
+
+def test_bootstrap_freshness_is_cached_and_invalidated_by_refresh(client: TestClient):
+    from sqlalchemy import event
+
+    from app.core.db import SessionLocal, engine
+    from app.memory.bootstrap import check_bootstrap_fresh, refresh_bootstrap
+
+    tenant_id = client._tenant_id  # type: ignore[attr-defined]
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        with SessionLocal() as db:
+            ok, _, reason = check_bootstrap_fresh(db, tenant_id=tenant_id)
+            assert ok is False
+            assert reason.startswith("missing_required_documents")
+            # One windowed query for all SoT doc types.
+            assert len(statements) == 1
+
+            for _ in range(10):
+                check_bootstrap_fresh(db, tenant_id=tenant_id)
+            assert len(statements) == 1
+
+            refresh_bootstrap(db, tenant_id=tenant_id, user_id="u1")
+            ok, context_version, reason = check_bootstrap_fresh(db, tenant_id=tenant_id)
+            assert ok is True
+            assert reason == "ok"
+            assert context_version
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+def test_bootstrap_cache_follows_version_stamp_across_processes(client: TestClient, monkeypatch):
+    import time
+
+    import fakeredis
+
+    from app.core.config import settings
+    from app.core.db import SessionLocal
+    from app.memory import bootstrap
+
+    tenant_id = client._tenant_id  # type: ignore[attr-defined]
+    window = 0.2
+    monkeypatch.setattr(settings, "BOOTSTRAP_CACHE_TTL_SECONDS", 3600.0)
+    monkeypatch.setattr(settings, "BOOTSTRAP_CACHE_STAMP_CHECK_SECONDS", window)
+    fake = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+    bootstrap.set_redis(fake)
+
+    loads: list[str] = []
+    real_status = bootstrap.bootstrap_status
+
+    def counting_status(db, *, tenant_id):
+        loads.append(tenant_id)
+        return real_status(db, tenant_id=tenant_id)
+
+    monkeypatch.setattr(bootstrap, "bootstrap_status", counting_status)
+    try:
+        with SessionLocal() as db:
+            assert bootstrap.check_bootstrap_fresh(db, tenant_id=tenant_id)[0] is False
+            assert bootstrap.check_bootstrap_fresh(db, tenant_id=tenant_id)[0] is False
+            assert len(loads) == 1
+
+            # Another process refreshes: it writes the documents and bumps the stamp, but never touches our
+            # cache. Within the window the stale snapshot is served; after it the moved stamp forces a reload.
+            bootstrap.refresh_bootstrap(db, tenant_id=tenant_id, user_id="u1")
+            assert fake.get(bootstrap._stamp_key(tenant_id)) == b"1"
+            with bootstrap._cache_lock:
+                bootstrap._snapshots[tenant_id] = bootstrap._BootstrapSnapshot(
+                    present=frozenset(),
+                    context_version=None,
+                    refreshed_at=None,
+                    stamp=None,
+                    checked_until=time.monotonic() + window,
+                    expires_at=time.monotonic() + 3600.0,
+                )
+            assert bootstrap.check_bootstrap_fresh(db, tenant_id=tenant_id)[0] is False
+            time.sleep(window * 2)
+            ok, context_version, _ = bootstrap.check_bootstrap_fresh(db, tenant_id=tenant_id)
+            assert ok is True and context_version
+            assert len(loads) == 2
+
+            # An unchanged stamp extends the snapshot without reloading it.
+            time.sleep(window * 2)
+            assert bootstrap.check_bootstrap_fresh(db, tenant_id=tenant_id)[0] is True
+            assert len(loads) == 2
+    finally:
+        bootstrap.set_redis(None)
+        bootstrap.invalidate_bootstrap_cache()
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import threading
+import time
+
+
+class _FakeMinio:
+    """In-memory stand-in for the Minio client (bucket checks and put_object only)."""
+
+    def __init__(self, *, delay_s: float = 0.0):
+        self.delay_s = delay_s
+        self.lock = threading.Lock()
+        self.buckets: set[str] = set()
+        self.objects: dict[str, bytes] = {}
+        self.bucket_checks = 0
+        self.inflight = 0
+        self.max_inflight = 0
+        self.drop_bucket_once = False
+
+    def bucket_exists(self, bucket):
+        with self.lock:
+            self.bucket_checks += 1
+            return bucket in self.buckets
+
+    def make_bucket(self, bucket):
+        with self.lock:
+            self.buckets.add(bucket)
+
+    def put_object(self, bucket, key, data, length, content_type):
+        from minio.error import S3Error
+
+        with self.lock:
+            if self.drop_bucket_once:
+                self.drop_bucket_once = False
+                self.buckets.discard(bucket)
+            if bucket not in self.buckets:
+                raise S3Error("NoSuchBucket", "The specified bucket does not exist", f"/{bucket}", None, None, None)
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            time.sleep(self.delay_s)
+            body = data.read()
+            assert len(body) == length
+        finally:
+            with self.lock:
+                self.inflight -= 1
+                self.objects[key] = body
+
+
+class _Response:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.closed = False
+        self.released = False
+
+    def stream(self, amt):
+        for i in range(0, len(self.data), amt):
+            yield self.data[i : i + amt]
+
+    def close(self):
+        self.closed = True
+
+    def release_conn(self):
+        self.released = True
+
+
+class _StreamingMinio(_FakeMinio):
+    """Adds minio's unknown-length put_object behaviour (part-sized reads), get_object and copy_object."""
+
+    def __init__(self):
+        super().__init__()
+        self.put_calls: list[dict] = []
+        self.max_read = 0
+        self.responses: list[_Response] = []
+
+    def put_object(self, bucket, key, data, length, content_type, part_size=0, num_parallel_uploads=3):
+        self.put_calls.append({"length": length, "part_size": part_size, "num_parallel_uploads": num_parallel_uploads})
+        parts = []
+        while True:
+            chunk = data.read(part_size)
+            self.max_read = max(self.max_read, len(chunk))
+            if not chunk:
+                break
+            parts.append(chunk)
+        self.objects[key] = b"".join(parts)
+        return type("Result", (), {"etag": "etag-1"})()
+
+    def get_object(self, bucket, key, offset=0, length=0):
+        data = self.objects[key][offset : offset + length if length else None]
+        self.responses.append(_Response(data))
+        return self.responses[-1]
+
+    def copy_object(self, bucket, dest, source):
+        self.objects[dest] = self.objects[source.object_name]
+
+
+def test_put_reuses_client_and_memoizes_bucket_check(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.memory import object_store
+
+    fake = _FakeMinio()
+    object_store.set_client(fake)
+    try:
+        for i in range(5):
+            assert object_store.put_text(object_key=f"k{i}", text=f"v{i}") == f"k{i}"
+        assert object_store._client() is fake
+        assert fake.bucket_checks == 1
+        assert fake.objects["k3"] == b"v3"
+
+        # A bucket removed underneath us is recreated on the retry instead of failing until the TTL expires.
+        fake.drop_bucket_once = True
+        object_store.put_bytes(object_key="after-drop", data=b"x", best_effort=False)
+        assert fake.objects["after-drop"] == b"x"
+        assert fake.bucket_checks == 2
+    finally:
+        object_store.set_client(None)
+
+
+def test_put_many_uploads_concurrently_in_order(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.core.config import settings
+    from app.memory import object_store
+    from app.memory.object_store import PutObject
+
+    monkeypatch.setattr(settings, "MINIO_PUT_WORKERS", 4)
+    fake = _FakeMinio(delay_s=0.05)
+    object_store.set_client(fake)
+    try:
+        objects = [PutObject(object_key=f"o{i}", data=str(i).encode(), content_type="text/plain") for i in range(8)]
+        started = time.perf_counter()
+        keys = object_store.put_many(objects, best_effort=False)
+        elapsed = time.perf_counter() - started
+
+        assert keys == [f"o{i}" for i in range(8)]
+        assert {k: fake.objects[k] for k in keys} == {f"o{i}": str(i).encode() for i in range(8)}
+        assert fake.max_inflight == 4
+        assert elapsed < 8 * 0.05
+        assert fake.bucket_checks == 1
+
+        # One thread pool per process, reused across calls and shut down with the client.
+        pool = object_store._put_executor()
+        object_store.put_many(objects[:2], best_effort=False)
+        assert object_store._put_executor() is pool
+    finally:
+        object_store.close_client()
+    assert object_store._put_pool is None
+
+
+def test_streaming_put_get_range_and_copy(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    import hashlib
+    import io
+
+    from app.memory import object_store
+    from app.outbox.attachments import open_attachment, store_attachment
+
+    fake = _StreamingMinio()
+    object_store.set_client(fake)
+    try:
+        data = bytes(range(256)) * 4096  # 1 MiB
+        stored = object_store.put_stream(object_key="big.bin", stream=io.BytesIO(data), part_size=64 * 1024)
+        assert stored.size_bytes == len(data)
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert stored.etag == "etag-1"
+        assert fake.put_calls[-1] == {"length": -1, "part_size": 64 * 1024, "num_parallel_uploads": 1}
+        assert fake.max_read == 64 * 1024
+
+        chunks = list(object_store.get_stream("big.bin", chunk_size=100_000))
+        assert b"".join(chunks) == data and max(len(c) for c in chunks) == 100_000
+        assert fake.responses[-1].closed and fake.responses[-1].released
+
+        assert object_store.get_range("big.bin", offset=1000, length=10) == data[1000:1010]
+        assert object_store.copy_object(source_key="big.bin", dest_key="copy.bin") == "copy.bin"
+        assert fake.objects["copy.bin"] == data
+
+        ref = store_attachment(tenant_id="t1", stream=io.BytesIO(b"%PDF-1.7 manuscript"), filename="paper/v2.pdf")
+        assert ref.object_key.startswith("t1/attachments/") and ref.object_key.endswith("/paper_v2.pdf")
+        assert ref.size_bytes == 19 and ref.sha256 == hashlib.sha256(b"%PDF-1.7 manuscript").hexdigest()
+        assert b"".join(open_attachment(ref)) == b"%PDF-1.7 manuscript"
+    finally:
+        object_store.set_client(None)
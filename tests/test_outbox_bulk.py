@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _telegram(chat: str, text: str, *, key: str = "") -> dict:
+    return {
+        "schema": "clowbot.outbox.v1",
+        "kind": "telegram",
+        "idempotency_key": key,
+        "context": {"source": "test"},
+        "policy": {"risk": "YELLOW", "requires_approval": False, "allowlist": {"telegram_chats": []}},
+        "message": {"chat": {"chat_id": chat, "username": None}, "text": text},
+        "attachments": [],
+    }
+
+
+def test_bulk_create_returns_ids_and_policy_per_item(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Document, OutboxMessage, Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    import app.main
+
+    Base.metadata.create_all(bind=engine)
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        db.add(
+            Document(
+                id=new_uuid(),
+                tenant_id=tenant_id,
+                workflow_id=None,
+                domain="policy",
+                doc_type="policy_allowlist",
+                title="policy_allowlist",
+                content_text=None,
+                object_key=None,
+                meta={"allowlist": {"telegram_chats": ["100"]}},
+                created_at=now_utc(),
+            )
+        )
+        db.commit()
+
+    client = TestClient(app.main.app)
+    client.headers.update({"X-Tenant-Id": tenant_id, "X-User-Id": "u1"})
+
+    messages = [
+        _telegram("100", "first"),
+        _telegram("999", "not allowlisted"),
+        _telegram("100", "first"),  # same content -> same derived key as item 0
+        {"schema": "clowbot.outbox.v1", "kind": "telegram"},
+        _telegram("100", "third", key=f"{tenant_id}-k3"),
+    ]
+    r = client.post("/outbox/bulk", json={"messages": messages})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["created"] == 3 and body["failed"] == 1
+    res = body["results"]
+    assert [x["ok"] for x in res] == [True, True, True, False, True]
+    assert res[0]["created"] is True and res[0]["requires_approval"] is False
+    assert res[1]["requires_approval"] is True and res[1]["upgraded_to_red"] is True and res[1]["risk"] == "RED"
+    assert res[2]["id"] == res[0]["id"] and res[2]["created"] is False
+    assert "message" in res[3]["error"]
+    assert res[4]["idempotency_key"] == f"{tenant_id}-k3"
+
+    with SessionLocal() as db:
+        rows = (
+            db.query(OutboxMessage)
+            .filter(OutboxMessage.tenant_id == tenant_id)
+            .order_by(OutboxMessage.created_at.asc())
+            .all()
+        )
+        # Stored in request order with distinct timestamps (dispatcher sends per target in created_at order).
+        assert [m.id for m in rows] == [res[0]["id"], res[1]["id"], res[4]["id"]]
+        assert rows[1].status == "QUEUED" and rows[1].meta == {"policy_upgraded_to_red": True}
+        assert rows[1].payload["policy"]["requires_approval"] is True
+
+    # Resubmitting resolves every key to the existing rows, with their stored policy outcome.
+    again = client.post("/outbox/bulk", json={"messages": [messages[1], messages[4]]}).json()
+    assert again["created"] == 0
+    assert [x["id"] for x in again["results"]] == [res[1]["id"], res[4]["id"]]
+    assert again["results"][0]["requires_approval"] is True and again["results"][0]["created"] is False
+
+    assert client.post("/outbox/bulk", json={"messages": []}).status_code == 400
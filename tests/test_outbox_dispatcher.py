@@ -94,3 +94,106 @@ def test_outbox_dispatcher_is_idempotent(monkeypatch):
 
     assert out1["stub_sent"] == 1
     assert out2["stub_sent"] == 0
+
+
+def test_outbox_dispatcher_batches_per_tenant_and_isolates_failures(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import AuditLog, OutboxMessage, Tenant
+    from app.outbox import dispatcher, preview_store
+    from app.tasks.jarvis_tasks import dispatch_outbox
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+    from tests.utils_bootstrap import seed_min_bootstrap_docs
+
+    Base.metadata.create_all(bind=engine)
+
+    # Object store is best-effort; skip it to keep the test offline and fast.
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    allowlist_loads: list[str] = []
+    real_load = dispatcher.get_compiled_allowlist
+
+    def counting_load(db, *, tenant_id):
+        allowlist_loads.append(tenant_id)
+        return real_load(db, tenant_id=tenant_id)
+
+    monkeypatch.setattr(dispatcher, "get_compiled_allowlist", counting_load)
+
+    tenants = [new_uuid(), new_uuid()]
+    good_ids: list[str] = []
+    bad_id = new_uuid()
+    with SessionLocal() as db:
+        for tenant_id in tenants:
+            db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+            seed_min_bootstrap_docs(db, tenant_id=tenant_id)
+            for i in range(4):
+                msg_id = new_uuid()
+                good_ids.append(msg_id)
+                db.add(
+                    OutboxMessage(
+                        id=msg_id,
+                        tenant_id=tenant_id,
+                        user_id="u1",
+                        channel="email",
+                        to=f"x{i}@example.com",
+                        subject="Hello",
+                        body="Body",
+                        meta={},
+                        status="QUEUED",
+                        created_at=now_utc(),
+                        sent_at=None,
+                    )
+                )
+        db.add(
+            OutboxMessage(
+                id=bad_id,
+                tenant_id=tenants[0],
+                user_id="u1",
+                channel="telegram",
+                to="1",
+                subject=None,
+                body="b",
+                payload={"schema": "clowbot.outbox.v1", "kind": "telegram", "idempotency_key": "bad"},
+                meta={},
+                status="QUEUED",
+                created_at=now_utc(),
+                sent_at=None,
+            )
+        )
+        db.commit()
+
+    commits = {"n": 0}
+
+    def _count_commit(session):
+        commits["n"] += 1
+
+    event.listen(Session, "after_commit", _count_commit)
+    try:
+        out = dispatch_outbox(limit=50)
+    finally:
+        event.remove(Session, "after_commit", _count_commit)
+
+    assert out["stub_sent"] == len(good_ids)
+    assert out["failed"] == 1
+    assert commits["n"] == 2
+    assert sorted(allowlist_loads) == sorted(tenants)
+
+    with SessionLocal() as db:
+        statuses = {m.id: m.status for m in db.query(OutboxMessage).filter(OutboxMessage.tenant_id.in_(tenants))}
+        assert statuses[bad_id] == "FAILED"
+        assert all(statuses[i] == "STUB_SENT" for i in good_ids)
+
+        failed_audit = (
+            db.query(AuditLog)
+            .filter(AuditLog.tenant_id == tenants[0], AuditLog.event_type == "OUTBOX_FAILED")
+            .all()
+        )
+        assert [a.context["outbox_id"] for a in failed_audit] == [bad_id]
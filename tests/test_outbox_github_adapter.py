@@ -99,7 +99,7 @@ def test_outbox_github_real_send_mocked(monkeypatch):
 
     import httpx
 
-    def fake_post(url, headers=None, json=None, timeout=None):
+    def fake_post(self, url, headers=None, json=None, timeout=None):
         calls["n"] += 1
 
         class R:
@@ -112,7 +112,7 @@ def test_outbox_github_real_send_mocked(monkeypatch):
 
         return R()
 
-    monkeypatch.setattr(httpx, "post", fake_post)
+    monkeypatch.setattr(httpx.Client, "post", fake_post)
 
     from app.core.db import SessionLocal, engine
     from app.models.base import Base
@@ -194,7 +194,7 @@ def test_outbox_github_requires_approval_when_not_allowlisted(monkeypatch):
     def boom(*args, **kwargs):
         raise AssertionError("should not send when not allowlisted")
 
-    monkeypatch.setattr(httpx, "post", boom)
+    monkeypatch.setattr(httpx.Client, "post", boom)
 
     from app.core.db import SessionLocal, engine
     from app.models.base import Base
@@ -33,3 +33,72 @@ def test_outbox_idempotency_same_payload_returns_same_id(monkeypatch):
         id1 = create_outbox_message(db=db, tenant_id=tenant_id, user_id="u1", payload_dict=payload)
         id2 = create_outbox_message(db=db, tenant_id=tenant_id, user_id="u1", payload_dict=payload)
         assert id1 == id2
+
+
+def test_concurrent_submissions_of_one_payload_create_one_row(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    import threading
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.base import Base
+    from app.models.tables import OutboxMessage, Tenant
+    from app.outbox.service import create_outbox_message, create_outbox_messages_bulk
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    # A file database with one connection per thread (the shared in-memory test engine is a single
+    # connection, which cannot race).
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'race.db'}", connect_args={"timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    tenant_id = new_uuid()
+    with Session() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        db.commit()
+
+    payload = {
+        "schema": "clowbot.outbox.v1",
+        "kind": "telegram",
+        "idempotency_key": "",
+        "context": {"source": "test"},
+        "policy": {"risk": "YELLOW", "requires_approval": False, "allowlist": {"telegram_chats": ["95576236"]}},
+        "message": {"chat": {"chat_id": "95576236", "username": None}, "text": "race"},
+        "attachments": [],
+    }
+
+    threads_n, rounds = 16, 5
+    barrier = threading.Barrier(threads_n, timeout=30)
+    ids: list[str] = []
+    errors: list[BaseException] = []
+
+    def submit(n: int) -> None:
+        try:
+            for _ in range(rounds):
+                barrier.wait()
+                with Session() as db:
+                    if n % 2:
+                        ids.append(create_outbox_message(db=db, tenant_id=tenant_id, user_id="u1", payload_dict=payload))
+                    else:
+                        (res,) = create_outbox_messages_bulk(db=db, tenant_id=tenant_id, user_id="u1", payload_dicts=[payload])
+                        ids.append(res.id)
+        except BaseException as e:  # noqa: BLE001 - surfaced by the assertion below
+            errors.append(e)
+            barrier.abort()  # release the other threads instead of leaving them waiting
+
+    workers = [threading.Thread(target=submit, args=(n,)) for n in range(threads_n)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    assert errors == []
+    assert len(ids) == threads_n * rounds and len(set(ids)) == 1
+    with Session() as db:
+        assert db.query(OutboxMessage).filter(OutboxMessage.tenant_id == tenant_id).count() == 1
+    engine.dispose()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+
+def _client(monkeypatch) -> tuple[TestClient, str]:
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import OutboxMessage, Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    import app.main
+
+    Base.metadata.create_all(bind=engine)
+
+    tenant_id = new_uuid()
+    base = now_utc()
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=base))
+        # Five rows share one timestamp: pagination must still be stable (id tiebreak).
+        for i in range(25):
+            db.add(
+                OutboxMessage(
+                    id=new_uuid(),
+                    tenant_id=tenant_id,
+                    user_id="u1",
+                    channel="telegram" if i % 2 else "email",
+                    to="x",
+                    subject=None,
+                    body=f"body {i}",
+                    payload={"big": "x" * 100},
+                    meta={},
+                    status="SENT" if i % 3 else "FAILED",
+                    created_at=base - timedelta(minutes=min(i, 20)),
+                    sent_at=None,
+                )
+            )
+        db.commit()
+
+    c = TestClient(app.main.app)
+    c.headers.update({"X-Tenant-Id": tenant_id, "X-User-Id": "u1"})
+    return c, tenant_id
+
+
+def test_outbox_keyset_pages_filters_and_projection(monkeypatch):
+    c, _ = _client(monkeypatch)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        r = c.get("/outbox", params={"limit": 7, "fields": "id,status", **({"cursor": cursor} if cursor else {})})
+        assert r.status_code == 200
+        data = r.json()
+        assert all(set(item) == {"id", "status"} for item in data["items"])
+        seen.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 25
+
+    full = c.get("/outbox").json()["items"]
+    assert [m["id"] for m in full] == seen  # same newest-first order as one big page
+    assert "payload" in full[0] and "body" in full[0]
+
+    failed_email = c.get("/outbox", params={"status": "FAILED", "channel": "email", "fields": "status,channel"}).json()
+    assert failed_email["items"] and all(m == {"status": "FAILED", "channel": "email"} for m in failed_email["items"])
+
+    newest = full[0]["created_at"]
+    recent = c.get("/outbox", params={"created_from": newest, "fields": "id"}).json()["items"]
+    assert [m["id"] for m in recent] == [full[0]["id"]]
+
+    assert c.get("/outbox", params={"fields": "id,secret"}).status_code == 400
+    assert c.get("/outbox", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_outbox_ndjson_export_streams_all_rows(monkeypatch):
+    c, _ = _client(monkeypatch)
+    from app.api.routers import outbox
+
+    monkeypatch.setattr(outbox, "EXPORT_CHUNK", 4)
+
+    r = c.get("/outbox", params={"format": "ndjson", "fields": "id,channel", "order": "asc"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert len(rows) == 25 and len({row["id"] for row in rows}) == 25
+    assert set(rows[0]) == {"id", "channel"}
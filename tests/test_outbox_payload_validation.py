@@ -20,9 +20,50 @@ def test_valid_email_payload_validates():
         },
         "attachments": [],
     }
-    payload["idempotency_key"] = compute_idempotency_key(payload)
     obj = TypeAdapter(OutboxPayloadV1).validate_python(payload)
     assert obj.kind == "email"
+    assert compute_idempotency_key(obj).startswith("sha256:")
+
+
+def test_idempotency_key_covers_content_not_volatile_fields():
+    adapter = TypeAdapter(OutboxPayloadV1)
+
+    def key(**overrides) -> str:
+        message = {
+            "to": [{"email": "a@b.com"}, {"email": "c@d.com"}],
+            "subject": "S",
+            "body": {"text": "Hi " * 10000},
+        }
+        message.update(overrides.pop("message", {}))
+        payload = {
+            "kind": "email",
+            "context": {"source": "test", "trace_id": "t1"},
+            "policy": {"risk": "YELLOW"},
+            "message": message,
+            "attachments": [
+                {"id": "1", "filename": "a.pdf", "content_type": "application/pdf", "object_key": "k1", "sha256": "aa"},
+                {"id": "2", "filename": "b.pdf", "content_type": "application/pdf", "object_key": "k2", "sha256": "bb"},
+            ],
+        }
+        payload.update(overrides)
+        return compute_idempotency_key(adapter.validate_python(payload))
+
+    base = key()
+    # Volatile / non-content fields and ordering do not matter.
+    assert key(context={"source": "other", "trace_id": "t2"}) == base
+    assert key(policy={"risk": "RED", "requires_approval": True}) == base
+    assert key(message={"to": [{"email": "C@d.com ", "name": "C"}, {"email": "a@b.com"}]}) == base
+    reordered = [
+        {"id": "9", "filename": "b.pdf", "content_type": "application/pdf", "object_key": "k2", "sha256": "bb"},
+        {"id": "8", "filename": "a.pdf", "content_type": "application/pdf", "object_key": "k1", "sha256": "aa"},
+    ]
+    assert key(attachments=reordered) == base
+    # Target, content and attachment content do.
+    assert key(message={"to": [{"email": "a@b.com"}]}) != base
+    assert key(message={"cc": [{"email": "c@d.com"}], "to": [{"email": "a@b.com"}]}) != base
+    assert key(message={"subject": "S2"}) != base
+    assert key(message={"body": {"text": "Hi " * 10000, "html": "<p>Hi</p>"}}) != base
+    assert key(attachments=[]) != base
 
 
 def test_invalid_payload_fails():
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+
+def _telegram(chat: str, text: str) -> dict:
+    return {
+        "schema": "clowbot.outbox.v1",
+        "kind": "telegram",
+        "idempotency_key": "",
+        "context": {"source": "test"},
+        "policy": {"risk": "YELLOW", "requires_approval": False, "allowlist": {"telegram_chats": [chat]}},
+        "message": {"chat": {"chat_id": chat, "username": None}, "text": text},
+        "attachments": [],
+    }
+
+
+def _setup(monkeypatch, *, mode: str):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    import app.main
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Tenant
+    from app.outbox import preview_store
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+    from tests.utils_bootstrap import seed_min_bootstrap_docs
+
+    monkeypatch.setattr(settings, "OUTBOX_PREVIEW_MODE", mode)
+    monkeypatch.setattr(settings, "TELEGRAM_BOT_TOKEN", None)
+    Base.metadata.create_all(bind=engine)
+
+    uploads: list[str] = []
+
+    def put_many(objects, *, best_effort):
+        uploads.extend(o.object_key for o in objects)
+        return [o.object_key for o in objects]
+
+    monkeypatch.setattr(preview_store, "put_many", put_many)
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        seed_min_bootstrap_docs(db, tenant_id=tenant_id)
+        db.commit()
+
+    client = TestClient(app.main.app)
+    client.headers.update({"X-Tenant-Id": tenant_id, "X-User-Id": "u1"})
+    return tenant_id, client, uploads
+
+
+def _previews(tenant_id: str) -> list:
+    from app.core.db import SessionLocal
+    from app.models.tables import Document
+
+    with SessionLocal() as db:
+        return db.query(Document).filter(Document.tenant_id == tenant_id, Document.doc_type == "outbox_preview").all()
+
+
+def test_preview_artifacts_are_content_addressed_and_uploaded_once(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.models.tables import OutboxMessage
+    from app.outbox import preview_store
+    from app.util.ids import new_uuid
+
+    calls: list[str] = []
+    failing = {"on": True}
+
+    def put_many(objects, *, best_effort):
+        assert best_effort is False
+        calls.extend(o.object_key for o in objects)
+        if failing["on"]:
+            raise OSError("minio down")
+        return [o.object_key for o in objects]
+
+    monkeypatch.setattr(preview_store, "put_many", put_many)
+
+    tenant_id = new_uuid()
+    payload = preview_store.payload_adapter.validate_python(_telegram("100", "same text"))
+    rows = [OutboxMessage(id=new_uuid(), tenant_id=tenant_id, to="100") for _ in range(3)]
+
+    # A failed upload is not remembered: the next row with the same payload uploads again.
+    doc0, meta0 = preview_store.build_preview(row=rows[0], payload=payload, status="SENDING")
+    assert len(calls) == 2
+    failing["on"] = False
+    doc1, meta1 = preview_store.build_preview(row=rows[1], payload=payload, status="SENDING")
+    doc2, meta2 = preview_store.build_preview(row=rows[2], payload=payload, status="SENDING")
+    assert len(calls) == 4  # the failed attempt, then both artifacts once
+
+    sha = preview_store.payload_sha256(payload)
+    assert meta0["object_keys"] == meta1["object_keys"] == meta2["object_keys"] == {
+        "preview.json": f"{tenant_id}/outbox/previews/{sha}/preview.json",
+        "preview_payload_json": f"{tenant_id}/outbox/previews/{sha}/preview_payload.json",
+    }
+    # The markdown preview stays per row.
+    assert len({doc0.id, doc1.id, doc2.id}) == 3
+    assert rows[2].id in doc2.content_text and rows[1].id not in doc2.content_text
+
+    other = preview_store.payload_adapter.validate_python(_telegram("100", "other text"))
+    assert preview_store.payload_sha256(other) != sha
+
+
+def test_lazy_mode_renders_preview_on_first_view(monkeypatch):
+    tenant_id, client, uploads = _setup(monkeypatch, mode="lazy")
+    from app.core.db import SessionLocal
+    from app.models.tables import OutboxMessage
+    from app.tasks.jarvis_tasks import dispatch_outbox
+
+    r = client.post("/outbox/bulk", json={"messages": [_telegram("100", "hello")]})
+    outbox_id = r.json()["results"][0]["id"]
+
+    assert dispatch_outbox(limit=100)["stub_sent"] >= 1
+    with SessionLocal() as db:
+        m = db.get(OutboxMessage, outbox_id)
+        assert m.status == "STUB_SENT"
+        assert m.meta["preview"] == {"mode": "lazy"}
+    assert _previews(tenant_id) == [] and uploads == []
+
+    r = client.get(f"/outbox/{outbox_id}/preview")
+    assert r.status_code == 200
+    body = r.json()
+    assert 'status: "STUB_SENT"' in body["preview_md"] and outbox_id in body["preview_md"]
+    assert set(body["object_keys"]) == {"preview.json", "preview_payload_json"}
+    assert len(uploads) == 2
+
+    again = client.get(f"/outbox/{outbox_id}/preview").json()
+    assert again["document_id"] == body["document_id"]
+    assert len(_previews(tenant_id)) == 1 and len(uploads) == 2
+
+    assert client.get("/outbox/missing/preview").status_code == 404
+
+
+def test_async_mode_renders_previews_after_commit(monkeypatch):
+    tenant_id, client, uploads = _setup(monkeypatch, mode="async")
+    from app.core.celery_app import celery
+    from app.core.db import SessionLocal
+    from app.models.tables import OutboxMessage
+    from app.tasks.jarvis_tasks import dispatch_outbox
+
+    monkeypatch.setattr(celery.conf, "task_always_eager", True)
+
+    r = client.post("/outbox/bulk", json={"messages": [_telegram("100", "a"), _telegram("200", "b")]})
+    ids = [x["id"] for x in r.json()["results"]]
+
+    assert dispatch_outbox(limit=100)["stub_sent"] >= 2
+    docs = {d.meta["outbox_id"]: d for d in _previews(tenant_id)}
+    assert set(docs) == set(ids)
+    with SessionLocal() as db:
+        for outbox_id in ids:
+            m = db.get(OutboxMessage, outbox_id)
+            assert m.meta["preview"]["document_id"] == docs[outbox_id].id
+            assert 'status: "STUB_SENT"' in docs[outbox_id].content_text
+    assert len(uploads) == 4
+
+
+def test_preview_view_interleaved_with_dispatch_is_not_cached_until_final(monkeypatch):
+    tenant_id, client, uploads = _setup(monkeypatch, mode="lazy")
+    from app.core.db import SessionLocal
+    from app.models.tables import OutboxMessage
+    from app.outbox import preview_store
+    from app.tasks.jarvis_tasks import dispatch_outbox
+
+    r = client.post("/outbox/bulk", json={"messages": [_telegram("100", "hello")]})
+    outbox_id = r.json()["results"][0]["id"]
+
+    # A view of a QUEUED row renders the preview but does not store it.
+    body = client.get(f"/outbox/{outbox_id}/preview").json()
+    assert 'status: "QUEUED"' in body["preview_md"]
+    assert _previews(tenant_id) == []
+
+    # The dispatcher sends and commits while a view is rendering from its stale copy of the row.
+    upload = preview_store.put_many
+    dispatched: list[dict] = []
+
+    def put_many_then_dispatch(objects, *, best_effort):
+        if not dispatched:
+            dispatched.append(dispatch_outbox(limit=100))
+        return upload(objects, best_effort=best_effort)
+
+    monkeypatch.setattr(preview_store, "put_many", put_many_then_dispatch)
+    preview_store.reset_upload_cache()
+    with SessionLocal() as db:
+        stale = db.get(OutboxMessage, outbox_id)
+        assert stale.status == "QUEUED"
+        doc, _ = preview_store.ensure_preview(db, stale)
+        assert 'status: "QUEUED"' in doc.content_text
+    assert dispatched[0]["stub_sent"] >= 1
+
+    with SessionLocal() as db:
+        m = db.get(OutboxMessage, outbox_id)
+        assert m.status == "STUB_SENT"
+        sent_meta = dict(m.meta)
+    assert sent_meta["preview"] == {"mode": "lazy"}
+    assert _previews(tenant_id) == []
+
+    # Once final, the first view stores the preview and keeps everything the dispatcher wrote.
+    body = client.get(f"/outbox/{outbox_id}/preview").json()
+    assert 'status: "STUB_SENT"' in body["preview_md"]
+    with SessionLocal() as db:
+        meta = db.get(OutboxMessage, outbox_id).meta
+    assert meta["preview"]["document_id"] == body["document_id"]
+    assert {k: v for k, v in meta.items() if k != "preview"} == {k: v for k, v in sent_meta.items() if k != "preview"}
+    assert [d.id for d in _previews(tenant_id)] == [body["document_id"]]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import fakeredis
+
+
+def test_token_bucket_limits_per_target(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.outbox.rate_limit import RateLimit, TokenBucketLimiter, parse_rate_limits
+
+    assert parse_rate_limits("telegram=1:3, github_issue=0.5:5,bad") == {
+        "telegram": RateLimit(rate=1.0, burst=3),
+        "github_issue": RateLimit(rate=0.5, burst=5),
+    }
+
+    limiter = TokenBucketLimiter(fakeredis.FakeRedis(), limits={"telegram": RateLimit(rate=0.1, burst=2)})
+
+    got = [limiter.acquire(channel="telegram", tenant_id="t1", target="100") for _ in range(3)]
+    assert [d.allowed for d in got] == [True, True, False]
+    assert got[-1].retry_after_s > 0
+
+    # Separate buckets per target and per tenant; unlimited channels always pass.
+    assert limiter.acquire(channel="telegram", tenant_id="t1", target="200").allowed
+    assert limiter.acquire(channel="telegram", tenant_id="t2", target="100").allowed
+    assert all(limiter.acquire(channel="email", tenant_id="t1", target="x").allowed for _ in range(10))
+
+
+def test_dispatcher_defers_rows_over_budget(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TELEGRAM_BOT_TOKEN", "tg-token")
+    monkeypatch.setattr(settings, "TELEGRAM_ALLOWLIST_CHATS", "100")
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import AuditLog, OutboxMessage, Tenant
+    from app.outbox import dispatcher, preview_store, rate_limit
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+    from tests.utils_bootstrap import seed_min_bootstrap_docs
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    sent_texts: list[str] = []
+
+    def fake_send_message(*, token, chat_id, text, parse_mode=None, disable_preview=True):
+        sent_texts.append(text)
+        return {"ok": True, "result": {"message_id": len(sent_texts)}}
+
+    monkeypatch.setattr(dispatcher, "send_message", fake_send_message)
+
+    limiter = rate_limit.TokenBucketLimiter(
+        fakeredis.FakeRedis(), limits={"telegram": rate_limit.RateLimit(rate=0.01, burst=2)}
+    )
+    rate_limit.set_limiter(limiter)
+    monkeypatch.setattr(settings, "OUTBOX_RATE_LIMIT_ENABLED", True)
+
+    tenant_id = new_uuid()
+    ids: list[str] = []
+    try:
+        with SessionLocal() as db:
+            db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+            seed_min_bootstrap_docs(db, tenant_id=tenant_id)
+            for i in range(5):
+                key = f"{tenant_id}-{i}"
+                ids.append(new_uuid())
+                db.add(
+                    OutboxMessage(
+                        id=ids[-1],
+                        tenant_id=tenant_id,
+                        user_id="u1",
+                        channel="telegram",
+                        to="100",
+                        subject=None,
+                        body=f"m{i}",
+                        payload={
+                            "kind": "telegram",
+                            "idempotency_key": key,
+                            "policy": {"allowlist": {"telegram_chats": ["100"]}},
+                            "message": {"chat": {"chat_id": "100"}, "text": f"m{i}"},
+                        },
+                        idempotency_key=key,
+                        meta={},
+                        status="QUEUED",
+                        created_at=now_utc(),
+                        sent_at=None,
+                    )
+                )
+            db.commit()
+
+        with SessionLocal() as db:
+            stats = dispatcher.dispatch_batch(db, limit=100)
+    finally:
+        rate_limit.set_limiter(None)
+
+    assert stats.sent == 2
+    assert stats.deferred == 3
+    assert stats.failed == 0
+    assert sent_texts == ["m0", "m1"]
+
+    with SessionLocal() as db:
+        statuses = [db.query(OutboxMessage).filter(OutboxMessage.id == i).one().status for i in ids]
+        assert statuses == ["SENT", "SENT", "QUEUED", "QUEUED", "QUEUED"]
+        deferred = db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id, AuditLog.event_type == "OUTBOX_DEFERRED").count()
+        assert deferred == 3
+
+        # Deferred rows stay QUEUED; drop them so later tests sharing the in-memory DB don't dispatch them.
+        db.query(OutboxMessage).filter(OutboxMessage.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import random
+
+
+def _seed_github_row(db, *, tenant_id: str, attempt_count: int = 0) -> str:
+    from app.models.tables import Document, OutboxMessage, Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+    from tests.utils_bootstrap import seed_min_bootstrap_docs
+
+    db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+    seed_min_bootstrap_docs(db, tenant_id=tenant_id)
+    db.add(
+        Document(
+            id=new_uuid(),
+            tenant_id=tenant_id,
+            workflow_id=None,
+            domain="policy",
+            doc_type="policy_allowlist",
+            title="policy_allowlist",
+            content_text=None,
+            object_key=None,
+            meta={"allowlist": {"github_repos": ["o/r"], "telegram_chats": [], "email_domains": [], "emails": []}},
+            created_at=now_utc(),
+        )
+    )
+    outbox_id = new_uuid()
+    db.add(
+        OutboxMessage(
+            id=outbox_id,
+            tenant_id=tenant_id,
+            user_id="u1",
+            channel="github_issue",
+            to="o/r",
+            subject="t",
+            body="b",
+            payload={
+                "kind": "github_issue",
+                "idempotency_key": outbox_id,
+                "message": {"repo": "o/r", "title": "t", "body": {"markdown": "b"}},
+            },
+            idempotency_key=outbox_id,
+            meta={},
+            status="QUEUED",
+            created_at=now_utc(),
+            sent_at=None,
+            attempt_count=attempt_count,
+        )
+    )
+    db.commit()
+    return outbox_id
+
+
+def test_backoff_is_exponential_jittered_and_capped(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.core.config import settings
+    from app.outbox.retry import backoff_delay_s
+
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_BACKOFF", "telegram=10:100")
+    rng = random.Random(7)
+
+    for attempt, full in [(1, 10), (2, 20), (3, 40), (4, 80), (5, 100), (9, 100)]:
+        for _ in range(20):
+            d = backoff_delay_s("telegram", attempt=attempt, rng=rng)
+            assert full / 2 <= d <= full
+
+    assert backoff_delay_s("telegram", attempt=1, retry_after_s=60, rng=rng) == 60
+
+
+def test_retryable_github_failure_is_rescheduled_then_dead_lettered(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "OUTBOX_REAL_SEND_ENABLED", True)
+    monkeypatch.setattr(settings, "GITHUB_TOKEN", "tok")
+    monkeypatch.setattr(settings, "OUTBOX_RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 3)
+
+    import httpx
+
+    calls = {"n": 0}
+
+    def fake_post(self, url, headers=None, json=None, timeout=None):
+        calls["n"] += 1
+        return httpx.Response(503, text="unavailable", request=httpx.Request("POST", url))
+
+    monkeypatch.setattr(httpx.Client, "post", fake_post)
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import AuditLog, OutboxMessage
+    from app.outbox import dispatcher, preview_store
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        outbox_id = _seed_github_row(db, tenant_id=tenant_id)
+
+    with SessionLocal() as db:
+        stats = dispatcher.dispatch_batch(db, limit=100)
+        assert stats.retrying == 1
+
+        m = db.query(OutboxMessage).filter(OutboxMessage.id == outbox_id).one()
+        assert m.status == "QUEUED"
+        assert m.attempt_count == 1
+        assert m.last_error.startswith("github_http_503")
+        next_at = m.next_attempt_at if m.next_attempt_at.tzinfo else m.next_attempt_at.replace(tzinfo=now_utc().tzinfo)
+        assert next_at > now_utc()
+
+        # Not due yet: the next tick must not claim it.
+        assert outbox_id not in {r.id for r in dispatcher.claim_batch(db, limit=1000)}
+        db.rollback()
+
+        # Last allowed attempt fails -> dead letter.
+        m.attempt_count = 2
+        m.next_attempt_at = None
+        db.commit()
+
+    with SessionLocal() as db:
+        stats = dispatcher.dispatch_batch(db, limit=100)
+        assert stats.dead == 1
+
+        m = db.query(OutboxMessage).filter(OutboxMessage.id == outbox_id).one()
+        assert m.status == "DEAD"
+        assert m.attempt_count == 3
+        assert db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id, AuditLog.event_type == "OUTBOX_DEAD_LETTER").count() == 1
+
+    assert calls["n"] == 2
+
+
+def test_failed_send_keeps_the_preview_its_meta_points_at(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Document, OutboxMessage
+    from app.outbox import preview_store
+    from app.outbox.adapters import registry
+    from app.outbox.dispatcher import dispatch_batch
+    from app.util.ids import new_uuid
+
+    monkeypatch.setattr(settings, "OUTBOX_PREVIEW_MODE", "eager")
+    monkeypatch.setattr(settings, "OUTBOX_RATE_LIMIT_ENABLED", False)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    class _Broken:
+        def send(self, *, payload, outbox_row):
+            raise RuntimeError("adapter crashed")
+
+    monkeypatch.setattr(registry, "get_adapter", lambda kind: _Broken())
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        outbox_id = _seed_github_row(db, tenant_id=tenant_id)
+
+    with SessionLocal() as db:
+        assert dispatch_batch(db, limit=100).failed == 1
+        m = db.query(OutboxMessage).filter(OutboxMessage.id == outbox_id).one()
+        assert m.status == "FAILED" and m.last_error == "adapter crashed"
+        doc = db.get(Document, m.meta["preview"]["document_id"])
+        assert doc is not None and doc.doc_type == "outbox_preview"
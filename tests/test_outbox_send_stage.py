@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class _StubApi:
+    """Local stand-in for the GitHub issues and Telegram sendMessage endpoints."""
+
+    def __init__(self, delay_s: float = 0.2):
+        self.delay_s = delay_s
+        self.lock = threading.Lock()
+        self.inflight = 0
+        self.max_inflight = 0
+        self.inflight_by_target: dict[str, int] = defaultdict(int)
+        self.max_inflight_by_target: dict[str, int] = defaultdict(int)
+        self.received: list[tuple[str, str]] = []
+
+    def handle(self, path: str, body: dict) -> tuple[int, dict]:
+        if path.endswith("/sendMessage"):
+            target, label = str(body["chat_id"]), body["text"]
+        else:
+            target, label = path.split("/repos/", 1)[1].rsplit("/issues", 1)[0], body["title"]
+
+        with self.lock:
+            self.inflight += 1
+            self.inflight_by_target[target] += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+            self.max_inflight_by_target[target] = max(self.max_inflight_by_target[target], self.inflight_by_target[target])
+            self.received.append((target, label))
+        try:
+            time.sleep(self.delay_s)
+        finally:
+            with self.lock:
+                self.inflight -= 1
+                self.inflight_by_target[target] -= 1
+
+        if path.endswith("/sendMessage"):
+            return 200, {"ok": True, "result": {"message_id": len(self.received)}}
+        n = len(self.received)
+        return 201, {"number": n, "id": n, "html_url": f"https://github.example/{target}/issues/{n}", "title": label}
+
+
+@pytest.fixture()
+def stub_api():
+    api = _StubApi()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            status, data = api.handle(self.path, body)
+            raw = json.dumps(data).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def log_message(self, format, *args):
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    api.base_url = f"http://127.0.0.1:{server.server_address[1]}"  # type: ignore[attr-defined]
+    try:
+        yield api
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_send_stage_runs_targets_concurrently_and_keeps_per_target_order(monkeypatch, stub_api):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "OUTBOX_REAL_SEND_ENABLED", True)
+    monkeypatch.setattr(settings, "GITHUB_TOKEN", "tok")
+    monkeypatch.setattr(settings, "GITHUB_API_BASE", stub_api.base_url)
+    monkeypatch.setattr(settings, "TELEGRAM_BOT_TOKEN", "tg-token")
+    monkeypatch.setattr(settings, "TELEGRAM_API_BASE", stub_api.base_url)
+    monkeypatch.setattr(settings, "TELEGRAM_ALLOWLIST_CHATS", "100,200")
+    monkeypatch.setattr(settings, "OUTBOX_SEND_WORKERS", 8)
+    monkeypatch.setattr(settings, "OUTBOX_SEND_PER_CHANNEL", 4)
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import Document, OutboxMessage, Tenant
+    from app.outbox import dispatcher, preview_store
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+    from tests.utils_bootstrap import seed_min_bootstrap_docs
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    repos = ["o/r1", "o/r2", "o/r3"]
+    chats = ["100", "200"]
+    tenant_id = new_uuid()
+    ids: list[str] = []
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        seed_min_bootstrap_docs(db, tenant_id=tenant_id)
+        db.add(
+            Document(
+                id=new_uuid(),
+                tenant_id=tenant_id,
+                workflow_id=None,
+                domain="policy",
+                doc_type="policy_allowlist",
+                title="policy_allowlist",
+                content_text=None,
+                object_key=None,
+                meta={"allowlist": {"github_repos": repos, "telegram_chats": chats, "email_domains": [], "emails": []}},
+                created_at=now_utc(),
+            )
+        )
+        for seq in range(2):
+            for repo in repos:
+                key = f"{tenant_id}-{repo}-{seq}"
+                ids.append(new_uuid())
+                db.add(
+                    OutboxMessage(
+                        id=ids[-1],
+                        tenant_id=tenant_id,
+                        user_id="u1",
+                        channel="github_issue",
+                        to=repo,
+                        subject=f"seq{seq}",
+                        body="b",
+                        payload={
+                            "kind": "github_issue",
+                            "idempotency_key": key,
+                            "message": {"repo": repo, "title": f"seq{seq}", "body": {"markdown": "b"}},
+                        },
+                        idempotency_key=key,
+                        meta={},
+                        status="QUEUED",
+                        created_at=now_utc(),
+                        sent_at=None,
+                    )
+                )
+            for chat in chats:
+                key = f"{tenant_id}-{chat}-{seq}"
+                ids.append(new_uuid())
+                db.add(
+                    OutboxMessage(
+                        id=ids[-1],
+                        tenant_id=tenant_id,
+                        user_id="u1",
+                        channel="telegram",
+                        to=chat,
+                        subject=None,
+                        body=f"seq{seq}",
+                        payload={
+                            "kind": "telegram",
+                            "idempotency_key": key,
+                            "message": {"chat": {"chat_id": chat}, "text": f"seq{seq}"},
+                        },
+                        idempotency_key=key,
+                        meta={},
+                        status="QUEUED",
+                        created_at=now_utc(),
+                        sent_at=None,
+                    )
+                )
+        db.commit()
+
+    with SessionLocal() as db:
+        stats = dispatcher.dispatch_batch(db, limit=100)
+
+    assert stats.sent == len(ids)
+    assert stub_api.max_inflight > 1
+    assert set(stub_api.max_inflight_by_target.values()) == {1}
+    for target in repos + chats:
+        assert [label for t, label in stub_api.received if t == target] == ["seq0", "seq1"]
+
+    with SessionLocal() as db:
+        rows = db.query(OutboxMessage).filter(OutboxMessage.id.in_(ids)).all()
+        assert {m.status for m in rows} == {"SENT"}
+        assert all(m.meta.get("external", {}).get("url") for m in rows if m.channel == "github_issue")
+        assert all(m.meta.get("telegram_result", {}).get("message_id") for m in rows if m.channel == "telegram")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import fakeredis
+
+
+def test_commit_publishes_wakeup_and_loop_dispatches_immediately(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import OutboxMessage, Tenant
+    from app.outbox import preview_store, wakeup
+    from app.outbox.service import create_outbox_message
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+    from tests.utils_bootstrap import seed_min_bootstrap_docs
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    server = fakeredis.FakeServer()
+    wakeup.set_redis(fakeredis.FakeRedis(server=server))
+    listener = fakeredis.FakeRedis(server=server).pubsub(ignore_subscribe_messages=True)
+    listener.subscribe("clowbot:outbox:wake")
+
+    tenant_id = new_uuid()
+    stop = threading.Event()
+    loop = None
+    try:
+        with SessionLocal() as db:
+            db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+            seed_min_bootstrap_docs(db, tenant_id=tenant_id)
+            db.commit()
+
+            # Rolled back writes never wake the dispatcher.
+            wakeup.request_wake(db)
+            db.rollback()
+            db.commit()
+            assert listener.get_message(timeout=0.1) is None
+
+        # Sweep interval far beyond the test: only a wake-up can deliver in time.
+        loop = threading.Thread(target=wakeup.run_wake_loop, kwargs={"stop": stop, "sweep_s": 60}, daemon=True)
+        loop.start()
+        # Wait for the loop's first (empty) drain and subscribe; a fixed sleep can lose the wake-up under load.
+        probe = fakeredis.FakeRedis(server=server)
+        deadline = time.monotonic() + 5
+        while probe.pubsub_numsub("clowbot:outbox:wake")[0][1] < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        with SessionLocal() as db:
+            outbox_id = create_outbox_message(
+                db=db,
+                tenant_id=tenant_id,
+                user_id="u1",
+                payload_dict={
+                    "kind": "email",
+                    "idempotency_key": "",
+                    "policy": {"risk": "YELLOW", "requires_approval": False, "allowlist": {"emails": ["a@example.com"]}},
+                    "message": {"to": [{"email": "a@example.com"}], "subject": "s", "body": {"text": "b"}},
+                },
+            )
+        assert listener.get_message(timeout=1) is not None
+
+        deadline = time.monotonic() + 5
+        status = "QUEUED"
+        while status == "QUEUED" and time.monotonic() < deadline:
+            time.sleep(0.05)
+            with SessionLocal() as db:
+                status = db.query(OutboxMessage).filter(OutboxMessage.id == outbox_id).one().status
+        assert status != "QUEUED"
+    finally:
+        stop.set()
+        if loop is not None:
+            loop.join(timeout=5)
+        wakeup.set_redis(None)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+
+import fakeredis
+
+
+def test_compiled_allowlist_is_cached_and_invalidated_by_version_stamp(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from fastapi.testclient import TestClient
+    from pydantic import TypeAdapter
+    from sqlalchemy import insert
+
+    import app.main
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.core.outbox_policy import enforce_allowlist
+    from app.models.base import Base
+    from app.models.tables import Document, Tenant
+    from app.policy import allowlist
+    from app.schemas.outbox_v1 import Allowlist, OutboxPayloadV1
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+
+    compiled = allowlist.CompiledAllowlist.from_allowlist(
+        Allowlist(emails=[" Boss@Example.com"], email_domains=["@Corp.io"], telegram_chats=["123 "], github_repos=["o/r"])
+    )
+    assert compiled.allows_email("boss@example.COM") and compiled.allows_email("anyone@corp.io")
+    assert not compiled.allows_email("corp.io") and not compiled.allows_email("x@evil.io")
+    assert compiled.allows_telegram("123") and compiled.allows_github("o/r") and not compiled.allows_github("o/x")
+
+    ttl = 0.25  # wide enough that back-to-back lookups stay inside the window on a loaded machine
+    monkeypatch.setattr(settings, "POLICY_ALLOWLIST_CACHE_SECONDS", ttl)
+    server = fakeredis.FakeServer()
+    fake = fakeredis.FakeRedis(server=server)
+    allowlist.set_redis(fake)
+
+    loads: list[str] = []
+    id_checks: list[str] = []
+    real_load, real_latest = allowlist.load_policy_allowlist, allowlist._latest_document_id
+
+    def counting_load(db, *, tenant_id):
+        loads.append(tenant_id)
+        return real_load(db, tenant_id=tenant_id)
+
+    def counting_latest(db, *, tenant_id):
+        id_checks.append(tenant_id)
+        return real_latest(db, tenant_id=tenant_id)
+
+    monkeypatch.setattr(allowlist, "load_policy_allowlist", counting_load)
+    monkeypatch.setattr(allowlist, "_latest_document_id", counting_latest)
+
+    tenant_id = new_uuid()
+
+    def other_process_writes(chats: list[str]) -> str:
+        # Core insert: bypasses this process's session hooks, like a write from another process.
+        doc_id = new_uuid()
+        with engine.begin() as conn:
+            conn.execute(
+                insert(Document.__table__),
+                [
+                    {
+                        "id": doc_id,
+                        "tenant_id": tenant_id,
+                        "workflow_id": None,
+                        "domain": "policy",
+                        "doc_type": "policy_allowlist",
+                        "title": "policy_allowlist",
+                        "content_text": None,
+                        "object_key": None,
+                        "metadata": {"allowlist": {"telegram_chats": chats}},
+                        "created_at": now_utc(),
+                    }
+                ],
+            )
+        return doc_id
+
+    with SessionLocal() as db:
+        db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+        db.commit()
+        first_id = other_process_writes(["100"])
+
+        a = allowlist.get_compiled_allowlist(db, tenant_id=tenant_id)
+        assert a.document_id == first_id and a.telegram_chats == frozenset({"100"})
+        assert allowlist.get_compiled_allowlist(db, tenant_id=tenant_id) is a
+        assert len(loads) == 1 and id_checks == []
+
+        # No stamp in Redis yet: after the window the latest document id decides.
+        time.sleep(ttl * 2)
+        assert allowlist.get_compiled_allowlist(db, tenant_id=tenant_id) is a
+        assert len(loads) == 1 and len(id_checks) == 1
+        second_id = other_process_writes(["200"])
+        time.sleep(ttl * 2)
+        assert allowlist.get_compiled_allowlist(db, tenant_id=tenant_id).document_id == second_id
+        assert len(loads) == 2
+
+    # PUT commits a new document: local entry dropped at once, stamp bumped for other processes.
+    client = TestClient(app.main.app)
+    r = client.put(
+        "/policy/allowlist",
+        params={"tenant_id": tenant_id},
+        headers={"X-Admin-Token": "change-me-admin-token"},
+        json={"allowlist": {"telegram_chats": ["300"]}},
+    )
+    assert r.status_code == 200
+    put_id = r.json()["document_id"]
+    assert fake.get(allowlist._stamp_key(tenant_id)) == b"1"
+
+    with SessionLocal() as db:
+        b = allowlist.get_compiled_allowlist(db, tenant_id=tenant_id)
+        assert b.document_id == put_id and len(loads) == 3
+
+        # Unchanged stamp: trusted without touching the database.
+        checks = len(id_checks)
+        time.sleep(ttl * 2)
+        assert allowlist.get_compiled_allowlist(db, tenant_id=tenant_id) is b
+        assert len(loads) == 3 and len(id_checks) == checks
+
+        # Another process commits and bumps the stamp.
+        third_id = other_process_writes(["400"])
+        fake.incr(allowlist._stamp_key(tenant_id))
+        time.sleep(ttl * 2)
+        c = allowlist.get_compiled_allowlist(db, tenant_id=tenant_id)
+        assert c.document_id == third_id and len(loads) == 4
+
+        # Redis down: fall back to the document id check, never fail.
+        server.connected = False
+        checks = len(id_checks)
+        time.sleep(ttl * 2)
+        assert allowlist.get_compiled_allowlist(db, tenant_id=tenant_id) is c
+        assert len(id_checks) == checks + 1
+
+    payload = TypeAdapter(OutboxPayloadV1).validate_python(
+        {
+            "schema": "clowbot.outbox.v1",
+            "kind": "telegram",
+            "idempotency_key": "k",
+            "policy": {"risk": "YELLOW", "requires_approval": False, "allowlist": {"telegram_chats": []}},
+            "message": {"chat": {"chat_id": "400"}, "text": "hi"},
+        }
+    )
+    decision = enforce_allowlist(payload, tenant_allowlist=c)
+    assert decision.upgraded_to_red is False
+    assert payload.policy.allowlist.telegram_chats == []  # tenant entries are not copied into the payload
+    assert enforce_allowlist(payload, tenant_allowlist=a).upgraded_to_red is True
+    allowlist.set_redis(None)
@@ -52,3 +52,19 @@ def test_sales_outreach_sequence_queues_telegram_outbox_items(client: TestClient
     assert data["status"] == "DONE"
     assert len(data["outbox_ids"]) == 3
     assert "offer_doc_id" in data["artifacts"]
+
+
+def test_rerun_reuses_outbox_rows_without_new_pending_actions(client: TestClient):
+    run = {"skill_name": "sales_outreach_sequence", "inputs": {"product": "X", "audience": "Y", "chat_id": "777", "count": 2}}
+
+    first = client.post("/skills/run", json=run).json()
+    assert first["status"] == "DONE"
+    assert len(first["outbox_ids"]) == 2
+    # Chat 777 is not allowlisted: each new row needs approval.
+    assert len(first["pending_action_ids"]) == 2
+
+    second = client.post("/skills/run", json=run).json()
+    assert second["outbox_ids"] == first["outbox_ids"]
+    assert second["pending_action_ids"] == []
+    pending = client.get("/actions/pending").json()["items"]
+    assert sorted(a["id"] for a in pending) == sorted(first["pending_action_ids"])
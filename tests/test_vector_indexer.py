@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+
+class _FakeQdrant:
+    def __init__(self):
+        self.collections: set[str] = set()
+        self.list_calls = 0
+        self.upserts: list[tuple[str, list]] = []
+        self.down = False
+        self.poison: set[str] = set()
+
+    def get_collections(self):
+        self.list_calls += 1
+        return type("R", (), {"collections": [type("C", (), {"name": n})() for n in self.collections]})()
+
+    def create_collection(self, *, collection_name, vectors_config):
+        self.collections.add(collection_name)
+
+    def upsert(self, *, collection_name, points):
+        if self.down:
+            raise ConnectionError("qdrant down")
+        if self.poison & {p.id for p in points}:
+            raise ValueError("bad point")
+        self.upserts.append((collection_name, points))
+
+    def close(self):
+        pass
+
+
+def test_write_behind_indexing_batches_and_retries(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from sqlalchemy import delete, update
+
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.memory import embeddings, vector_indexer, vector_store
+    from app.models.base import Base
+    from app.models.tables import Document, VectorIndexJob
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(settings, "EMBEDDING_DIM", 32)
+    monkeypatch.setattr(vector_store, "_with_retry", lambda fn, attempts=3: fn())
+    embeddings.set_embedder(None)
+    fake = _FakeQdrant()
+    vector_store.set_client(fake)
+
+    tenant_id = new_uuid()
+    try:
+        with SessionLocal() as db:
+            db.execute(delete(VectorIndexJob))  # rows queued by other tests
+            docs = []
+            for i, text in enumerate(["weekly review notes", "grant deadline list", "to be deleted"]):
+                doc = Document(
+                    id=new_uuid(),
+                    tenant_id=tenant_id,
+                    domain="sot",
+                    doc_type=f"t{i}",
+                    title=f"t{i}",
+                    content_text=text,
+                    object_key=None,
+                    meta={},
+                    created_at=now_utc(),
+                )
+                db.add(doc)
+                vector_indexer.enqueue_vector_index(
+                    db, tenant_id=tenant_id, doc_id=doc.id, domain="sot", source_type=doc.doc_type
+                )
+                docs.append(doc)
+            db.commit()
+            # Writing does not touch Qdrant.
+            assert fake.list_calls == 0 and fake.upserts == []
+
+            db.delete(docs[2])
+            db.commit()
+            ids = [d.id for d in docs]
+
+            fake.down = True
+            stats = vector_indexer.index_pending(db)
+            assert stats == {"claimed": 3, "indexed": 0, "failed": 2, "skipped": 1, "dead": 0}
+            jobs = {j.doc_id: j for j in db.query(VectorIndexJob).all()}
+            assert set(jobs) == set(ids[:2])
+            assert all(j.attempts == 1 and j.claimed_by is None and "qdrant down" in j.last_error for j in jobs.values())
+            # Backed off: not due yet.
+            assert vector_indexer.index_pending(db)["claimed"] == 0
+
+            fake.down = False
+            db.execute(update(VectorIndexJob).values(next_attempt_at=now_utc()))
+            db.commit()
+            assert vector_indexer.index_pending(db) == {"claimed": 2, "indexed": 2, "failed": 0, "skipped": 0, "dead": 0}
+            assert db.query(VectorIndexJob).count() == 0
+
+            # One upsert for the batch, into the per-dimension collection, which was checked once.
+            assert len(fake.upserts) == 1
+            collection, points = fake.upserts[0]
+            assert collection == "memory_hashing_32" and sorted(p.id for p in points) == sorted(ids[:2])
+            assert fake.list_calls == 1
+    finally:
+        vector_store.set_client(None)
+        embeddings.set_embedder(None)
+
+
+def test_failed_tenant_batch_retries_one_by_one_and_dead_letters(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from sqlalchemy import delete, update
+
+    from app.core.config import settings
+    from app.core.db import SessionLocal, engine
+    from app.memory import embeddings, vector_indexer, vector_store
+    from app.models.base import Base
+    from app.models.tables import Document, VectorIndexJob
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(settings, "EMBEDDING_DIM", 32)
+    monkeypatch.setattr(settings, "VECTOR_INDEX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(vector_store, "_with_retry", lambda fn, attempts=3: fn())
+    embeddings.set_embedder(None)
+    fake = _FakeQdrant()
+    vector_store.set_client(fake)
+
+    tenant_id = new_uuid()
+    try:
+        with SessionLocal() as db:
+            db.execute(delete(VectorIndexJob))  # rows queued by other tests
+            ids = []
+            for i in range(3):
+                doc = Document(
+                    id=new_uuid(),
+                    tenant_id=tenant_id,
+                    domain="sot",
+                    doc_type=f"t{i}",
+                    title=f"t{i}",
+                    content_text=f"note number {i}",
+                    object_key=None,
+                    meta={},
+                    created_at=now_utc(),
+                )
+                db.add(doc)
+                vector_indexer.enqueue_vector_index(
+                    db, tenant_id=tenant_id, doc_id=doc.id, domain="sot", source_type=doc.doc_type
+                )
+                ids.append(doc.id)
+            db.commit()
+
+            # One bad document fails the tenant's batch; the others are indexed one by one.
+            fake.poison = {ids[1]}
+            assert vector_indexer.index_pending(db) == {"claimed": 3, "indexed": 2, "failed": 1, "skipped": 0, "dead": 0}
+            assert sorted(p.id for _, points in fake.upserts for p in points) == sorted([ids[0], ids[2]])
+            job = db.query(VectorIndexJob).one()
+            assert job.doc_id == ids[1] and job.status == "QUEUED" and job.attempts == 1
+
+            # The last allowed attempt dead-letters it; DEAD rows are never claimed again.
+            db.execute(update(VectorIndexJob).values(next_attempt_at=now_utc()))
+            db.commit()
+            assert vector_indexer.index_pending(db)["dead"] == 1
+            db.refresh(job)
+            assert job.status == "DEAD" and job.attempts == 2 and "bad point" in job.last_error
+            db.execute(update(VectorIndexJob).values(next_attempt_at=now_utc()))
+            db.commit()
+            assert vector_indexer.index_pending(db)["claimed"] == 0
+
+            # Re-enqueueing the document revives it.
+            fake.poison = set()
+            vector_indexer.enqueue_vector_index(db, tenant_id=tenant_id, doc_id=ids[1], domain="sot", source_type="t1")
+            db.commit()
+            assert vector_indexer.index_pending(db)["indexed"] == 1
+            assert db.query(VectorIndexJob).count() == 0
+
+            # Qdrant down: after a few one-by-one probes the rest keep the batch error without being tried.
+            for doc_id in ids:
+                vector_indexer.enqueue_vector_index(db, tenant_id=tenant_id, doc_id=doc_id, domain="sot", source_type="t")
+            db.commit()
+            monkeypatch.setattr(vector_indexer, "_SINGLE_RETRY_PROBES", 1)
+            fake.down = True
+            calls = []
+            upsert = fake.upsert
+            fake.upsert = lambda **kw: (calls.append(kw), upsert(**kw))
+            assert vector_indexer.index_pending(db)["failed"] == 3
+            assert len(calls) == 2  # the batch, then one probe
+    finally:
+        vector_store.set_client(None)
+        embeddings.set_embedder(None)
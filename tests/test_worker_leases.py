@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+
+def _seed_rows(db, *, tenant_id: str, n: int, status: str = "QUEUED") -> list[str]:
+    from app.models.tables import OutboxMessage, Tenant
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+    from tests.utils_bootstrap import seed_min_bootstrap_docs
+
+    db.add(Tenant(id=tenant_id, name=f"t-{tenant_id}", created_at=now_utc()))
+    seed_min_bootstrap_docs(db, tenant_id=tenant_id)
+    ids = []
+    for i in range(n):
+        ids.append(new_uuid())
+        db.add(
+            OutboxMessage(
+                id=ids[-1],
+                tenant_id=tenant_id,
+                user_id="u1",
+                channel="stub",
+                to="nowhere",
+                subject=None,
+                body=f"m{i}",
+                meta={},
+                status=status,
+                created_at=now_utc(),
+                sent_at=None,
+            )
+        )
+    db.commit()
+    return ids
+
+
+def test_claims_are_exclusive_until_the_lease_expires(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+
+    from app.core.db import SessionLocal, engine
+    from app.core.leases import claim_ids
+    from app.models.base import Base
+    from app.models.tables import OutboxMessage
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+
+    tenant_id = new_uuid()
+    mine = OutboxMessage.tenant_id == tenant_id
+    with SessionLocal() as db:
+        ids = _seed_rows(db, tenant_id=tenant_id, n=3)
+
+        got_a = claim_ids(db, OutboxMessage, status="QUEUED", limit=2, where=(mine,), owner="worker-a")
+        db.commit()
+        assert len(got_a) == 2
+
+        got_b = claim_ids(db, OutboxMessage, status="QUEUED", limit=10, where=(mine,), owner="worker-b")
+        db.commit()
+        assert set(got_a) | set(got_b) == set(ids) and len(got_b) == 1
+        assert claim_ids(db, OutboxMessage, status="QUEUED", limit=10, where=(mine,), owner="worker-c") == []
+
+        # worker-a dies: once its leases expire the rows are claimable again.
+        db.query(OutboxMessage).filter(OutboxMessage.id.in_(got_a)).update(
+            {"lease_expires_at": now_utc() - timedelta(seconds=1)}, synchronize_session=False
+        )
+        db.commit()
+        assert set(claim_ids(db, OutboxMessage, status="QUEUED", limit=10, where=(mine,), owner="worker-c")) == set(got_a)
+
+        db.query(OutboxMessage).filter(mine).delete(synchronize_session=False)
+        db.commit()
+
+
+def test_reaper_requeues_stuck_sending_rows_and_dispatch_releases_leases(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+pysqlite:///:memory:")
+    monkeypatch.setenv("ADMIN_TOKEN", "change-me-admin-token")
+    monkeypatch.setenv("ENSURE_EXTERNAL_DEPS_ON_STARTUP", "0")
+
+    from app.core.db import SessionLocal, engine
+    from app.models.base import Base
+    from app.models.tables import AuditLog, OutboxMessage
+    from app.outbox import dispatcher, preview_store
+    from app.tasks.jarvis_tasks import reap_expired_leases_task
+    from app.util.ids import new_uuid
+    from app.util.time import now_utc
+
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(preview_store, "put_many", lambda objects, *, best_effort: [o.object_key for o in objects])
+
+    tenant_id = new_uuid()
+    with SessionLocal() as db:
+        stuck, live = _seed_rows(db, tenant_id=tenant_id, n=2, status="SENDING")
+        db.query(OutboxMessage).filter(OutboxMessage.id == stuck).update(
+            {"claimed_by": "dead-worker", "lease_expires_at": now_utc() - timedelta(seconds=5), "attempt_count": 1},
+            synchronize_session=False,
+        )
+        db.query(OutboxMessage).filter(OutboxMessage.id == live).update(
+            {"claimed_by": "busy-worker", "lease_expires_at": now_utc() + timedelta(minutes=5)}, synchronize_session=False
+        )
+        db.commit()
+
+    out = reap_expired_leases_task()
+    assert out["outbox_requeued"] == 1
+
+    with SessionLocal() as db:
+        m = db.query(OutboxMessage).filter(OutboxMessage.id == stuck).one()
+        assert (m.status, m.claimed_by, m.lease_expires_at, m.attempt_count) == ("QUEUED", None, None, 1)
+        assert db.query(OutboxMessage).filter(OutboxMessage.id == live).one().status == "SENDING"
+        assert db.query(AuditLog).filter(AuditLog.tenant_id == tenant_id, AuditLog.event_type == "OUTBOX_LEASE_EXPIRED").count() == 1
+
+        stats = dispatcher.dispatch_batch(db, limit=100)
+        assert stats.stub_sent >= 1  # the in-memory DB is shared with other tests
+
+        m = db.query(OutboxMessage).filter(OutboxMessage.id == stuck).one()
+        assert (m.status, m.claimed_by, m.lease_expires_at) == ("STUB_SENT", None, None)
+
+        db.query(OutboxMessage).filter(OutboxMessage.id == live).delete(synchronize_session=False)
+        db.commit()